@@ -0,0 +1,116 @@
+"""Mikrobenchmark: Dekodieren eines vollständigen Lesezyklus.
+
+Vergleicht den bisherigen Weg (Klassifizierung je Entität über ENTITIES_DICT und
+convert_from_registers) mit der vorkompilierten Tabelle const.BLOCK_DECODERS.
+
+Aufruf aus dem Repository-Wurzelverzeichnis:
+    python benchmarks/bench_decode.py [--cycles 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+
+from pymodbus.client import AsyncModbusTcpClient  # noqa: E402
+
+from ha_heliotherm import const  # noqa: E402
+from ha_heliotherm.const import (  # noqa: E402
+    ENTITIES_DICT,
+    READ_PLAN,
+    BLOCK_DECODERS,
+    get_entity_factor,
+    get_entity_max,
+    get_entity_min,
+    get_entity_reg,
+    get_entity_select,
+    get_entity_switch,
+    get_entity_type,
+    is_entity_climate,
+    is_entity_readonly,
+    is_entity_select,
+    is_entity_switch,
+)
+from ha_heliotherm.planner import BIT_TYPES  # noqa: E402
+
+
+def _synthetic_buffers() -> list[list[int | bool]]:
+    """Plausible Rohwerte je Block (Temperaturen ~ 21.5 °C, Schalter an)."""
+    buffers = []
+    for block in READ_PLAN:
+        if block.reg_type in BIT_TYPES:
+            buffers.append([True] * block.count)
+        else:
+            buffers.append([215 + (i % 7) for i in range(block.count)])
+    return buffers
+
+
+def legacy_cycle(buffers: list[list[int | bool]]) -> dict:
+    """Dekodierung wie vor der Dekodiertabelle (je Entität klassifizieren und konvertieren)."""
+    data = {}
+    by_type = {}
+    for block, buf in zip(READ_PLAN, buffers):
+        by_type.setdefault(block.reg_type, {}).update(
+            {block.address + i: v for i, v in enumerate(buf)}
+        )
+    for entity_key, props in ENTITIES_DICT.items():
+        reg_type = get_entity_type(props)
+        reg, dt = get_entity_reg(props)
+        if reg is None:
+            continue
+        regs = by_type[reg_type]
+        if dt == AsyncModbusTcpClient.DATATYPE.BITS:
+            raw = regs[reg]
+        else:
+            raw = AsyncModbusTcpClient.convert_from_registers(
+                registers=[regs[reg + i] for i in range(dt.value[1])], data_type=dt
+            )
+        if is_entity_switch(props):
+            value = "off" if raw == (get_entity_switch(props) or {}).get("off", 0) else "on"
+        elif is_entity_select(props):
+            value = (get_entity_select(props) or {}).get(raw, f"Ungültiger Wert: {raw}")
+        elif is_entity_climate(props) and not is_entity_readonly(props):
+            value = {
+                "temperature": None if raw == -500 else float(raw * (get_entity_factor(props) or 1.0)),
+                "target_temp_low": get_entity_min(props),
+                "target_temp_high": get_entity_max(props),
+            }
+        else:
+            value = None if raw == -500 else float(raw * (get_entity_factor(props) or 1.0))
+        data[entity_key] = value
+    return data
+
+
+def table_cycle(buffers: list[list[int | bool]]) -> dict:
+    """Dekodierung über const.BLOCK_DECODERS."""
+    data = {}
+    for idx, buf in enumerate(buffers):
+        data.update(BLOCK_DECODERS[idx].decode(buf))
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=2000)
+    args = parser.parse_args()
+
+    const.init()
+    buffers = _synthetic_buffers()
+    if legacy_cycle(buffers) != table_cycle(buffers):
+        sys.exit("Dekodierergebnisse weichen voneinander ab!")
+
+    entities = len(ENTITIES_DICT)
+    for name, func in (("legacy", legacy_cycle), ("table", table_cycle)):
+        seconds = min(timeit.repeat(lambda: func(buffers), number=args.cycles, repeat=5))
+        per_cycle = seconds / args.cycles * 1e6
+        print(
+            f"{name:>8}: {per_cycle:8.1f} µs/Zyklus, {per_cycle / entities:6.2f} µs/Entität"
+        )
+
+
+if __name__ == "__main__":
+    main()
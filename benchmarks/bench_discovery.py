@@ -0,0 +1,154 @@
+"""Benchmark: Register-Suche (discovery.py) gegen den Simulator mit Registern außerhalb der Registerkarte.
+
+Der Simulator stellt zusätzliche Input- und Holding-Register mit Lücken dazwischen bereit
+(wie eine neuere Firmware); ein Register ändert seinen Wert laufend. Geprüft wird, dass die Suche
+genau die antwortenden Adressen der durchsuchten Bereiche findet und die Schwankung erkennt;
+gemessen werden Requests (im Vergleich zu einem Request je Adresse) und Dauer.
+Weicht das Ergebnis ab, endet das Skript mit Exit-Code 1.
+
+Aufruf aus dem Repository-Wurzelverzeichnis (benötigt homeassistant und pymodbus):
+    python benchmarks/bench_discovery.py [--latency 0.002] [--request-delay 0] [--output discovery.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from ha_heliotherm import MyModbusHub, const  # noqa: E402
+from ha_heliotherm.const import (  # noqa: E402
+    C_REG_TYPE_HOLDING_REGISTERS,
+    C_REG_TYPE_INPUT_REGISTERS,
+    ENTITIES_DICT,
+    REGISTER_TYPES,
+)
+from ha_heliotherm.discovery import candidate_ranges  # noqa: E402
+from simulator import HeliothermSimulator  # noqa: E402
+
+# Zusätzliche Register (Registerart, Adresse, Rohwert); COUNTER ändert sich laufend
+EXTRA_REGISTERS = [
+    (C_REG_TYPE_INPUT_REGISTERS, 80, 0),
+    (C_REG_TYPE_INPUT_REGISTERS, 81, 215),
+    (C_REG_TYPE_INPUT_REGISTERS, 82, 0xFE0C),
+    *((C_REG_TYPE_INPUT_REGISTERS, address, 1) for address in range(100, 104)),
+    (C_REG_TYPE_INPUT_REGISTERS, 200, 7),
+    *((C_REG_TYPE_HOLDING_REGISTERS, address, 300 + address) for address in range(160, 176)),
+    (C_REG_TYPE_HOLDING_REGISTERS, 300, 1),
+    (C_REG_TYPE_HOLDING_REGISTERS, 511, 2),
+]
+COUNTER = (C_REG_TYPE_INPUT_REGISTERS, 80)
+
+
+def expected_addresses(simulator: HeliothermSimulator, ranges) -> dict[str, list[int]]:
+    """Antwortende Adressen der durchsuchten Bereiche laut Registerabbild des Simulators."""
+    names = {reg_type: name for name, reg_type in REGISTER_TYPES.items()}
+    expected = {}
+    for reg_type, runs in ranges.items():
+        bank = simulator.units[1].get(reg_type, [])
+        illegal = simulator.illegal.get(reg_type, set())
+        expected[names[reg_type]] = [
+            address
+            for first, end in runs
+            for address in range(first, end)
+            if address < len(bank) and address not in illegal
+        ]
+    return expected
+
+
+async def run(args: argparse.Namespace) -> dict:
+    const.init()
+    ranges = candidate_ranges(ENTITIES_DICT)
+    config_dir = tempfile.mkdtemp()
+    try:
+        async with HeliothermSimulator(latency=args.latency) as simulator:
+            for reg_type, address, value in EXTRA_REGISTERS:
+                simulator.add_register(reg_type, address, value)
+
+            async def count():
+                value = 0
+                while True:
+                    await asyncio.sleep(args.sample_interval / 2)
+                    value += 1
+                    simulator.add_register(*COUNTER, value)
+
+            hass = HomeAssistant(config_dir)
+            hub = MyModbusHub(hass, "bench", "127.0.0.1", simulator.port, 15, 1)
+            counter = asyncio.create_task(count())
+            start = time.perf_counter()
+            report = await hub.async_discover_registers(
+                request_delay=args.request_delay,
+                samples=args.samples,
+                sample_interval=args.sample_interval,
+            )
+            elapsed = time.perf_counter() - start
+            counter.cancel()
+            hub.close()
+            expected = expected_addresses(simulator, ranges)
+    finally:
+        shutil.rmtree(config_dir, ignore_errors=True)
+
+    found = {
+        name: [register["address"] for register in registers]
+        for name, registers in report["registers"].items()
+    }
+    variation = {
+        register["address"]: register["distinct"]
+        for register in report["registers"]["input_registers"]
+    }
+    candidates = sum(end - first for runs in ranges.values() for first, end in runs)
+    return {
+        "candidate_addresses": candidates,
+        "requests": report["requests"],
+        "duration_s": round(elapsed, 3),
+        "found": {name: len(addresses) for name, addresses in found.items()},
+        "matches": found == expected,
+        "missing": {name: sorted(set(expected[name]) - set(found.get(name, []))) for name in expected},
+        "unexpected": {name: sorted(set(found[name]) - set(expected.get(name, []))) for name in found},
+        "counter_varies": variation.get(COUNTER[1], 0) > 1,
+        "constant_stable": variation.get(81) == 1,
+        "report": report,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.002)
+    parser.add_argument("--request-delay", type=float, default=0.0)
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument("--sample-interval", type=float, default=0.2)
+    parser.add_argument("--output", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    result = asyncio.run(run(args))
+    print(
+        f"Adressen: {result['candidate_addresses']}, Requests: {result['requests']}, "
+        f"Dauer: {result['duration_s']:.2f} s, gefunden: {result['found']}"
+    )
+    ok = result["matches"] and result["counter_varies"] and result["constant_stable"]
+    if not ok:
+        print(
+            f"ABWEICHUNG: fehlend {result['missing']}, unerwartet {result['unexpected']}, "
+            f"Schwankung erkannt {result['counter_varies']}, konstant {result['constant_stable']}"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2, ensure_ascii=False)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Benchmark: Poll-Zyklen, Dekodierung, Schreibzugriffe und const.init() gegen den Simulator.
+
+Misst für 1, 4 und 16 simulierte Wärmepumpen hinter einem Gateway (gemeinsame Verbindung):
+    - Zykluszeit eines vollständigen Lesezyklus aller Units (p50/p95/p99)
+    - Speicher je Zyklus (tracemalloc: Spitze und verbleibende Blöcke)
+    - Schreibzugriffe pro Sekunde (write_entity_value + async_flush_writes inkl. Rücklesen)
+sowie einmalig die Dekodierkosten je Entität und die Dauer von const.init().
+
+Die Ergebnisse werden als JSON gespeichert und können mit einem früheren Lauf verglichen werden.
+
+Aufruf aus dem Repository-Wurzelverzeichnis (benötigt homeassistant und pymodbus):
+    python benchmarks/bench_hub.py [--units 1 4 16] [--cycles 200] [--latency 0.002]
+                                   [--output results.json] [--compare baseline.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pymodbus  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from ha_heliotherm import MyModbusHub, const  # noqa: E402
+from ha_heliotherm.const import BLOCK_DECODERS, ENTITIES_DICT, READ_PLAN  # noqa: E402
+from ha_heliotherm.planner import BIT_TYPES  # noqa: E402
+from simulator import HeliothermSimulator  # noqa: E402
+
+# Beschreibbarer Sollwert für die Schreibmessung
+WRITE_ENTITY = const.C_WW_NORMALTEMPERATUR
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """p50/p95/p99 und Mittelwert in Millisekunden."""
+    ordered = sorted(samples)
+    quantiles = statistics.quantiles(ordered, n=100, method="inclusive")
+    return {
+        "p50_ms": round(statistics.median(ordered) * 1e3, 3),
+        "p95_ms": round(quantiles[94] * 1e3, 3),
+        "p99_ms": round(quantiles[98] * 1e3, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1e3, 3),
+    }
+
+
+def bench_decode(repeat: int) -> dict[str, float]:
+    """Dekodierkosten eines vollständigen Zyklus über const.BLOCK_DECODERS."""
+    buffers = [
+        [True] * block.count
+        if block.reg_type in BIT_TYPES
+        else [215 + (i % 7) for i in range(block.count)]
+        for block in READ_PLAN
+    ]
+
+    def cycle():
+        for decoder, buf in zip(BLOCK_DECODERS, buffers):
+            decoder.decode(buf)
+
+    entities = sum(len(block.keys) for block in READ_PLAN)
+    seconds = min(timeit.repeat(cycle, number=repeat, repeat=5)) / repeat
+    return {
+        "entities": entities,
+        "us_per_cycle": round(seconds * 1e6, 2),
+        "us_per_entity": round(seconds * 1e6 / entities, 3),
+    }
+
+
+def bench_init(repeat: int) -> dict[str, float]:
+    """
+    Dauer von const.init() mit vorhandenem Kompilat der Registerkarte (wie bei einem HA-Neustart):
+    Kompilat laden, Entitätsbeschreibungen erzeugen.
+    """
+    config_dir = tempfile.mkdtemp()
+
+    def run():
+        const._initialized = False
+        const.init(config_dir)
+
+    try:
+        seconds = min(timeit.repeat(run, number=repeat, repeat=3)) / repeat
+    finally:
+        shutil.rmtree(config_dir, ignore_errors=True)
+    return {"ms": round(seconds * 1e3, 3)}
+
+
+async def bench_units(
+    hass: HomeAssistant, units: int, cycles: int, writes: int, latency: float, jitter: float
+) -> dict:
+    """Zyklen und Schreibzugriffe für `units` Wärmepumpen an einem simulierten Gateway."""
+    async with HeliothermSimulator(
+        units=units, latency=latency, jitter=jitter, seed=units
+    ) as simulator:
+        hubs = [
+            MyModbusHub(hass, f"bench{unit}", "127.0.0.1", simulator.port, 15, unit, 0)
+            for unit in range(1, units + 1)
+        ]
+        try:
+            full_plan = [0] * len(READ_PLAN)
+
+            async def full_cycle():
+                for hub in hubs:
+                    # alle Blöcke fällig: vollständiger Lesezyklus unabhängig von POLL
+                    hub._next_due = list(full_plan)
+                results = await asyncio.gather(*(hub.async_poll_cycle() for hub in hubs))
+                if not all(results):
+                    raise RuntimeError(f"Lesezyklus fehlgeschlagen: {results}")
+
+            await full_cycle()  # Verbindungsaufbau, nicht gemessen
+
+            samples = []
+            for _ in range(cycles):
+                start = time.perf_counter()
+                await full_cycle()
+                samples.append(time.perf_counter() - start)
+
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            await full_cycle()
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            retained = sum(
+                max(stat.count_diff, 0) for stat in after.compare_to(before, "lineno")
+            )
+
+            hub = hubs[0]
+            start = time.perf_counter()
+            for i in range(writes):
+                # sofort schreiben statt nach dem Sammelfenster (write_entity_value wartet darauf)
+                await asyncio.gather(
+                    hub.write_entity_value(WRITE_ENTITY, 40 + i % 10, force=True),
+                    hub.async_flush_writes(),
+                )
+            write_seconds = time.perf_counter() - start
+        finally:
+            for hub in hubs:
+                hub.close()
+
+        return {
+            "units": units,
+            "cycles": cycles,
+            "cycle": percentiles(samples),
+            "cycle_per_unit_ms": round(statistics.median(samples) * 1e3 / units, 3),
+            "alloc_peak_bytes_per_cycle": peak,
+            "alloc_retained_blocks_per_cycle": retained,
+            "writes_per_second": round(writes / write_seconds, 1),
+            "simulator": dict(simulator.stats),
+        }
+
+
+def compare(result: dict, baseline: dict) -> None:
+    """Abweichungen zu einem früheren Lauf ausgeben (positiv = langsamer/mehr)."""
+    print("\nVergleich mit", baseline.get("timestamp", "Baseline"))
+    old_runs = {run["units"]: run for run in baseline.get("runs", [])}
+    for run in result["runs"]:
+        old = old_runs.get(run["units"])
+        if old is None:
+            continue
+        for label, new_value, old_value in (
+            ("p50 ms", run["cycle"]["p50_ms"], old["cycle"]["p50_ms"]),
+            ("p99 ms", run["cycle"]["p99_ms"], old["cycle"]["p99_ms"]),
+            ("writes/s", run["writes_per_second"], old["writes_per_second"]),
+        ):
+            delta = (new_value - old_value) / old_value * 100 if old_value else 0.0
+            print(f"  {run['units']:>2} Units {label:>9}: {old_value:9.3f} -> {new_value:9.3f} ({delta:+.1f} %)")
+    for label, key in (("Dekodierung µs/Entität", "decode"), ("const.init() ms", "init")):
+        new_value = result[key].get("us_per_entity", result[key].get("ms"))
+        old_value = baseline.get(key, {}).get("us_per_entity", baseline.get(key, {}).get("ms"))
+        if old_value:
+            print(f"  {label}: {old_value} -> {new_value} ({(new_value - old_value) / old_value * 100:+.1f} %)")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        runs = []
+        for units in args.units:
+            runs.append(
+                await bench_units(
+                    hass, units, args.cycles, args.writes, args.latency, args.jitter
+                )
+            )
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pymodbus": pymodbus.__version__,
+        "entities": len(ENTITIES_DICT),
+        "read_blocks": len(READ_PLAN),
+        "latency_s": args.latency,
+        "jitter_s": args.jitter,
+        "decode": bench_decode(args.decode_repeat),
+        "init": bench_init(args.init_repeat),
+        "runs": runs,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--writes", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.002, help="Antwortlatenz des Simulators in s")
+    parser.add_argument("--jitter", type=float, default=0.001)
+    parser.add_argument("--decode-repeat", type=int, default=2000)
+    parser.add_argument("--init-repeat", type=int, default=20)
+    parser.add_argument("--output", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--compare", help="früheres JSON-Ergebnis zum Vergleich")
+    args = parser.parse_args()
+
+    # Log-Ausgaben der Integration würden die Messung dominieren
+    logging.disable(logging.CRITICAL)
+    # wie beim ersten async_setup_entry
+    const.init()
+    result = asyncio.run(run(args))
+
+    print(f"Dekodierung: {result['decode']['us_per_entity']} µs/Entität, const.init(): {result['init']['ms']} ms")
+    for run_result in result["runs"]:
+        cycle = run_result["cycle"]
+        print(
+            f"{run_result['units']:>2} Units: p50 {cycle['p50_ms']:.2f} ms, p95 {cycle['p95_ms']:.2f} ms, "
+            f"p99 {cycle['p99_ms']:.2f} ms, {run_result['alloc_peak_bytes_per_cycle']} B Spitze/Zyklus, "
+            f"{run_result['writes_per_second']} Schreibzugriffe/s"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            compare(result, json.load(fh))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Benchmark: Startkosten der Integration (Import, const.init(), Hub-Aufbau) mit Budgetprüfung.
+
+Jede Messung läuft in einem frischen Python-Prozess. Module, die Home Assistant ohnehin lädt
+(Core, Entity-Plattformen, Coordinator, pymodbus), werden vorher importiert und nicht
+mitgemessen; gemessen wird nur, was die Integration selbst kostet:
+    - import:    Import von ha_heliotherm und aller Plattform-Module (ohne const.init())
+    - init_cold: erster Aufruf von const.init() ohne Kompilat (registers.yaml lesen, prüfen,
+                 Leseplan und Dekodiertabelle erstellen, Kompilat schreiben)
+    - init:      erster Aufruf von const.init() mit vorhandenem Kompilat (normaler HA-Neustart)
+    - hub:       Aufbau eines MyModbusHub (ohne Verbindungsaufbau)
+
+Liegt der Median einer Messung über dem Budget, endet das Skript mit Exit-Code 1.
+
+Aufruf aus dem Repository-Wurzelverzeichnis (benötigt homeassistant und pymodbus):
+    python benchmarks/bench_startup.py [--runs 7] [--budget-import-ms 40] [--budget-init-cold-ms 60]
+                                       [--budget-init-ms 10] [--budget-hub-ms 5] [--output startup.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+COMPONENTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "custom_components")
+
+# Läuft im Kindprozess; gibt die drei Zeiten in Sekunden als JSON aus
+_PROBE = """
+import asyncio, json, logging, sys, tempfile, time
+sys.path.insert(0, {components!r})
+logging.disable(logging.CRITICAL)
+
+import homeassistant.core
+import homeassistant.config_entries
+import homeassistant.helpers.update_coordinator
+import homeassistant.components.binary_sensor
+import homeassistant.components.climate
+import homeassistant.components.number
+import homeassistant.components.select
+import homeassistant.components.sensor
+import homeassistant.components.switch
+import homeassistant.components.diagnostics
+import pymodbus.client
+
+start = time.perf_counter()
+import ha_heliotherm
+from ha_heliotherm import (
+    binary_sensor, climate, config_flow, diagnostics, number, select, sensor, switch,
+)
+import_s = time.perf_counter() - start
+assert not ha_heliotherm.const._initialized, "const.init() darf nicht beim Import laufen"
+assert "ha_heliotherm.regmap" not in sys.modules, "regmap erst mit const.init() laden"
+
+start = time.perf_counter()
+ha_heliotherm.const.init({config_dir!r})
+init_s = time.perf_counter() - start
+
+async def build_hub():
+    hass = homeassistant.core.HomeAssistant(tempfile.mkdtemp())
+    start = time.perf_counter()
+    hub = ha_heliotherm.MyModbusHub(hass, "bench", "127.0.0.1", 502, 15, 1)
+    elapsed = time.perf_counter() - start
+    hub.close()
+    return elapsed
+
+hub_s = asyncio.run(build_hub())
+
+print(json.dumps({{"import": import_s, "init": init_s, "hub": hub_s}}))
+"""
+
+
+def probe(config_dir: str) -> dict[str, float]:
+    """Eine Messung in einem frischen Interpreter (Kompilat der Registerkarte unter config_dir)."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(components=COMPONENTS, config_dir=config_dir)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget-import-ms", type=float, default=40.0)
+    parser.add_argument("--budget-init-cold-ms", type=float, default=60.0)
+    parser.add_argument("--budget-init-ms", type=float, default=10.0)
+    parser.add_argument("--budget-hub-ms", type=float, default=5.0)
+    parser.add_argument("--output", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.runs):
+        # je Lauf ein leeres Konfigurationsverzeichnis: erster Prozess übersetzt, zweiter lädt
+        config_dir = tempfile.mkdtemp()
+        try:
+            cold = probe(config_dir)
+            warm = probe(config_dir)
+        finally:
+            shutil.rmtree(config_dir, ignore_errors=True)
+        runs.append({**warm, "init_cold": cold["init"]})
+    budgets = {
+        "import": args.budget_import_ms,
+        "init_cold": args.budget_init_cold_ms,
+        "init": args.budget_init_ms,
+        "hub": args.budget_hub_ms,
+    }
+
+    result = {"runs": args.runs, "python": sys.version.split()[0], "phases": {}}
+    over_budget = []
+    for phase, budget in budgets.items():
+        samples = [run[phase] * 1e3 for run in runs]
+        median = statistics.median(samples)
+        result["phases"][phase] = {
+            "median_ms": round(median, 3),
+            "min_ms": round(min(samples), 3),
+            "max_ms": round(max(samples), 3),
+            "budget_ms": budget,
+        }
+        status = "ok" if median <= budget else "ÜBER BUDGET"
+        print(f"{phase:>9}: {median:8.2f} ms (min {min(samples):.2f}, max {max(samples):.2f}, Budget {budget:.1f} ms) {status}")
+        if median > budget:
+            over_budget.append(phase)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2, ensure_ascii=False)
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
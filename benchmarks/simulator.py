@@ -0,0 +1,427 @@
+"""Simulierte Heliotherm-Steuerung (Modbus TCP) auf Basis der Registerkarte (registers.yaml, ENTITIES_DICT).
+
+Stellt Input-/Holding-Register, Coils und Discrete-Inputs aller Entitäten bereit und kann
+Feldverhalten nachstellen: Latenz und Jitter je Antwort, Bearbeitungszeit je Request
+(seriell, wie eine einzelne Steuerungs-CPU), Paketverlust, Verbindungsabbrüche,
+Verbindungslimit und Geräte ohne parallele Transaktionen (Exception 6 "busy").
+Mehrere Wärmepumpen hinter einem Gateway werden über die Unit-IDs 1..units abgebildet.
+Anlagen ohne optionale Baugruppen (OPTION, z.B. mkr2) liefern für deren Messwerte -500;
+zusätzliche Register außerhalb der Registerkarte (neuere Firmware) lassen sich mit add_register()
+bereitstellen, Lesezugriffe auf Adressen in `illegal` beantwortet der Simulator mit Exception 2,
+Schreibzugriffe auf Adressen in `read_only` mit Exception 3.
+
+Nur Standardbibliothek; wird von den Benchmarks importiert oder direkt gestartet:
+    python benchmarks/simulator.py --port 5020 --latency 0.02 --jitter 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import struct
+import sys
+from typing import Any, Dict, Iterable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+
+from ha_heliotherm.const import (  # noqa: E402
+    C_DT_BITS,
+    C_REG_TYPE_COILS,
+    C_REG_TYPE_DISCRETE_INPUTS,
+    C_REG_TYPE_HOLDING_REGISTERS,
+    C_REG_TYPE_INPUT_REGISTERS,
+    C_MAX_READ_BITS,
+    C_MAX_READ_REGISTERS,
+    ENTITIES_DICT,
+    REGISTER_TYPES,
+    get_entity_factor,
+    get_entity_max,
+    get_entity_min,
+    get_entity_option,
+    get_entity_reg,
+    get_entity_select,
+    get_entity_switch,
+    get_entity_type,
+    is_entity_readonly,
+    init,
+)
+from ha_heliotherm.decoder import INVALID_RAW  # noqa: E402
+from ha_heliotherm.planner import entity_span  # noqa: E402
+
+_MBAP = struct.Struct(">HHHB")
+
+# Funktionscode -> (Registerart, Bits?) für Lesezugriffe
+_READ_FUNCTIONS = {
+    1: (C_REG_TYPE_COILS, True),
+    2: (C_REG_TYPE_DISCRETE_INPUTS, True),
+    3: (C_REG_TYPE_HOLDING_REGISTERS, False),
+    4: (C_REG_TYPE_INPUT_REGISTERS, False),
+}
+
+# Modbus-Exception-Codes
+ILLEGAL_FUNCTION = 1
+ILLEGAL_ADDRESS = 2
+ILLEGAL_VALUE = 3
+SERVER_BUSY = 6
+GATEWAY_TARGET_FAILED = 11
+
+
+def initial_value(props: Dict[str, Any]) -> float | int:
+    """Plausibler Startwert einer Entität (Anzeigewert, vor FAKTOR)."""
+    switch = get_entity_switch(props)
+    if switch is not None or get_entity_type(props) in (
+        C_REG_TYPE_COILS,
+        C_REG_TYPE_DISCRETE_INPUTS,
+    ):
+        return (switch or {}).get("off", 0)
+    values = get_entity_select(props)
+    if values:
+        return values.get("default", next(k for k in values if isinstance(k, int)))
+    min_value, max_value = get_entity_min(props), get_entity_max(props)
+    if min_value is not None and max_value is not None:
+        return (min_value + max_value) / 2
+    if props.get("UNIT") == "°C":
+        return 20.0
+    if props.get("INC"):
+        return 1000
+    return 0
+
+
+def encode_words(props: Dict[str, Any], value: float | int) -> List[int]:
+    """Anzeigewert -> Registerwörter (Big-Endian, höherwertiges Wort zuerst)."""
+    _, dt = get_entity_reg(props)
+    raw = int(round(value / (get_entity_factor(props) or 1.0)))
+    if dt == C_DT_BITS:
+        return [1 if raw else 0]
+    size = dt.value[1]
+    if size == 1:
+        return [raw & 0xFFFF]
+    raw &= 0xFFFFFFFF
+    return [raw >> 16, raw & 0xFFFF]
+
+
+def build_register_map(without_options: Iterable[str] = ()) -> Dict[int, list]:
+    """
+    Speicherabbild je Registerart aus ENTITIES_DICT (nicht belegte Adressen: 0).
+    without_options: nicht verbaute Optionen, deren Messwerte den Sentinel -500 liefern.
+    """
+    without_options = set(without_options)
+    init()
+    sizes: Dict[int, int] = {}
+    for props in ENTITIES_DICT.values():
+        span = entity_span(props)
+        if span is not None:
+            reg_type = get_entity_type(props)
+            sizes[reg_type] = max(sizes.get(reg_type, 0), span[1] + 1)
+
+    banks: Dict[int, list] = {}
+    for reg_type, size in sizes.items():
+        bits = reg_type in (C_REG_TYPE_COILS, C_REG_TYPE_DISCRETE_INPUTS)
+        banks[reg_type] = [False] * size if bits else [0] * size
+    for props in ENTITIES_DICT.values():
+        reg, _ = get_entity_reg(props)
+        if reg is None or entity_span(props) is None:
+            continue
+        bank = banks[get_entity_type(props)]
+        if get_entity_option(props) in without_options and is_entity_readonly(props):
+            words = encode_words(props, INVALID_RAW * get_entity_factor(props))
+        else:
+            words = encode_words(props, initial_value(props))
+        for offset, word in enumerate(words):
+            bank[reg + offset] = bool(word) if isinstance(bank[0], bool) else word
+    return banks
+
+
+class HeliothermSimulator:
+    """
+    Modbus-TCP-Server mit dem Registerabbild der Heliotherm-Steuerung.
+
+    - latency/jitter: Verzögerung jeder Antwort in Sekunden (latency + uniform(0, jitter));
+      Antworten überlappen sich, solange pipelining=True
+    - processing_time: Bearbeitungszeit je Request, über alle Verbindungen seriell
+    - loss: Wahrscheinlichkeit, dass ein Request unbeantwortet bleibt
+    - disconnect_rate: Wahrscheinlichkeit, dass die Verbindung statt einer Antwort getrennt wird
+    - max_connections: weitere Verbindungen werden sofort geschlossen (None: unbegrenzt)
+    - pipelining=False: Requests bei noch offener Transaktion mit Exception 6 ablehnen
+    - without_options: nicht verbaute Optionen (OPTION in registers.yaml, z.B. "mkr2")
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        units: int = 1,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        processing_time: float = 0.0,
+        loss: float = 0.0,
+        disconnect_rate: float = 0.0,
+        max_connections: int | None = None,
+        pipelining: bool = True,
+        seed: int | None = None,
+        without_options: Iterable[str] = (),
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.processing_time = processing_time
+        self.loss = loss
+        self.disconnect_rate = disconnect_rate
+        self.max_connections = max_connections
+        self.pipelining = pipelining
+        self._rng = random.Random(seed)
+        self.units = {
+            unit: build_register_map(without_options) for unit in range(1, units + 1)
+        }
+        self.stats = {
+            "requests": 0,
+            "responses": 0,
+            "dropped": 0,
+            "disconnects": 0,
+            "busy": 0,
+            "connections": 0,
+            "rejected_connections": 0,
+        }
+        # Registerart -> Adressen, die Lese- und Schreibzugriffe mit Exception 2 ablehnen (alle Units)
+        self.illegal: Dict[int, set[int]] = {}
+        # Registerart -> Adressen, deren Schreibzugriffe mit Exception 3 abgelehnt werden (gesperrte
+        # Parameter); Lesen bleibt möglich
+        self.read_only: Dict[int, set[int]] = {}
+        self._open_connections = 0
+        self._cpu = asyncio.Lock()
+        self._server: asyncio.AbstractServer | None = None
+        self._handlers: set[asyncio.Task] = set()
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> int:
+        """Server starten; liefert den tatsächlich belegten Port (port=0: frei gewählt)."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # offene Verbindungen trennen, damit die Handler sauber enden
+            for writer in list(self._writers):
+                writer.close()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> HeliothermSimulator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    # ---- Registerwerte ----------------------------------------------------
+
+    def set_value(self, entity_key: str, value: float | int, unit: int = 1) -> None:
+        """Anzeigewert einer Entität setzen (z.B. Verdichter an, Temperatur ändern)."""
+        props = ENTITIES_DICT[entity_key]
+        reg, _ = get_entity_reg(props)
+        bank = self.units[unit][get_entity_type(props)]
+        for offset, word in enumerate(encode_words(props, value)):
+            bank[reg + offset] = bool(word) if isinstance(bank[0], bool) else word
+
+    def add_register(self, reg_type: int, address: int, value: int, unit: int | None = None) -> None:
+        """
+        Register außerhalb der Registerkarte bereitstellen (Rohwert, unit None: alle Units).
+        Vergrößert das Abbild; dabei entstehende Lücken lehnt der Simulator mit Exception 2 ab.
+        """
+        illegal = self.illegal.setdefault(reg_type, set())
+        for banks in [self.units[unit]] if unit else self.units.values():
+            bank = banks.setdefault(reg_type, [])
+            if address >= len(bank):
+                illegal.update(range(len(bank), address))
+                bank.extend([0] * (address + 1 - len(bank)))
+            bank[address] = value & 0xFFFF
+        illegal.discard(address)
+
+    def get_words(self, entity_key: str, unit: int = 1) -> List[int | bool]:
+        """Rohwerte einer Entität."""
+        props = ENTITIES_DICT[entity_key]
+        first, last = entity_span(props)
+        return self.units[unit][get_entity_type(props)][first : last + 1]
+
+    # ---- Protokoll --------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if self.max_connections is not None and self._open_connections >= self.max_connections:
+            self.stats["rejected_connections"] += 1
+            writer.close()
+            return
+        self._open_connections += 1
+        self.stats["connections"] += 1
+        self._handlers.add(asyncio.current_task())
+        self._writers.add(writer)
+        loop = asyncio.get_running_loop()
+        outstanding = 0
+
+        def send(tid: int, unit: int, pdu: bytes) -> None:
+            nonlocal outstanding
+            outstanding -= 1
+            if not writer.is_closing():
+                writer.write(_MBAP.pack(tid, 0, len(pdu) + 1, unit) + pdu)
+                self.stats["responses"] += 1
+
+        try:
+            while True:
+                tid, _protocol, length, unit = _MBAP.unpack(await reader.readexactly(7))
+                pdu = await reader.readexactly(length - 1)
+                self.stats["requests"] += 1
+
+                if self._rng.random() < self.disconnect_rate:
+                    self.stats["disconnects"] += 1
+                    break
+                if self._rng.random() < self.loss:
+                    self.stats["dropped"] += 1
+                    continue
+                if not self.pipelining and outstanding:
+                    self.stats["busy"] += 1
+                    outstanding += 1
+                    send(tid, unit, _exception(pdu[0], SERVER_BUSY))
+                    continue
+
+                outstanding += 1
+                async with self._cpu:
+                    if self.processing_time:
+                        await asyncio.sleep(self.processing_time)
+                    response = self._process(unit, pdu)
+                delay = self.latency + self._rng.uniform(0, self.jitter)
+                if delay > 0:
+                    loop.call_later(delay, send, tid, unit, response)
+                else:
+                    send(tid, unit, response)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._open_connections -= 1
+            self._handlers.discard(asyncio.current_task())
+            self._writers.discard(writer)
+            writer.close()
+
+    def _process(self, unit: int, pdu: bytes) -> bytes:
+        """Request-PDU -> Antwort-PDU."""
+        function_code = pdu[0]
+        banks = self.units.get(unit)
+        if banks is None:
+            return _exception(function_code, GATEWAY_TARGET_FAILED)
+
+        if function_code in _READ_FUNCTIONS:
+            reg_type, bits = _READ_FUNCTIONS[function_code]
+            address, count = struct.unpack(">HH", pdu[1:5])
+            limit = C_MAX_READ_BITS if bits else C_MAX_READ_REGISTERS
+            if not 1 <= count <= limit:
+                return _exception(function_code, ILLEGAL_VALUE)
+            bank = banks.get(reg_type, [])
+            if address + count > len(bank) or self._rejects(reg_type, address, count):
+                return _exception(function_code, ILLEGAL_ADDRESS)
+            values = bank[address : address + count]
+            if bits:
+                data = bytes(
+                    sum(1 << i for i, bit in enumerate(values[k : k + 8]) if bit)
+                    for k in range(0, count, 8)
+                )
+            else:
+                data = struct.pack(f">{count}H", *values)
+            return bytes((function_code, len(data))) + data
+
+        if function_code in (5, 6):
+            address, value = struct.unpack(">HH", pdu[1:5])
+            reg_type = C_REG_TYPE_COILS if function_code == 5 else C_REG_TYPE_HOLDING_REGISTERS
+            bank = banks.get(reg_type, [])
+            if address >= len(bank) or self._rejects(reg_type, address, 1):
+                return _exception(function_code, ILLEGAL_ADDRESS)
+            if self._rejects(reg_type, address, 1, self.read_only):
+                return _exception(function_code, ILLEGAL_VALUE)
+            bank[address] = value == 0xFF00 if function_code == 5 else value
+            return pdu[:5]
+
+        if function_code in (15, 16):
+            address, count, _byte_count = struct.unpack(">HHB", pdu[1:6])
+            reg_type = C_REG_TYPE_COILS if function_code == 15 else C_REG_TYPE_HOLDING_REGISTERS
+            bank = banks.get(reg_type, [])
+            if address + count > len(bank) or self._rejects(reg_type, address, count):
+                return _exception(function_code, ILLEGAL_ADDRESS)
+            if self._rejects(reg_type, address, count, self.read_only):
+                return _exception(function_code, ILLEGAL_VALUE)
+            data = pdu[6:]
+            if function_code == 15:
+                for i in range(count):
+                    bank[address + i] = bool(data[i >> 3] >> (i & 7) & 1)
+            else:
+                bank[address : address + count] = struct.unpack(f">{count}H", data[: count * 2])
+            return pdu[:5]
+
+        return _exception(function_code, ILLEGAL_FUNCTION)
+
+    def _rejects(
+        self, reg_type: int, address: int, count: int, addresses: Dict[int, set[int]] | None = None
+    ) -> bool:
+        illegal = (self.illegal if addresses is None else addresses).get(reg_type)
+        return bool(illegal) and not illegal.isdisjoint(range(address, address + count))
+
+
+def _exception(function_code: int, code: int) -> bytes:
+    return bytes((function_code | 0x80, code))
+
+
+async def _main(args: argparse.Namespace) -> None:
+    simulator = HeliothermSimulator(
+        host=args.host,
+        port=args.port,
+        units=args.units,
+        latency=args.latency,
+        jitter=args.jitter,
+        processing_time=args.processing_time,
+        loss=args.loss,
+        disconnect_rate=args.disconnect_rate,
+        max_connections=args.max_connections,
+        pipelining=not args.no_pipelining,
+        seed=args.seed,
+        without_options=args.without_option,
+    )
+    for spec in args.illegal:
+        name, _, address = spec.partition(":")
+        simulator.illegal.setdefault(REGISTER_TYPES[name], set()).add(int(address))
+    port = await simulator.start()
+    print(f"Heliotherm-Simulator auf {args.host}:{port} ({args.units} Unit(s)), Strg+C beendet.")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+        print(simulator.stats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--units", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--processing-time", type=float, default=0.0)
+    parser.add_argument("--loss", type=float, default=0.0)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    parser.add_argument("--max-connections", type=int, default=None)
+    parser.add_argument("--no-pipelining", action="store_true")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--illegal",
+        action="append",
+        default=[],
+        help="Adresse mit Exception 2 ablehnen, z.B. input_registers:31",
+    )
+    parser.add_argument(
+        "--without-option", action="append", default=[], help="nicht verbaute Option, z.B. mkr2"
+    )
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
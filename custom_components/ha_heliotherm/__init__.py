@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import struct
+import time
+from collections import OrderedDict
 from datetime import timedelta
-import threading
-from typing import Any, Dict, Iterable, Tuple, Optional
+from typing import Any, Dict, Iterable, Sequence, Tuple, Optional
 
 
-from pymodbus.client import ModbusTcpClient
+from pymodbus.client import AsyncModbusTcpClient
 
-from pymodbus.exceptions import ConnectionException
+from pymodbus.exceptions import ConnectionException, ModbusException, ModbusIOException
 
 import voluptuous as vol
 
@@ -23,11 +25,22 @@ from homeassistant.const import (
     # CONF_DEVICE,
     Platform,
 )
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ConfigEntryError, HomeAssistantError
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
 from . import const
+from .connection import acquire_connection, release_connection
+from .coordinator import HeliothermCoordinator
+from .discovery import candidate_ranges, discover
+from .aggregator import EntityAggregator, build_aggregators
+from .history import RegisterHistory, build_histories
+from .metrics import Histogram, HubMetrics
+from .pipeline import PipelineError, PipelineRejectedError
+from .profile import build_profile, profile_matches
 from .const import (
     DEFAULT_NAME,
     DEFAULT_PORT,
@@ -35,6 +48,15 @@ from .const import (
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     CONF_HOSTID,
+    CONF_BOOST_WINDOW,
+    DEFAULT_BOOST_WINDOW,
+    CONF_PIPELINING,
+    DEFAULT_PIPELINING,
+    SERVICE_TRACE_CYCLE,
+    SERVICE_PROBE_PROFILE,
+    SERVICE_DISCOVER_REGISTERS,
+    SERVICE_REFRESH_ON_DEMAND,
+    CONF_PROFILE,
     ENTITIES_DICT,
     BINARYSENSOR_TYPES,
     SENSOR_TYPES,
@@ -51,19 +73,31 @@ from .const import (
     get_entity_reg,
     get_entity_props,
     get_entity_ha,
+    is_entity_boost,
     is_entity_readonly,
     is_entity_switch,
     is_entity_select,
     is_entity_climate,
-    C_MIN_INPUT_REGISTER,
-    C_MAX_INPUT_REGISTER,
-    C_MIN_HOLDING_REGISTER,
-    C_MAX_HOLDING_REGISTER,
-    C_MIN_COILS,
-    C_MAX_COILS,
-    C_MIN_DISCRETE_INPUTS,
-    C_MAX_DISCRETE_INPUTS,
+    READ_PLAN,
+    BLOCK_DECODERS,
+    POLL_CLASS_TICKS,
+    C_POLL_FAST,
+    C_WRITE_DEBOUNCE,
+    C_HISTORY_SIZE,
+    C_VERIFY_PLAN_CACHE_SIZE,
+    C_SPLIT_EXCEPTION_CODES,
+    C_QUARANTINE_RETRY,
+    C_QUARANTINE_RETRY_MAX,
+    C_PIPELINE_RETRY,
+    C_PIPELINE_RETRY_MAX,
+    C_DISCOVERY_REQUEST_DELAY,
+    C_DISCOVERY_SAMPLES,
+    C_DISCOVERY_SAMPLE_INTERVAL,
+    C_DISCOVERY_START_DELAY,
+    C_DISCOVERY_STORE_VERSION,
 )
+from .planner import BlockSplit, ReadBlock, BIT_TYPES, plan_reads, plan_writes, sub_block
+from .decoder import BlockDecoder, compile_decoders
 
 
 import sys
@@ -71,8 +105,7 @@ import logging
 
 thismodule = sys.modules[__name__]
 _LOGGER = logging.getLogger(__name__)
-_LOGGER.setLevel(logging.DEBUG)
-_LOGGER.info(f"{thismodule} loaded.")
+_LOGGER.debug("%s loaded.", thismodule)
 
 PLATFORMS = [
     Platform.BINARY_SENSOR,  # BINARYSENSOR_TYPES (r/o)
@@ -86,8 +119,16 @@ PLATFORMS = [
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up a modbus connection."""
-    _LOGGER.info(f"Setup Entry: {entry}")
-    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    _LOGGER.debug("Setup Entry: %s", entry)
+    # Registerkarte erst hier laden und übersetzen (einmal je Prozess), nicht beim Import;
+    # liest registers.yaml bzw. das Kompilat unter .storage, daher im Executor. regmap (yaml,
+    # voluptuous) wird ebenfalls erst hier geladen.
+    from .regmap import RegisterMapError
+
+    try:
+        await hass.async_add_executor_job(const.init, hass.config.config_dir)
+    except RegisterMapError as err:
+        raise ConfigEntryError(str(err)) from err
     hass.data.setdefault(DOMAIN, {})
 
     host = entry.options.get(CONF_HOST, entry.data.get(CONF_HOST))
@@ -110,23 +151,185 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     except (TypeError, ValueError):
         hostid = DEFAULT_HOSTID
 
+    boost_window = entry.options.get(
+        CONF_BOOST_WINDOW, entry.data.get(CONF_BOOST_WINDOW, DEFAULT_BOOST_WINDOW)
+    )
+    try:
+        boost_window = max(0, int(boost_window))
+    except (TypeError, ValueError):
+        boost_window = DEFAULT_BOOST_WINDOW
+
+    pipelining = bool(
+        entry.options.get(CONF_PIPELINING, entry.data.get(CONF_PIPELINING, DEFAULT_PIPELINING))
+    )
+
     _LOGGER.info("Setup %s.%s", DOMAIN, name)
 
-    hub = MyModbusHub(hass, name, host, port, scan_interval, hostid)
+    # Gespeichertes Geräteprofil nur, solange es zur geladenen Registerkarte passt
+    profile = entry.data.get(CONF_PROFILE)
+    if not profile_matches(profile, ENTITIES_DICT):
+        profile = None
+
+    hub = MyModbusHub(
+        hass, name, host, port, scan_interval, hostid, boost_window, pipelining, profile
+    )
     # """Register the hub."""
     hass.data[DOMAIN][name] = {"hub": hub}
 
+    if profile is None:
+        # Einmalig: Gerät abfragen und das Profil im Config-Entry speichern (noch ohne
+        # Update-Listener, sonst würde das Speichern den Entry neu laden)
+        profile = await hub.async_probe_profile()
+        if profile is None:
+            _LOGGER.warning(
+                "Geräteprofil für %s nicht ermittelt (Gerät nicht erreichbar), lese alle Register",
+                name,
+            )
+        else:
+            hub.apply_profile(profile)
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, CONF_PROFILE: profile}
+            )
+            _LOGGER.info(
+                "Geräteprofil für %s: Optionen %s, %s von %s Entitäten nicht vorhanden",
+                name,
+                profile["options"],
+                len(profile["absent"]),
+                len(ENTITIES_DICT),
+            )
+    _async_remove_absent_entities(hass, entry, hub)
+
+    await _async_setup_discovery(hass, entry, hub)
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    _async_register_services(hass)
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
 
+@callback
+def _async_remove_absent_entities(hass: HomeAssistant, entry: ConfigEntry, hub: MyModbusHub) -> None:
+    """Entitäten aus der Entity-Registry entfernen, die das Gerät laut Geräteprofil nicht liefert."""
+    registry = er.async_get(hass)
+    prefix = f"{entry.entry_id}_"
+    for registry_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        unique_id = registry_entry.unique_id
+        if unique_id.startswith(prefix) and not hub.has_entity(unique_id[len(prefix):]):
+            _LOGGER.debug("Entferne nicht vorhandene Entität %s", registry_entry.entity_id)
+            registry.async_remove(registry_entry.entity_id)
+
+
+def _discovery_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Gespeichertes Ergebnis der Register-Suche je Config-Entry."""
+    return Store(hass, C_DISCOVERY_STORE_VERSION, f"{DOMAIN}.discovery.{entry.entry_id}")
+
+
+async def _async_setup_discovery(hass: HomeAssistant, entry: ConfigEntry, hub: MyModbusHub) -> None:
+    """Register-Suche nur, solange kein Ergebnis gespeichert ist (läuft im Hintergrund)."""
+    hub.discovery = await _discovery_store(hass, entry).async_load()
+    if hub.discovery is None:
+        _async_start_discovery(hass, entry, C_DISCOVERY_START_DELAY)
+
+
+@callback
+def _async_start_discovery(hass: HomeAssistant, entry: ConfigEntry, delay: float) -> None:
+    """Register-Suche nach `delay` Sekunden im Hintergrund starten (endet mit dem Entry)."""
+    hub_data = hass.data[DOMAIN][entry.data[CONF_NAME]]
+    task = hub_data.get("discovery_task")
+    if task is not None and not task.done():
+        return
+    hub = hub_data["hub"]
+
+    async def _async_discover() -> None:
+        await asyncio.sleep(delay)
+        report = await hub.async_discover_registers()
+        if report is None:
+            return
+        hub.discovery = report
+        await _discovery_store(hass, entry).async_save(report)
+        _LOGGER.info(
+            "Register-Suche %s: antwortende Register %s (%s Requests, %s s)",
+            hub.name,
+            {reg_type: len(found) for reg_type, found in report["registers"].items()},
+            report["requests"],
+            report["duration_s"],
+        )
+
+    hub_data["discovery_task"] = entry.async_create_background_task(
+        hass, _async_discover(), f"{DOMAIN} discovery {hub.name}"
+    )
+
+
+@callback
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Dienste trace_cycle, refresh_on_demand, probe_profile und discover_registers einmalig registrieren (gelten für alle Hubs der Integration)."""
+    if hass.services.has_service(DOMAIN, SERVICE_TRACE_CYCLE):
+        return
+
+    async def _async_trace_cycle(call: ServiceCall) -> None:
+        name = call.data.get(CONF_NAME)
+        for hub_name, hub_data in hass.data[DOMAIN].items():
+            if name in (None, hub_name):
+                await hub_data["hub"].async_trace_cycle()
+
+    async def _async_refresh_on_demand(call: ServiceCall) -> None:
+        name = call.data.get(CONF_NAME)
+        for hub_name, hub_data in hass.data[DOMAIN].items():
+            if name in (None, hub_name):
+                await hub_data["hub"].async_refresh_on_demand()
+
+    async def _async_probe_profile(call: ServiceCall) -> None:
+        # Profil verwerfen und Entry neu laden -> das Setup ermittelt das Profil neu
+        name = call.data.get(CONF_NAME)
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            if entry.data.get(CONF_NAME) not in hass.data[DOMAIN] or name not in (
+                None,
+                entry.data.get(CONF_NAME),
+            ):
+                continue
+            if CONF_PROFILE in entry.data:
+                data = dict(entry.data)
+                data.pop(CONF_PROFILE)
+                # Update-Listener lädt den Entry neu
+                hass.config_entries.async_update_entry(entry, data=data)
+            else:
+                await hass.config_entries.async_reload(entry.entry_id)
+
+    async def _async_discover_registers(call: ServiceCall) -> None:
+        # Suche sofort (erneut) starten; das gespeicherte Ergebnis wird erst danach ersetzt
+        name = call.data.get(CONF_NAME)
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            if entry.data.get(CONF_NAME) in hass.data[DOMAIN] and name in (
+                None,
+                entry.data.get(CONF_NAME),
+            ):
+                _async_start_discovery(hass, entry, 0)
+
+    schema = vol.Schema({vol.Optional(CONF_NAME): cv.string})
+    hass.services.async_register(DOMAIN, SERVICE_TRACE_CYCLE, _async_trace_cycle, schema=schema)
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH_ON_DEMAND, _async_refresh_on_demand, schema=schema
+    )
+    hass.services.async_register(DOMAIN, SERVICE_PROBE_PROFILE, _async_probe_profile, schema=schema)
+    hass.services.async_register(
+        DOMAIN, SERVICE_DISCOVER_REGISTERS, _async_discover_registers, schema=schema
+    )
+
+
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     await hass.config_entries.async_reload(entry.entry_id)
 
 
 async def async_unload_entry(hass, entry):
     """Unload modbus entry."""
+    name = entry.data[CONF_NAME]
+    hub_data = hass.data[DOMAIN].get(name)
+    if hub_data:
+        # Vorgemerkte Schreibzugriffe ausführen, solange die Verbindung noch belegt ist
+        await hub_data["hub"].async_flush_writes()
+
     unload_ok = all(
         await asyncio.gather(
             *[
@@ -138,13 +341,25 @@ async def async_unload_entry(hass, entry):
     if not unload_ok:
         return False
 
-    name = entry.data[CONF_NAME]
-    hass.data[DOMAIN].pop(name, None)
+    hub_data = hass.data[DOMAIN].pop(name, None)
+    if hub_data:
+        # Modbus-Verbindung freigeben (geteilte Verbindungen bleiben für andere Hubs offen)
+        hub_data["hub"].close()
+    if not hass.data[DOMAIN]:
+        hass.services.async_remove(DOMAIN, SERVICE_TRACE_CYCLE)
+        hass.services.async_remove(DOMAIN, SERVICE_REFRESH_ON_DEMAND)
+        hass.services.async_remove(DOMAIN, SERVICE_PROBE_PROFILE)
+        hass.services.async_remove(DOMAIN, SERVICE_DISCOVER_REGISTERS)
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Gespeichertes Ergebnis der Register-Suche mit dem Entry entfernen."""
+    await _discovery_store(hass, entry).async_remove()
+
+
 class MyModbusHub:
-    """Thread safe wrapper class for pymodbus."""
+    """Asyncio wrapper class for pymodbus (blockiert nie den Event-Loop)."""
 
     def __init__(
         self,
@@ -154,75 +369,510 @@ class MyModbusHub:
         port,
         scan_interval,
         hostid,
+        boost_window: int = DEFAULT_BOOST_WINDOW,
+        pipelining: bool = DEFAULT_PIPELINING,
+        profile: Dict[str, Any] | None = None,
     ):
-        """Initialize the Modbus hub."""
+        """Initialize the Modbus hub.
+
+        profile: Geräteprofil (profile.build_profile), None: vollständige Registerkarte.
+        """
         self._hass = hass
-        self._client = ModbusTcpClient(host=host, port=port, timeout=3, retries=3)
-        self._lock = threading.Lock()
+        self._host = host
+        self._port = port
+        # Eine dauerhafte Verbindung für Poller und Schreibzugriffe, geteilt mit allen Hubs
+        # am selben host:port (Gateway-Betrieb, Unit-ID = hostid)
+        self._conn_acquired = False
+        self._acquire_connection()
         self._name = name
-        self._scan_interval = timedelta(seconds=scan_interval)
         self._hostid = hostid
-        self._unsub_interval_method = None
-        self._sensors = []
+        # Abfragezyklen über den Coordinator (adaptives Intervall, keine überlappenden Zyklen)
+        self._coordinator = HeliothermCoordinator(
+            hass, self, timedelta(seconds=scan_interval)
+        )
+        self._unsub_coordinator = None
+        # Entity-Key -> Update-Callbacks; Key None: Callback bei jedem erfolgreichen Zyklus
+        self._listeners: Dict[str | None, list] = {}
+        self._listener_count = 0
         self.data: Dict[str, Any] = {}
+        # Keys, deren Wert sich seit der letzten Benachrichtigung geändert hat
+        self._changed_keys: set[str] = set()
+        # Keys aller seit der letzten Benachrichtigung gelesenen Blöcke (auch unverändert), nur
+        # bei aufbereiteten Entitäten (DEADBAND/MIN_INTERVAL/WINDOW) gesammelt: je Lesung ein
+        # Messwert für deren Fenster
+        self._read_keys: set[str] = set()
+
+        # Abfrageklassen: Zykluszähler (nächster fälliger Zyklus je Block: apply_profile)
+        self._tick = 0
+        self._on_demand_requested = False
+
+        # Boost: nach einer Zustandsänderung einer BOOST-Entität werden die schnellen Blöcke
+        # für boost_window Sekunden im Abstand C_BOOST_INTERVAL gelesen (0: Boost aus)
+        self._boost_window = boost_window
+        self._boost_until = 0.0
+        self.boost_count = 0
+
+        # Pipelining (Option): alle Blöcke eines Zyklus ohne Warten über die gemeinsame
+        # Verbindung senden; bei protokollwidrigen Antworten wird dauerhaft seriell gelesen,
+        # nach Timeout, Verbindungsabbruch oder Exception-Antwort bis _pipeline_retry_at (Backoff)
+        self._pipelining = pipelining
+        self.pipelined_cycles = 0
+        self._pipeline_failures = 0
+        self._pipeline_retry_at = 0.0
+
+        # Gesammelte Schreibzugriffe: Entity-Key -> (Register, Rohwerte, Datentyp)
+        self._pending_writes: Dict[str, Tuple[int, Tuple[int, ...], Any]] = {}
+        # Aufrufer von write_entity_value je Entity-Key, warten auf das Ergebnis des Schreibzugriffs
+        self._write_waiters: Dict[str, list[asyncio.Future]] = {}
+        self._flush_task: asyncio.Task | None = None
+        # Leseplan + Dekodierer je Menge geschriebener Entitäten (Rücklesen nach dem Schreiben),
+        # die C_VERIFY_PLAN_CACHE_SIZE zuletzt benutzten
+        self._verify_plans: OrderedDict[
+            frozenset, Tuple[list[ReadBlock], list[BlockDecoder]]
+        ] = OrderedDict()
+        self._write_count = 0
+        self._write_skip_count = 0
+        # Zähler/Histogramme für Diagnose-Sensoren und Diagnose-Download
+        self.metrics = HubMetrics()
+
+        # Trace-Zyklus (async_trace_cycle): Roh- und dekodierte Werte aller Blöcke eines
+        # vollständigen Lesezyklus; routinemäßige Zyklen protokollieren keine Registerwerte
+        self._trace_requested = False
+        self._trace: list[Dict[str, Any]] | None = None
+        self.last_trace: Dict[str, Any] | None = None
+        # Ergebnis der Register-Suche (async_discover_registers), gespeichert je Config-Entry
+        self.discovery: Dict[str, Any] | None = None
+
+        # Entitäten, Leseplan und Dekodiertabelle dieses Geräts
+        self.apply_profile(profile)
+
+    def apply_profile(self, profile: Dict[str, Any] | None) -> None:
+        """
+        Nur die Entitäten lesen, die das Gerät laut Geräteprofil liefert (None: vollständige
+        Registerkarte). Leseplan und Dekodiertabelle werden dafür neu erstellt; vor dem Anlegen
+        der Entitäten aufrufen, da sämtliche Zustände je Entität und Block neu beginnen.
+        """
+        self.profile = profile
+        self._absent = frozenset(profile["absent"]) if profile else frozenset()
+        if self._absent:
+            entities = {
+                entity_key: props
+                for entity_key, props in ENTITIES_DICT.items()
+                if entity_key not in self._absent
+            }
+            self._plan = plan_reads(entities)
+            self._decoders = compile_decoders(entities, self._plan)
+        else:
+            entities = ENTITIES_DICT
+            self._plan, self._decoders = READ_PLAN, BLOCK_DECODERS
+        self._entities = entities
+
+        # Entitäten mit DEADBAND/MIN_INTERVAL/WINDOW: an HA geht der aufbereitete Wert
+        # (entity_value), self.data enthält weiterhin den zuletzt gelesenen Wert
+        self._aggregators: Dict[str, EntityAggregator] = build_aggregators(entities)
+        # Nächster fälliger Zyklus je Block aus self._plan (None: Block der Klasse
+        # C_POLL_ON_DEMAND, erst nach async_refresh_on_demand() wieder fällig)
+        self._next_due: list[int | None] = [0] * len(self._plan)
+        self._boost_keys = tuple(
+            entity_key for entity_key, props in entities.items() if is_entity_boost(props)
+        )
+        self._boost_blocks = [
+            idx for idx, block in enumerate(self._plan) if block.poll == C_POLL_FAST
+        ]
+        # Zuletzt gelesene Rohwerte je Registerart samt Verlauf der letzten C_HISTORY_SIZE
+        # Lesezugriffe (Vergleich vor dem Schreiben, Änderungserkennung, register_history())
+        self._history: Dict[int, RegisterHistory] = build_histories(entities, C_HISTORY_SIZE)
+        # Dekodierer, die schon einmal gelaufen sind (erst danach darf bei unveränderten
+        # Rohwerten das Dekodieren entfallen)
+        self._primed_decoders: set[BlockDecoder] = set()
+        # Blöcke mit abgelehnten Adressen -> lesbare Teilblöcke und Entitäten in Quarantäne
+        self._splits: Dict[ReadBlock, BlockSplit] = {}
+
+    def has_entity(self, entity_key: str) -> bool:
+        """False, wenn das Gerät die Entität laut Geräteprofil nicht liefert."""
+        return entity_key not in self._absent
+
+    async def async_probe_profile(self) -> Dict[str, Any] | None:
+        """
+        Geräteprofil ermitteln: alle Blöcke der vollständigen Registerkarte einmal lesen.
+        Lehnt das Gerät einen Block mit einer Fehlerantwort ab, werden dessen Entitäten einzeln
+        gelesen. None, wenn das Gerät nicht erreichbar ist.
+        """
+        raw_values: Dict[str, Any] = {}
+        unreadable: list[str] = []
+        async with self._lock:
+            if not await self._conn.async_ensure_connected():
+                return None
+            try:
+                for block, decoder in zip(READ_PLAN, BLOCK_DECODERS):
+                    buf = await self._read_block(block)
+                    if buf is not None:
+                        raw_values.update(
+                            zip((entry.key for entry in decoder.entries), decoder.raw_values(buf))
+                        )
+                        continue
+                    for entity_key in block.keys:
+                        entities = {entity_key: ENTITIES_DICT[entity_key]}
+                        (single,) = plan_reads(entities)
+                        (single_decoder,) = compile_decoders(entities, [single])
+                        buf = await self._read_block(single)
+                        if buf is None:
+                            unreadable.append(entity_key)
+                        else:
+                            raw_values[entity_key] = single_decoder.raw_values(buf)[0]
+            except ModbusException as exc:
+                _LOGGER.warning("Modbus read failed: %s", exc)
+                self._on_modbus_error(exc)
+                return None
+        profile = build_profile(ENTITIES_DICT, raw_values, unreadable)
+        profile["time"] = dt_util.utcnow().isoformat()
+        return profile
+
+    async def async_discover_registers(
+        self,
+        ranges: Dict[int, Sequence[Tuple[int, int]]] | None = None,
+        request_delay: float = C_DISCOVERY_REQUEST_DELAY,
+        samples: int = C_DISCOVERY_SAMPLES,
+        sample_interval: float = C_DISCOVERY_SAMPLE_INTERVAL,
+    ) -> Dict[str, Any] | None:
+        """
+        Register-Suche (discovery.discover): welche Adressen außerhalb der Registerkarte antworten
+        und wie stark ihre Werte schwanken. Standard: alle nicht belegten Adressen unterhalb von
+        C_DISCOVERY_LIMITS. Jeder Request belegt die Verbindung einzeln, das Abfragen läuft weiter.
+        None, wenn die Suche wegen eines Verbindungs- oder IO-Fehlers abbricht.
+        """
+        if ranges is None:
+            ranges = candidate_ranges(ENTITIES_DICT)
+        try:
+            report = await discover(
+                self._read_raw, ranges, samples, sample_interval, request_delay=request_delay
+            )
+        except ModbusException as exc:
+            _LOGGER.warning("Register-Suche %s abgebrochen: %s", self._name, exc)
+            return None
+        report["time"] = dt_util.utcnow().isoformat()
+        return report
+
+    async def _read_raw(self, reg_type: int, address: int, count: int) -> list[int | bool] | None:
+        """Beliebige Adressen lesen (außerhalb des Leseplans, ohne Metriken); None bei Fehlerantwort."""
+        read_func = self._read_function(reg_type)
+        if read_func is None:
+            return None
+        is_bits = reg_type in BIT_TYPES
+        async with self._lock:
+            if not await self._conn.async_ensure_connected():
+                raise ConnectionException(f"{self._host}:{self._port} nicht erreichbar")
+            try:
+                result = await read_func(address=address, count=count, device_id=self._hostid)
+            except ModbusException as exc:
+                self._on_modbus_error(exc)
+                raise
+        values = getattr(result, "bits" if is_bits else "registers", None)
+        if result.isError() or values is None or len(values) < count:
+            return None
+        return list(values[:count])
 
     @callback
-    def async_add_my_modbus_sensor(self, update_callback):
-        """Listen for data updates."""
-        # This is the first sensor, set up interval.
-        if not self._sensors:
+    def async_add_my_modbus_sensor(self, update_callback, entity_key: str | None = None):
+        """Listen for data updates.
+
+        Mit entity_key wird der Callback nur aufgerufen, wenn sich der Wert dieser Entität ändert.
+        """
+        # This is the first sensor, start polling.
+        if not self._listener_count:
             # DO NOT open connection here anymore: self.connect()
-            self._unsub_interval_method = async_track_time_interval(
-                self._hass, self.async_refresh_modbus_data, self._scan_interval
+            self._acquire_connection()
+            self._unsub_coordinator = self._coordinator.async_add_listener(
+                self._on_coordinator_update
             )
 
-        self._sensors.append(update_callback)
+        self._listeners.setdefault(entity_key, []).append(update_callback)
+        self._listener_count += 1
 
     @callback
-    def async_remove_my_modbus_sensor(self, update_callback):
+    def async_remove_my_modbus_sensor(self, update_callback, entity_key: str | None = None):
         """Remove data update."""
-        self._sensors.remove(update_callback)
-
-        if not self._sensors:
-            # """stop the interval timer upon removal of last sensor"""
-            self._unsub_interval_method()
-            self._unsub_interval_method = None
+        callbacks = self._listeners.get(entity_key, [])
+        callbacks.remove(update_callback)
+        if not callbacks:
+            self._listeners.pop(entity_key, None)
+        self._listener_count -= 1
+
+        if not self._listener_count:
+            # """stop polling upon removal of last sensor"""
+            self._unsub_coordinator()
+            self._unsub_coordinator = None
             self.close()
 
-    async def async_refresh_modbus_data(self, _now: Optional[int] = None) -> None:
-        """Time to update."""
-        if not self._sensors:
+    async def async_poll_cycle(self, boost_only: bool = False) -> bool | None:
+        """
+        Ein Abfragezyklus (vom Coordinator aufgerufen): liest die fälligen Blöcke.
+        boost_only=True: Zwischenzyklus im Boost, nur die schnellen Blöcke, ohne Zykluszählung.
+        True: Register gelesen, False: kein Block fällig, None: Verbindungs- oder Lesefehler.
+        """
+        async with self._lock:
+            tick = self._tick
+            if boost_only:
+                due = self._boost_blocks
+            else:
+                self._tick += 1
+                due = self._due_blocks(tick)
+                if self._trace_requested:
+                    # Trace: vollständiger Lesezyklus über alle Blöcke
+                    self._trace_requested = False
+                    self._trace = []
+                    due = list(range(len(self._plan)))
+            if not due:
+                return False
+
+            if not await self._conn.async_ensure_connected():
+                return None
+
+            previous = [self.data.get(entity_key) for entity_key in self._boost_keys]
+            start = time.perf_counter()
+            try:
+                update_result = await self.read_modbus_registers(due)
+            except ModbusException as exc:
+                _LOGGER.warning("Modbus read failed: %s", exc)
+                self._on_modbus_error(exc)
+                update_result = False
+
+            self.metrics.count("cycles")
+            if self._trace is not None:
+                self._finish_trace(bool(update_result), time.perf_counter() - start)
+            if not update_result:
+                self.metrics.count("read_errors")
+                return None
+            self.metrics.cycle_time.observe(time.perf_counter() - start)
+            if not boost_only:
+                self._schedule_blocks(due, tick)
+            self._check_boost(previous)
+            return True
+
+    async def async_trace_cycle(self) -> None:
+        """Nächsten regulären Zyklus als Trace-Zyklus ausführen (Dienst ha_heliotherm.trace_cycle)."""
+        self._trace_requested = True
+        await self._coordinator.async_request_refresh()
+
+    def _finish_trace(self, success: bool, duration: float) -> None:
+        """Trace-Zyklus abschließen: Momentaufnahme merken und einmalig protokollieren."""
+        trace, self._trace = self._trace, None
+        self.last_trace = {
+            "time": dt_util.utcnow().isoformat(),
+            "hub": self._name,
+            "unit": self._hostid,
+            "success": success,
+            "duration_ms": round(duration * 1e3, 3),
+            "blocks": trace,
+        }
+        _LOGGER.info("Trace-Zyklus %s: %s", self._name, json.dumps(self.last_trace, default=str))
+
+    def _check_boost(self, previous: list[Any]) -> None:
+        """Boost-Fenster (neu) starten, wenn sich der Zustand einer BOOST-Entität geändert hat."""
+        if not self._boost_window:
             return
+        for entity_key, old in zip(self._boost_keys, previous):
+            # old None: erster Lesezyklus, kein Zustandswechsel
+            if old is not None and self.data.get(entity_key) != old:
+                if not self.boost_active:
+                    self.boost_count += 1
+                    _LOGGER.debug("Boost durch %s: %s -> %s", entity_key, old, self.data.get(entity_key))
+                self._boost_until = time.monotonic() + self._boost_window
+                return
 
+    @property
+    def boost_active(self) -> bool:
+        """True, solange das Boost-Fenster läuft."""
+        return time.monotonic() < self._boost_until
 
-        if not self._client.connect():
-            _LOGGER.warning("Modbus connect failed")
-            return
+    @property
+    def full_cycle_requested(self) -> bool:
+        """True, wenn ein Trace- oder On-Demand-Zyklus angefordert ist (auch im Boost sofort)."""
+        return self._trace_requested or self._on_demand_requested
 
-        try:
-            update_result = self.read_modbus_registers()
-        finally:
-            self._client.close()
+    @callback
+    def _on_coordinator_update(self) -> None:
+        """Nach einem Zyklus mit gelesenen Registern die Entitäten benachrichtigen."""
+        if self._coordinator.last_update_success and self._coordinator.data:
+            self._notify_listeners()
 
-        if update_result:
-            for update_callback in self._sensors:
+    @callback
+    def _notify_listeners(self, notify_unkeyed: bool = True) -> None:
+        """
+        Nur die Entitäten benachrichtigen, deren Wert sich geändert hat.
+        notify_unkeyed=False: Callbacks ohne Entity-Key (Benachrichtigung je Zyklus) auslassen.
+        """
+        changed = self._changed_keys
+        self._changed_keys = set()
+        read = self._read_keys
+        self._read_keys = set()
+        aggregators = self._aggregators
+        fired = 0
+        for entity_key in changed:
+            if entity_key in aggregators:
+                continue
+            for update_callback in self._listeners.get(entity_key, ()):
                 update_callback()
-
+                fired += 1
+        # Aufbereitete Entitäten nur mit tatsächlich gelesenen (oder in Quarantäne auf None
+        # gesetzten) Werten: jede Lesung ist ein Messwert im Fenster, wegen MIN_INTERVAL
+        # zurückgehaltene Änderungen werden bei der nächsten Lesung nachgeholt
+        if aggregators:
+            now = time.monotonic()
+            data = self.data
+            for entity_key in (read | changed) & aggregators.keys():
+                if entity_key in data and aggregators[entity_key].update(data[entity_key], now):
+                    for update_callback in self._listeners.get(entity_key, ()):
+                        update_callback()
+                        fired += 1
+        if notify_unkeyed:
+            for update_callback in self._listeners.get(None, ()):
+                update_callback()
+                fired += 1
+        self.metrics.count("callbacks", fired)
+
+    def entity_value(self, entity_key: str) -> Any:
+        """Wert, den die Entität in HA anzeigt (bei DEADBAND/MIN_INTERVAL/WINDOW aufbereitet)."""
+        aggregator = self._aggregators.get(entity_key)
+        if aggregator is not None and aggregator.value is not None:
+            return aggregator.value
+        return self.data.get(entity_key)
+
+    def _due_blocks(self, tick: int) -> list[int]:
+        """Indizes der Blöcke aus self._plan, die in diesem Zyklus gelesen werden müssen."""
+        due = []
+        for idx, block in enumerate(self._plan):
+            next_due = self._next_due[idx]
+            if next_due is None:
+                if self._on_demand_requested:
+                    due.append(idx)
+            elif next_due <= tick:
+                due.append(idx)
+        return due
+
+    def _schedule_blocks(self, block_ids: Iterable[int], tick: int) -> None:
+        """Nach erfolgreichem Lesen den nächsten fälligen Zyklus je Block festlegen."""
+        for idx in block_ids:
+            ticks = POLL_CLASS_TICKS[self._plan[idx].poll]
+            self._next_due[idx] = tick + ticks if ticks else None
+        self._on_demand_requested = False
+
+    async def async_refresh_on_demand(self) -> None:
+        """Blöcke der Klasse C_POLL_ON_DEMAND sofort mitlesen (Dienst ha_heliotherm.refresh_on_demand)."""
+        self._on_demand_requested = True
+        await self._coordinator.async_request_refresh()
 
     @property
     def name(self):
         """Return the name of this hub."""
         return self._name
 
+    @property
+    def connection_stats(self) -> Dict[str, Any]:
+        """Connect-/Reconnect-Zähler der Modbus-Verbindung."""
+        return {
+            **self._conn.stats,
+            "pipelining": self._pipelining,
+            "pipelined_cycles": self.pipelined_cycles,
+            "pipeline_failures": self._pipeline_failures,
+        }
+
+    @property
+    def connect_time(self) -> Histogram:
+        """Dauer der Verbindungsaufbauten (gemeinsame Verbindung)."""
+        return self._conn.connect_time
+
+    @property
+    def metrics_stats(self) -> Dict[str, Any]:
+        """Zähler und Histogramme (Zykluszeit, Block-RTT, Dekodierung, Fehler) inkl. Verbindungsaufbau."""
+        return {
+            **self.metrics.as_dict(),
+            "connect_time_ms": self.connect_time.as_dict(),
+        }
+
+    @property
+    def aggregation_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Gemeldete und zurückgehaltene Werte je aufbereiteter Entität."""
+        return {
+            entity_key: aggregator.stats for entity_key, aggregator in self._aggregators.items()
+        }
+
+    @property
+    def quarantine_stats(self) -> list[Dict[str, Any]]:
+        """Geteilte Blöcke: Teilblöcke, Entitäten in Quarantäne und Sekunden bis zum erneuten Versuch."""
+        now = time.monotonic()
+        return [
+            {
+                "reg_type": block.reg_type,
+                "address": block.address,
+                "count": block.count,
+                "parts": [[part.address, part.count] for part, _ in split.parts],
+                "quarantined": list(split.quarantined),
+                "strikes": split.strikes,
+                "retry_in_s": max(0, round(split.retry_at - now)),
+            }
+            for block, split in self._splits.items()
+        ]
+
+    @property
+    def history_stats(self) -> Dict[int, Dict[str, Any]]:
+        """Belegung des Rohwert-Verlaufs je Registerart."""
+        return {reg_type: history.stats for reg_type, history in self._history.items()}
+
+    def register_history(
+        self, reg_type: int, address: int, seconds: float = 600
+    ) -> list[Tuple[float, int]]:
+        """
+        Verlauf eines Registers (Rohwert) der letzten `seconds` Sekunden aus dem Ringpuffer,
+        z.B. register_history(C_REG_TYPE_INPUT_REGISTERS, 41): [(time.time()-Zeitstempel, Wort), ...].
+        Enthält jede beim Lesen erkannte Änderung, auch aus Boost- und Rücklese-Zyklen.
+        """
+        history = self._history.get(reg_type)
+        if history is None:
+            return []
+        return history.series(address, time.time() - seconds)
+
+    @property
+    def cycle_stats(self) -> Dict[str, Any]:
+        """Zykluszeiten und aktuelles Abfrageintervall des Coordinators."""
+        return self._coordinator.stats
+
+    @property
+    def write_stats(self) -> Dict[str, int]:
+        """Anzahl vorgemerkter und wegen unveränderter Registerwerte ausgelassener Schreibzugriffe."""
+        return {
+            "writes": self._write_count,
+            "skipped_writes": self._write_skip_count,
+        }
+
+    def _acquire_connection(self) -> None:
+        """Gemeinsame Verbindung zu host:port belegen (falls noch nicht geschehen)."""
+        if self._conn_acquired:
+            return
+        self._conn_acquired = True
+        self._conn = acquire_connection(self._host, self._port, timeout=3, retries=3)
+        self._client = self._conn.client
+        self._lock = self._conn.lock
+
     def close(self):
-        """Disconnect client."""
-        with self._lock:
-            self._client.close()
+        """Disconnect client (bzw. gemeinsame Verbindung freigeben)."""
+        if self._conn_acquired:
+            self._conn_acquired = False
+            release_connection(self._conn)
 
-    def connect(self):
+    async def connect(self):
         """Connect client."""
-        with self._lock:
-            self._client.connect()
+        async with self._lock:
+            await self._conn.async_ensure_connected()
+
+    def _on_modbus_error(self, exc: ModbusException) -> None:
+        """Bei IO-/Verbindungsfehlern gilt die Gegenstelle als tot -> Reconnect beim nächsten Zugriff."""
+        self.metrics.record_error(type(exc).__name__)
+        # pymodbus meldet ausbleibende Antworten (nach allen Retries) als ModbusIOException
+        if isinstance(exc, ModbusIOException):
+            self.metrics.count("timeouts")
+        if isinstance(exc, (ModbusIOException, ConnectionException)):
+            self._conn.mark_dead()
 
     # ---- Helper ----------------------------------------------------------
 
@@ -234,15 +884,6 @@ class MyModbusHub:
         else:
             return 1 if bool(v) else 0
 
-    def _decode_switch(self, props: Dict[str, Any], raw: int) -> str:
-        """
-        SWITCH-Mapping -> 'off'/'on'.
-        Erlaubt {"off": 0}  oder {"off": 0, "on": 1}.
-        """
-        m: Dict[str, int] = get_entity_switch(props) or {}
-        off_v = m.get("off", 0)
-        return "off" if raw == off_v else "on"
-
     # ---- Numerische Werte ----------------------------------------------------------
     def _encode_numeric(
         self, value: float, faktor: float, min_v: float | None, max_v: float | None
@@ -260,26 +901,6 @@ class MyModbusHub:
 
         return round(value / faktor)
 
-    def _decode_numeric(self, props: Dict[str, Any], raw: int) -> float:
-        """Rohwert -> physikalischer Wert mittels FAKTOR (raw * faktor)."""
-        # Sentinel für 'ungültig': -500
-        if raw == -500:
-            return None
-        faktor = get_entity_factor(props) or 1.0
-        value = raw * faktor
-        return float(value)
-
-    def _decode_climate(self, props: Dict[str, Any], raw: int) -> dict:
-        value = self._decode_numeric(props, raw)
-        min_value = get_entity_min(props)
-        max_value = get_entity_max(props)
-
-        return {
-            "temperature": value,
-            "target_temp_low": min_value,
-            "target_temp_high": max_value,
-        }
-
     # ---- Select Werte ----------------------------------------------------------
     def _encode_select(self, props: Dict[str, Any], value: Any) -> int:
         """Ermittle den zu schreibenden Integer aus VALUES-Mapping (Label oder Index erlaubt)."""
@@ -307,17 +928,11 @@ class MyModbusHub:
             )
         return iv
 
-    def _decode_select(self, props: Dict[str, Any], raw: int) -> str | None:
-        """
-        Invertiere VALUES (Index->Text) zu Text
-        Unbekannte Indizes -> None.
-        """
-        values: Dict[Any, Any] = get_entity_select(props) or {}
-        return values.get(raw, f"Ungültiger Wert: {raw}")
-
     # ***************************************** SCHREIBEN **************************************************************
 
-    async def write_entity_value(self, entity_key: str, value: Any) -> None:
+    async def write_entity_value(
+        self, entity_key: str, value: Any, force: bool = False
+    ) -> None:
         """
         Generisches Schreiben für alle beschreibbaren Entitäten.
         - SWITCH: akzeptiert bool / 'on'/'off'/0/1
@@ -325,10 +940,14 @@ class MyModbusHub:
         - NUMBER/CLIMATE: beachtet FAKTOR, MIN/MAX
         - UINT32: wird Big-Endian in zwei Registern geschrieben (REG, REG+1)
         - HA (Hand-Aktiv): falls vorhanden und activate_hand=True -> 1 schreiben
+        - Geschrieben wird gesammelt nach C_WRITE_DEBOUNCE Sekunden (async_flush_writes); der
+          Aufruf endet erst danach und löst HomeAssistantError aus, wenn der Schreibzugriff
+          fehlschlägt (auch bei einer Fehlerantwort des Geräts)
+        - Entspricht der Rohwert dem zuletzt gelesenen Registerinhalt, entfällt der Schreibzugriff
+          (außer force=True)
         """
 
-        _LOGGER.info(f"Schreibe Entität {entity_key} -> {value}")
-        print(f"write_entity_value: {entity_key} -> {value}")
+        _LOGGER.info("Schreibe Entität %s -> %s", entity_key, value)
 
         # Props finden
         props = get_entity_props(entity_key)
@@ -366,223 +985,589 @@ class MyModbusHub:
                 get_entity_max(props),
             )
 
-        if dt == ModbusTcpClient.DATATYPE.BITS:
+        if dt == AsyncModbusTcpClient.DATATYPE.BITS:
             reg_words = (bool(raw),)
         else:
             reg_words = self._client.convert_to_registers(value=raw, data_type=dt)
 
-        # 2) Schreiben (run blocking modbus in executor)
-        await self._write_modbus_registers(reg, reg_words, dt)
-
-        # 3) Hand-Aktiv setzen
+        # 2) Hand-Aktiv prüfen (vor dem Einplanen, damit kein Schreibzugriff halb eingeplant bleibt)
         entity_ha = get_entity_ha(props)
         if entity_ha:
             props_ha = get_entity_props(entity_ha)
             reg_ha, dt_ha = get_entity_reg(props_ha)
-            value_ha = 1
-            _LOGGER.info(f"Schreibe Hand-Aktiv in {entity_ha} -> {value_ha}")
-            if reg_ha and (dt_ha == ModbusTcpClient.DATATYPE.UINT16):
-                await self._client.write_register(address=reg_ha, value=value_ha, device_id=self._hostid)
-            else:
+            if not reg_ha or dt_ha != AsyncModbusTcpClient.DATATYPE.UINT16:
                 raise ValueError(f"Fehlende/fehlerhafte Registerdefinition für {entity_ha}.")
-        # 4) Daten neu lesen
-        _LOGGER.info("Schreibvorgang abgeschlossen. Löse Refresh-Zyklus aus.")
-        await self.async_refresh_modbus_data()
 
-    async def setter_function_callback(self, entity: Entity, option):
-        await self.write_entity_value(entity.entity_description.key, option)
+        # 3) Schreiben einplanen (gesammelt, siehe async_flush_writes), Hand-Aktiv setzen
+        waiters = [self._queue_write(entity_key, reg, reg_words, dt, force)]
+        if entity_ha:
+            value_ha = 1
+            _LOGGER.debug("Schreibe Hand-Aktiv in %s -> %s", entity_ha, value_ha)
+            waiters.append(self._queue_write(entity_ha, reg_ha, (value_ha,), dt_ha, force))
 
-    # ***************************************** LESEN **************************************************************
+        # 4) Auf das Ergebnis warten (alle Wartenden abholen, erste Fehlermeldung weitergeben)
+        results = await asyncio.gather(
+            *(waiter for waiter in waiters if waiter is not None), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
 
-    def read_entity_value(
-        self, buf: list[int | bool], idx: int, dt: ModbusTcpClient.DATATYPE
-    ):
-        if buf:
-            if dt == ModbusTcpClient.DATATYPE.BITS:
-                dtlen = 1
-            else:
-                dtlen = dt.value[1]
-            buflen = len(buf)
-            out_of_bounds = (idx < 0) or (idx + dtlen > buflen)
-            if out_of_bounds:
-                raise ValueError(
-                    "Puffer hat nur {buflen} Elemente und ist damit zu klein zum Lesen von {dtlen} Elementen ab Index {idx}!!"
-                )
-            else:
-                if dt == ModbusTcpClient.DATATYPE.BITS:
-                    return buf[idx]
-                else:
-                    return self._client.convert_from_registers(
-                        registers=buf[idx : idx + dtlen], data_type=dt
-                    )
-        else:
-            raise ValueError(
-                "Puffer hat keine Elemente. Fehler in Definition const.ENTITIES_DICT!!"
+    def _queue_write(
+        self,
+        entity_key: str,
+        reg: int,
+        reg_words: Iterable[int],
+        dt: AsyncModbusTcpClient.DATATYPE,
+        force: bool = False,
+    ) -> asyncio.Future | None:
+        """
+        Schreibzugriff vormerken. Mehrfache Schreibzugriffe auf dieselbe Entität innerhalb des
+        Sammelfensters werden zusammengefasst, nur der letzte Wert wird geschrieben.
+        Liefert ein Future, das mit dem Schreibzugriff endet (None: Schreibzugriff entfällt).
+        """
+        reg_words = tuple(reg_words)
+        if not force and self._matches_raw_registers(entity_key, reg, reg_words, dt):
+            # Register enthält den Wert bereits; ein noch wartender, anderer Wert ist damit hinfällig
+            self._pending_writes.pop(entity_key, None)
+            self._resolve_writes(
+                {entity_key: self._write_waiters.pop(entity_key, [])}, {}
             )
+            self._write_skip_count += 1
+            _LOGGER.debug("Schreibzugriff auf %s entfällt, Wert unverändert.", entity_key)
+            return None
 
-    def read_modbus_registers(self):
-        """Read from modbus registers"""
-
-        if C_MAX_INPUT_REGISTER >= C_MIN_INPUT_REGISTER:
-            _LOGGER.debug(
-                f"Lese Input-Register {C_MIN_INPUT_REGISTER} bis {C_MAX_INPUT_REGISTER}..."
+        self._write_count += 1
+        self._pending_writes[entity_key] = (reg, reg_words, dt)
+        waiter = self._hass.loop.create_future()
+        self._write_waiters.setdefault(entity_key, []).append(waiter)
+        if self._flush_task is None:
+            self._flush_task = self._hass.async_create_task(
+                self._async_flush_writes_delayed()
             )
-            with self._lock:
-                modbusdata_input = self._client.read_input_registers(
-                    address=C_MIN_INPUT_REGISTER,
-                    count=C_MAX_INPUT_REGISTER - C_MIN_INPUT_REGISTER + 1,
-                    device_id=self._hostid,
-                )
-                if modbusdata_input is None or not hasattr(
-                    modbusdata_input, "registers"
-                ):
-                    _LOGGER.error("Fehler beim Lesen der Input-Register.")
+        return waiter
+
+    @staticmethod
+    def _resolve_writes(
+        waiters: Dict[str, list[asyncio.Future]], failed: Dict[str, Exception]
+    ) -> None:
+        """Wartenden Aufrufern das Ergebnis ihres Schreibzugriffs melden."""
+        for entity_key, futures in waiters.items():
+            exc = failed.get(entity_key)
+            for future in futures:
+                if future.done():
+                    continue
+                if exc is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(
+                        HomeAssistantError(f"Schreibzugriff auf {entity_key} fehlgeschlagen: {exc}")
+                    )
+
+    def _matches_raw_registers(
+        self,
+        entity_key: str,
+        reg: int,
+        reg_words: Tuple[int, ...],
+        dt: AsyncModbusTcpClient.DATATYPE,
+    ) -> bool:
+        """
+        True, wenn die zuletzt gelesenen Rohwerte genau den zu schreibenden entsprechen.
+        Nur Rohwerte aus dem letzten planmäßigen Lesezugriff zählen (_sample_max_age); ältere
+        können einen inzwischen am Gerät geänderten Wert enthalten, dann wird geschrieben.
+        """
+        history = self._history.get(get_entity_type(get_entity_props(entity_key)))
+        if history is None:
+            return False
+        oldest = time.time() - self._sample_max_age(entity_key)
+        for offset, word in enumerate(reg_words):
+            current = history.get(reg + offset)
+            if current is None or history.read_at(reg + offset) < oldest:
+                return False
+            if dt == AsyncModbusTcpClient.DATATYPE.BITS:
+                if bool(current) != bool(word):
                     return False
-                _LOGGER.debug(
-                    f"{len(modbusdata_input.registers)} Input-Register: {modbusdata_input.registers}"
-                )
-                input_regs = modbusdata_input.registers
+            elif (int(current) & 0xFFFF) != (int(word) & 0xFFFF):
+                return False
+        return True
+
+    def _sample_max_age(self, entity_key: str) -> float:
+        """
+        Höchstalter eines gelesenen Rohwerts der Entität in Sekunden: Abstand der Lesezugriffe
+        ihres Blocks (Zyklen der Abfrageklasse mal aktuelles, ggf. gestrecktes Intervall).
+        Blöcke der Klasse C_POLL_ON_DEMAND zählen wie ein Zyklus.
+        """
+        ticks = 1
+        for block in self._plan:
+            if entity_key in block.keys:
+                ticks = POLL_CLASS_TICKS[block.poll] or 1
+                break
+        return ticks * self._coordinator.interval
+
+    async def _async_flush_writes_delayed(self) -> None:
+        await asyncio.sleep(C_WRITE_DEBOUNCE)
+        await self.async_flush_writes()
+
+    async def async_flush_writes(self) -> None:
+        """
+        Alle vorgemerkten Schreibzugriffe ausführen.
+        Benachbarte Holding-Register werden mit einem Request (FC 16) geschrieben,
+        anschließend werden nur die betroffenen Blöcke einmal gelesen. Fehler erhalten die
+        wartenden Aufrufer von write_entity_value.
+        """
+        task, self._flush_task = self._flush_task, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+        pending, self._pending_writes = self._pending_writes, {}
+        waiters, self._write_waiters = self._write_waiters, {}
+        if not pending:
+            self._resolve_writes(waiters, {})
+            return
+
+        runs = plan_writes(
+            (reg, words, dt == AsyncModbusTcpClient.DATATYPE.BITS)
+            for reg, words, dt in pending.values()
+        )
+        _LOGGER.debug(
+            "Schreibe %s Entitäten mit %s Requests: %s", len(pending), len(runs), list(pending)
+        )
+        failed: Dict[str, Exception] = {}
+        for base_reg, words, is_bits in runs:
+            dt = AsyncModbusTcpClient.DATATYPE.BITS if is_bits else AsyncModbusTcpClient.DATATYPE.UINT16
+            try:
+                await self._write_modbus_registers(base_reg, words, dt)
+            except ModbusException as exc:
+                self.metrics.count("write_errors")
+                _LOGGER.error("Schreibzugriff auf Register %s fehlgeschlagen: %s", base_reg, exc)
+                # betroffen sind alle Entitäten, deren Register im fehlgeschlagenen Request liegen
+                for entity_key, (reg, _, entity_dt) in pending.items():
+                    if (
+                        (entity_dt == AsyncModbusTcpClient.DATATYPE.BITS) == is_bits
+                        and base_reg <= reg < base_reg + len(words)
+                    ):
+                        failed[entity_key] = exc
+
+        # 4) Geschriebene Werte zurücklesen
+        _LOGGER.debug("Schreibvorgang abgeschlossen. Lese geschriebene Register.")
+        await self._async_verify_writes(pending)
+        self._resolve_writes(waiters, failed)
+
+    async def _async_verify_writes(self, entity_keys: Iterable[str]) -> None:
+        """
+        Nur die geschriebenen Register (inkl. Hand-Aktiv) zurücklesen, statt ganzer Blöcke.
+        Aktualisiert nur diese Keys in self.data und benachrichtigt nur deren Entitäten.
+        """
+        plan, decoders = self._verify_plan(entity_keys)
+        async with self._lock:
+            if not await self._conn.async_ensure_connected():
+                return
+            try:
+                update_result = await self._read_blocks(plan, decoders, prime=False)
+            except ModbusException as exc:
+                _LOGGER.warning("Modbus read failed: %s", exc)
+                self._on_modbus_error(exc)
+                update_result = False
+        if update_result:
+            self._notify_listeners(notify_unkeyed=False)
+
+    def _verify_plan(
+        self, entity_keys: Iterable[str]
+    ) -> Tuple[list[ReadBlock], list[BlockDecoder]]:
+        """Leseplan und Dekodierer nur für die übergebenen Entitäten (zwischengespeichert)."""
+        keys = frozenset(entity_keys)
+        cached = self._verify_plans.get(keys)
+        if cached is None:
+            entities = {entity_key: ENTITIES_DICT[entity_key] for entity_key in keys}
+            plan = plan_reads(entities)
+            cached = (plan, compile_decoders(entities, plan))
+            self._verify_plans[keys] = cached
+            if len(self._verify_plans) > C_VERIFY_PLAN_CACHE_SIZE:
+                self._verify_plans.popitem(last=False)
         else:
-            _LOGGER.debug("Keine Input-Register definiert.")
-            input_regs = None
+            self._verify_plans.move_to_end(keys)
+        return cached
+
+    async def setter_function_callback(self, entity: Entity, option):
+        try:
+            await self.write_entity_value(entity.entity_description.key, option)
+        except Exception:
+            # vorab angezeigten Wert verwerfen, die Entität zeigt wieder den gelesenen Wert
+            entity._on_hub_update()
+            raise
 
-        if C_MAX_HOLDING_REGISTER >= C_MIN_HOLDING_REGISTER:
-            _LOGGER.debug(
-                f"Lese Holding-Register {C_MIN_HOLDING_REGISTER} bis {C_MAX_HOLDING_REGISTER}..."
+    # ***************************************** LESEN **************************************************************
+
+    def _read_function(self, reg_type: int):
+        """Lesefunktion des Clients je Registerart (None bei unbekannter Registerart)."""
+        match reg_type:
+            case const.C_REG_TYPE_INPUT_REGISTERS:
+                return self._client.read_input_registers
+            case const.C_REG_TYPE_HOLDING_REGISTERS:
+                return self._client.read_holding_registers
+            case const.C_REG_TYPE_COILS:
+                return self._client.read_coils
+            case const.C_REG_TYPE_DISCRETE_INPUTS:
+                return self._client.read_discrete_inputs
+        return None
+
+    async def _read_block(self, block: ReadBlock) -> list[int | bool] | None:
+        """Einen Block aus dem Leseplan lesen; None bei Fehlerantwort."""
+        return (await self._read_block_result(block))[0]
+
+    async def _read_block_result(
+        self, block: ReadBlock
+    ) -> Tuple[list[int | bool] | None, int | None]:
+        """Wie _read_block, zusätzlich der Exception-Code einer Fehlerantwort (sonst None)."""
+        read_func = self._read_function(block.reg_type)
+        if read_func is None:
+            return None, None
+
+        is_bits = block.reg_type in BIT_TYPES
+        start = time.perf_counter()
+        try:
+            result = await read_func(
+                address=block.address, count=block.count, device_id=self._hostid
             )
-            with self._lock:
-                modbusdata_holding = self._client.read_holding_registers(
-                    address=C_MIN_HOLDING_REGISTER,
-                    count=C_MAX_HOLDING_REGISTER - C_MIN_HOLDING_REGISTER + 1,
-                    device_id=self._hostid,
+        except ModbusException:
+            self.metrics.record_read(is_bits, block.count, None)
+            raise
+        rtt = time.perf_counter() - start
+        self.metrics.count("retries", getattr(result, "retries", 0))
+        values = getattr(result, "bits" if is_bits else "registers", None)
+        if values is None or len(values) < block.count:
+            self.metrics.record_read(is_bits, block.count, None)
+            if result.isError():
+                code = getattr(result, "exception_code", None)
+                self.metrics.record_error(f"modbus_exception_{code}")
+                return None, code
+            return None, None
+        self.metrics.record_read(is_bits, block.count, rtt)
+        # Bits werden von pymodbus auf volle Bytes aufgefüllt
+        return values[: block.count], None
+
+    async def read_modbus_registers(self, block_ids: Iterable[int] | None = None):
+        """Read from modbus registers.
+
+        Liest die Blöcke mit den übergebenen Indizes aus dem Leseplan des Geräts (const.READ_PLAN
+        bzw. laut Geräteprofil gekürzt; Standard: alle) und dekodiert sie über die vorkompilierte
+        Dekodiertabelle. Muss mit gehaltenem self._lock und verbundenem Client aufgerufen werden.
+        """
+        if block_ids is None:
+            return await self._read_blocks(self._plan, self._decoders)
+        block_ids = list(block_ids)
+        return await self._read_blocks(
+            [self._plan[idx] for idx in block_ids],
+            [self._decoders[idx] for idx in block_ids],
+        )
+
+    async def _read_blocks(
+        self,
+        blocks: Sequence[ReadBlock],
+        decoders: Sequence[BlockDecoder],
+        prime: bool = True,
+    ) -> bool:
+        """
+        Blöcke lesen, dekodieren und geänderte Keys in self._changed_keys vormerken.
+        Lehnt das Gerät die Adressen eines Blocks ab, wird er geteilt (_split_block), statt den
+        Zyklus abzubrechen. prime=False für einmalige Dekodierer (siehe _apply_block).
+        """
+        if self._splits:
+            blocks, decoders = self._expand_splits(blocks, decoders)
+        if self._pipelining and len(blocks) > 1 and time.monotonic() >= self._pipeline_retry_at:
+            start = time.perf_counter()
+            try:
+                bufs = await self._conn.pipeline.async_read(
+                    [(block.reg_type, block.address, block.count) for block in blocks],
+                    self._hostid,
                 )
-                if modbusdata_holding is None or not hasattr(
-                    modbusdata_holding, "registers"
-                ):
-                    _LOGGER.error("Fehler beim Lesen der Holding-Register.")
+            except PipelineError as exc:
+                self.metrics.record_error(type(exc).__name__)
+                # Zyklus wird seriell wiederholt
+                self.metrics.count("retries")
+                if isinstance(exc, PipelineRejectedError):
+                    _LOGGER.warning(
+                        "Pipelining wird vom Gerät nicht unterstützt, lese seriell: %s", exc
+                    )
+                    self._pipelining = False
+                else:
+                    delay = min(
+                        C_PIPELINE_RETRY * 2**self._pipeline_failures, C_PIPELINE_RETRY_MAX
+                    )
+                    self._pipeline_failures += 1
+                    self._pipeline_retry_at = time.monotonic() + delay
+                    _LOGGER.warning(
+                        "Pipelining fehlgeschlagen, lese %s s seriell: %s", round(delay), exc
+                    )
+                # die Pipeline hat dabei die Verbindung geschlossen
+                if not await self._conn.async_ensure_connected():
                     return False
+            else:
+                # alle Antworten eines Pipelining-Zyklus treffen innerhalb einer RTT ein
+                rtt = time.perf_counter() - start
+                self.pipelined_cycles += 1
+                self._pipeline_failures = 0
+                for block in blocks:
+                    self.metrics.record_read(block.reg_type in BIT_TYPES, block.count, rtt)
+                for block, decoder, buf in zip(blocks, decoders, bufs):
+                    if buf is not None:
+                        self._apply_block(block, decoder, buf, prime)
+                    elif not await self._split_block(block):
+                        return False
+                return True
+
+        # Einmal je Zyklus prüfen: bei deaktiviertem DEBUG keine Log-Aufrufe je Block
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        for block, decoder in zip(blocks, decoders):
+            if debug:
                 _LOGGER.debug(
-                    f"{len(modbusdata_holding.registers)} Holding-Register: {modbusdata_holding.registers}"
+                    "Lese Block Typ %s: %s bis %s", block.reg_type, block.address, block.end
                 )
-                holding_regs = modbusdata_holding.registers
-        else:
-            _LOGGER.debug("Keine Holding-Register definiert.")
-            holding_regs = None
-
-        if C_MAX_COILS >= C_MIN_COILS:
-            _LOGGER.debug(f"Lese Coils {C_MIN_COILS} bis {C_MAX_COILS}...")
-            with self._lock:
-                modbusdata_coils = self._client.read_coils(
-                    address=C_MIN_COILS,
-                    count=C_MAX_COILS - C_MIN_COILS + 1,
-                    device_id=self._hostid,
+            buf, code = await self._read_block_result(block)
+            if buf is None and code in C_SPLIT_EXCEPTION_CODES and await self._split_block(block):
+                continue
+            if buf is None:
+                _LOGGER.error(
+                    "Fehler beim Lesen von Block Typ %s: %s bis %s.",
+                    block.reg_type,
+                    block.address,
+                    block.end,
                 )
-                if modbusdata_coils is None or not hasattr(modbusdata_coils, "bits"):
-                    _LOGGER.error("Fehler beim Lesen der Coils.")
-                    return False
-                _LOGGER.debug(
-                    f"{len(modbusdata_coils.bits)} Coils: {modbusdata_coils.bits}"
-                )
-                coils = modbusdata_coils.bits
-        else:
-            _LOGGER.debug("Keine Coils definiert.")
-            coils = None
+                return False
+            self._apply_block(block, decoder, buf, prime)
 
-        if C_MAX_DISCRETE_INPUTS >= C_MIN_DISCRETE_INPUTS:
-            _LOGGER.debug(
-                f"Lese Discrete Inputs {C_MIN_DISCRETE_INPUTS} bis {C_MAX_DISCRETE_INPUTS} ..."
-            )
-            with self._lock:
-                modbusdata_discrete = self._client.read_discrete_inputs(
-                    address=C_MIN_DISCRETE_INPUTS,
-                    count=C_MAX_DISCRETE_INPUTS - C_MIN_DISCRETE_INPUTS + 1,
-                    device_id=self._hostid,
-                )
-                if modbusdata_discrete is None or not hasattr(
-                    modbusdata_discrete, "bits"
-                ):
-                    _LOGGER.error("Fehler beim Lesen der Discrete Inputs.")
-                    return False
-                _LOGGER.debug(
-                    f"{len(modbusdata_discrete.bits)} Discrete Inputs: {modbusdata_discrete.bits}"
-                )
-                discrete = modbusdata_discrete.bits
-        else:
-            _LOGGER.debug("Keine Discrete Inputs definiert.")
-            discrete = None
-
-        for entity_key, props in ENTITIES_DICT.items():
-            reg_type = get_entity_type(props)
-            reg, dt = get_entity_reg(props)
-            if reg is None:
-                continue  # defensiv
-            _LOGGER.debug(f"Lese Entität '{entity_key}'.")
-            match reg_type:
-                case const.C_REG_TYPE_COILS:
-                    raw = self.read_entity_value(coils, reg - C_MIN_COILS, dt)
-                case const.C_REG_TYPE_DISCRETE_INPUTS:
-                    raw = self.read_entity_value(
-                        discrete, reg - C_MIN_DISCRETE_INPUTS, dt
-                    )
-                case const.C_REG_TYPE_INPUT_REGISTERS:
-                    raw = self.read_entity_value(
-                        input_regs, reg - C_MIN_INPUT_REGISTER, dt
-                    )
-                case const.C_REG_TYPE_HOLDING_REGISTERS:
-                    raw = self.read_entity_value(
-                        holding_regs, reg - C_MIN_HOLDING_REGISTER, dt
-                    )
+        return True
 
-            if is_entity_switch(props):
-                value = self._decode_switch(props, raw)
-            elif is_entity_select(props):
-                value = self._decode_select(props, raw)
-            elif is_entity_climate(props):
-                if is_entity_readonly(props):
-                    value = self._decode_numeric(props, raw)
-                else:
-                    value = self._decode_climate(props, raw)
+    def _expand_splits(
+        self, blocks: Sequence[ReadBlock], decoders: Sequence[BlockDecoder]
+    ) -> Tuple[list[ReadBlock], list[BlockDecoder]]:
+        """Geteilte Blöcke durch ihre lesbaren Teile ersetzen, außer ihr erneuter Versuch ist fällig."""
+        now = time.monotonic()
+        out_blocks: list[ReadBlock] = []
+        out_decoders: list[BlockDecoder] = []
+        for block, decoder in zip(blocks, decoders):
+            split = self._splits.get(block)
+            if split is None or split.retry_at <= now:
+                out_blocks.append(block)
+                out_decoders.append(decoder)
             else:
-                value = self._decode_numeric(props, raw)
+                for part, part_decoder in split.parts:
+                    out_blocks.append(part)
+                    out_decoders.append(part_decoder)
+        return out_blocks, out_decoders
+
+    def _sub_part(
+        self, block: ReadBlock, keys: Sequence[str]
+    ) -> Tuple[ReadBlock, BlockDecoder]:
+        """Teilblock für die übergebenen Entitäten eines Blocks samt Dekodierer."""
+        part = sub_block(block, keys, ENTITIES_DICT)
+        entities = {entity_key: ENTITIES_DICT[entity_key] for entity_key in keys}
+        return part, compile_decoders(entities, [part])[0]
+
+    async def _split_block(self, block: ReadBlock) -> bool:
+        """
+        Vom Gerät abgelehnten Block halbieren (nach Entitäten), bis die abgelehnten Adressen
+        feststehen. Lesbare Teile werden sofort übernommen; bis zum erneuten Versuch werden statt
+        des Blocks die größten lesbaren Abschnitte zwischen den abgelehnten Adressen gelesen.
+        Entitäten, deren Register das Gerät auch einzeln ablehnt, bleiben so lange in Quarantäne
+        (Wert None). Die Wartezeit verdoppelt sich mit jeder erneuten Ablehnung.
+        False bei einer anderen Fehlerantwort während des Teilens (Zyklus gilt als fehlgeschlagen).
+        """
+        # nach Adresse, damit jede Hälfte ein zusammenhängender Adressbereich ist
+        keys = tuple(
+            sorted(block.keys, key=lambda entity_key: get_entity_reg(ENTITIES_DICT[entity_key])[0])
+        )
+        # Lesbare Teile als (erster Index, letzter Index + 1) in keys samt Block und Dekodierer
+        pieces: list[Tuple[int, int, ReadBlock, BlockDecoder]] = []
+        quarantined: set[int] = set()
+        # Grenzen (Index in keys), an denen eine abgelehnte Lücke zwischen zwei Entitäten liegt
+        barriers: set[int] = set()
+
+        async def bisect(lo: int, hi: int) -> bool:
+            if hi - lo == 1:
+                quarantined.add(lo)
+                return True
+            middle = (lo + hi) // 2
+            readable = 0
+            for first, last in ((lo, middle), (middle, hi)):
+                part, part_decoder = self._sub_part(block, keys[first:last])
+                buf, code = await self._read_block_result(part)
+                if buf is not None:
+                    self._apply_block(part, part_decoder, buf, prime=False)
+                    pieces.append((first, last, part, part_decoder))
+                    readable += 1
+                elif code not in C_SPLIT_EXCEPTION_CODES or not await bisect(first, last):
+                    return False
+            if readable == 2:
+                # beide Hälften lesbar, der ganze Abschnitt nicht: abgelehnte Adresse dazwischen
+                barriers.add(middle)
+            return True
+
+        self.metrics.count("block_splits")
+        if not await bisect(0, len(keys)):
+            return False
+
+        # Lesbare Teile zwischen Quarantäne und Lücken zu Abschnitten zusammenfassen; jeder
+        # Abschnitt wird einmal zur Probe gelesen, sonst bleibt es bei den einzelnen Teilen
+        parts: list[Tuple[ReadBlock, BlockDecoder]] = []
+        pieces.sort(key=lambda piece: piece[0])
+        run: list[Tuple[int, int, ReadBlock, BlockDecoder]] = []
+        for piece in pieces + [None]:
+            if run and (piece is None or piece[0] != run[-1][1] or piece[0] in barriers):
+                merged = None
+                if len(run) > 1:
+                    merged = self._sub_part(block, keys[run[0][0] : run[-1][1]])
+                    buf, _ = await self._read_block_result(merged[0])
+                    if buf is None:
+                        merged = None
+                    else:
+                        self._apply_block(*merged, buf, prime=False)
+                parts.extend([merged] if merged else [(part, dec) for _, _, part, dec in run])
+                run = []
+            if piece is not None:
+                run.append(piece)
+        quarantined_keys = tuple(keys[idx] for idx in sorted(quarantined))
+
+        previous = self._splits.get(block)
+        if previous is not None:
+            self._forget_split(previous)
+        strikes = previous.strikes + 1 if previous is not None else 0
+        delay = min(C_QUARANTINE_RETRY * 2**strikes, C_QUARANTINE_RETRY_MAX)
+        self._splits[block] = BlockSplit(
+            tuple(parts), quarantined_keys, time.monotonic() + delay, strikes
+        )
+        for entity_key in quarantined_keys:
+            if self.data.get(entity_key) is not None:
+                self._changed_keys.add(entity_key)
+            self.data[entity_key] = None
+        _LOGGER.warning(
+            "Block Typ %s: %s bis %s vom Gerät abgelehnt, lese %s Teilblöcke; Quarantäne: %s "
+            "(erneuter Versuch in %s s)",
+            block.reg_type,
+            block.address,
+            block.end,
+            len(parts),
+            list(quarantined_keys) or "keine Entität (Lücke)",
+            round(delay),
+        )
+        return True
 
-            _LOGGER.debug(f"Value: '{value}'")
-            self.data[entity_key] = value
+    def _forget_split(self, split: BlockSplit) -> None:
+        """Dekodierer der Teilblöcke einer aufgehobenen oder ersetzten Teilung verwerfen."""
+        for _, part_decoder in split.parts:
+            self._primed_decoders.discard(part_decoder)
 
-        _LOGGER.info("Lesen der Register erfolgreich abgeschlossen.")
-        return True
+    def _apply_block(
+        self,
+        block: ReadBlock,
+        decoder: BlockDecoder,
+        buf: Sequence[int | bool],
+        prime: bool = True,
+    ) -> None:
+        """
+        Gelesenen Block dekodieren, Rohwerte merken und geänderte Keys vormerken.
+        prime=False (Rücklesen nach dem Schreiben): der Dekodierer wird nicht in
+        self._primed_decoders aufgenommen und läuft daher immer.
+        """
+        split = self._splits.pop(block, None) if self._splits else None
+        if split is not None:
+            # erneuter Versuch mit dem ganzen Block gelungen: Teilung und Quarantäne aufheben;
+            # die Entitäten in Quarantäne stehen auf None, der Block wird daher voll dekodiert,
+            # auch wenn sich die Rohwerte seit dem letzten Lesen nicht geändert haben
+            self._forget_split(split)
+            self._primed_decoders.discard(decoder)
+            _LOGGER.info(
+                "Block Typ %s: %s bis %s wieder vollständig lesbar", block.reg_type, block.address, block.end
+            )
+        if self._aggregators:
+            self._read_keys.update(block.keys)
+        history = self._history.get(block.reg_type)
+        if (
+            history is not None
+            and not history.record(block.address, buf, time.time())
+            and decoder in self._primed_decoders
+            and self._trace is None
+        ):
+            # Rohwerte unverändert -> dekodierte Werte unverändert, Dekodieren entfällt
+            return
+        if prime:
+            self._primed_decoders.add(decoder)
+        data = self.data
+        changed = self._changed_keys
+        start = time.perf_counter()
+        decoded = decoder.decode(buf)
+        self.metrics.decode_time.observe(time.perf_counter() - start)
+        for entity_key, value in decoded:
+            if entity_key not in data or data[entity_key] != value:
+                changed.add(entity_key)
+            data[entity_key] = value
+        if self._trace is not None:
+            self._trace.append(
+                {
+                    "reg_type": block.reg_type,
+                    "address": block.address,
+                    "count": block.count,
+                    "raw": list(buf),
+                    "decoded": dict(decoded),
+                }
+            )
 
     # ***************************************** SCHREIBEN **************************************************************
 
     async def _write_modbus_registers(
-        self, base_reg: int, reg_values: Iterable[int], dt: ModbusTcpClient.DATATYPE
+        self, base_reg: int, reg_values: Iterable[int], dt: AsyncModbusTcpClient.DATATYPE
     ):
         """
-        Schreibt eine Sequenz 16-bit Registerwerte ab base_reg.
+        Schreibt eine Sequenz 16-bit Registerwerte (bzw. Coils) ab base_reg mit einem Request.
+        ModbusException bei Verbindungsfehlern und bei einer Fehlerantwort des Geräts.
 
         Mit int(word) & 0xFFFF: sicherstellen, dass der Wert in den gültigen Bereich passt.
         Beispiel: 70000 & 0xFFFF → 4464
                   -1 & 0xFFFF → 65535
         """
-        _LOGGER.info(f"Schreibzugriff auf Register {base_reg}: {reg_values}")
-
-
-        if not self._client.connect():
-            _LOGGER.warning("Modbus connect failed")
-            return
-
-        try:
-            for offset, word in enumerate(reg_values):
-                if dt == ModbusTcpClient.DATATYPE.BITS:
-                    self._client.write_coil(
-                        address=base_reg + offset,
-                        value=bool(word),
+        reg_values = list(reg_values)
+        _LOGGER.debug("Schreibzugriff auf Register %s: %s", base_reg, reg_values)
+
+        async with self._lock:
+            if not await self._conn.async_ensure_connected():
+                raise ConnectionException(f"{self._host}:{self._port} nicht erreichbar")
+
+            is_bits = dt == AsyncModbusTcpClient.DATATYPE.BITS
+            start = time.perf_counter()
+            try:
+                if is_bits:
+                    if len(reg_values) == 1:
+                        result = await self._client.write_coil(
+                            address=base_reg,
+                            value=bool(reg_values[0]),
+                            device_id=self._hostid,
+                        )
+                    else:
+                        result = await self._client.write_coils(
+                            address=base_reg,
+                            values=[bool(bit) for bit in reg_values],
+                            device_id=self._hostid,
+                        )
+                elif len(reg_values) == 1:
+                    result = await self._client.write_register(
+                        address=base_reg,
+                        value=int(reg_values[0]) & 0xFFFF,
                         device_id=self._hostid,
                     )
                 else:
-                    self._client.write_register(
-                        address=base_reg + offset,
-                        value=int(word) & 0xFFFF,
+                    result = await self._client.write_registers(
+                        address=base_reg,
+                        values=[int(word) & 0xFFFF for word in reg_values],
                         device_id=self._hostid,
                     )
-        finally:
-            self._client.close()
+            except ModbusException as exc:
+                self.metrics.record_write(is_bits, len(reg_values), None)
+                self._on_modbus_error(exc)
+                raise
+            if result.isError():
+                # Fehlerantwort des Geräts (z.B. Wert außerhalb des zulässigen Bereichs)
+                code = getattr(result, "exception_code", None)
+                self.metrics.record_write(is_bits, len(reg_values), None)
+                self.metrics.record_error(f"modbus_exception_{code}")
+                raise ModbusException(f"Fehlerantwort {code} auf Register {base_reg}")
+            self.metrics.record_write(is_bits, len(reg_values), time.perf_counter() - start)
@@ -0,0 +1,123 @@
+"""Aufbereitung zwischen Hub und Entitäten: Totband, Mindestabstand und gleitendes Fenster je Entität."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any, Dict
+
+from .const import (
+    C_AGG_MEAN,
+    C_AGG_MIN,
+    C_AGG_MAX,
+    get_entity_aggregation,
+    get_entity_factor,
+)
+
+
+class EntityAggregator:
+    """
+    Entscheidet, wann ein neuer Wert einer Entität an HA (und damit an den Recorder) geht.
+
+    - WINDOW: Werte der letzten WINDOW Sekunden werden zu Mittelwert, Minimum oder Maximum (AGG)
+      zusammengefasst; veröffentlicht wird die Kennzahl statt des Einzelwerts
+    - DEADBAND: neuer Wert nur, wenn er um mindestens DEADBAND vom zuletzt veröffentlichten abweicht
+    - MIN_INTERVAL: höchstens ein neuer Wert je MIN_INTERVAL Sekunden; zurückgehaltene Änderungen
+      werden bei der ersten Lesung nach Ablauf nachgeholt
+    Nicht-numerische Werte (und None) werden bei jeder Änderung sofort weitergegeben.
+    """
+
+    __slots__ = (
+        "deadband",
+        "min_interval",
+        "window",
+        "agg",
+        "digits",
+        "value",
+        "published",
+        "suppressed",
+        "_published_at",
+        "_samples",
+    )
+
+    def __init__(
+        self,
+        deadband: float = 0.0,
+        min_interval: float = 0.0,
+        window: float = 0.0,
+        agg: str = C_AGG_MEAN,
+        digits: int = 2,
+    ):
+        self.deadband = deadband
+        self.min_interval = min_interval
+        self.window = window
+        self.agg = agg
+        self.digits = digits
+        # zuletzt veröffentlichter Wert
+        self.value: Any = None
+        self.published = 0
+        self.suppressed = 0
+        self._published_at = -math.inf
+        self._samples: deque[tuple[float, float]] = deque()
+
+    def update(self, value: Any, now: float) -> bool:
+        """Neuen Messwert übernehmen; True, wenn ein neuer Wert veröffentlicht wurde."""
+        if value is None or isinstance(value, bool) or not isinstance(value, (int, float)):
+            self._samples.clear()
+            if value == self.value:
+                return False
+            return self._publish(value, now)
+
+        candidate = value
+        if self.window:
+            samples = self._samples
+            samples.append((now, value))
+            horizon = now - self.window
+            while samples[0][0] < horizon:
+                samples.popleft()
+            values = [sample for _, sample in samples]
+            if self.agg == C_AGG_MIN:
+                candidate = min(values)
+            elif self.agg == C_AGG_MAX:
+                candidate = max(values)
+            else:
+                candidate = round(sum(values) / len(values), self.digits)
+
+        previous = self.value
+        if candidate == previous:
+            return False
+        if isinstance(previous, (int, float)) and not isinstance(previous, bool):
+            if now - self._published_at < self.min_interval or (
+                abs(candidate - previous) < self.deadband
+            ):
+                self.suppressed += 1
+                return False
+        return self._publish(candidate, now)
+
+    def _publish(self, value: Any, now: float) -> bool:
+        self.value = value
+        self._published_at = now
+        self.published += 1
+        return True
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "value": self.value,
+            "published": self.published,
+            "suppressed": self.suppressed,
+        }
+
+
+def build_aggregators(entities: Dict[str, Dict[str, Any]]) -> Dict[str, EntityAggregator]:
+    """Einen EntityAggregator je Entität mit DEADBAND, MIN_INTERVAL oder WINDOW anlegen."""
+    aggregators = {}
+    for entity_key, props in entities.items():
+        config = get_entity_aggregation(props)
+        if config is None:
+            continue
+        # Mittelwerte eine Stelle genauer als die Auflösung des Registers (FAKTOR 0.1 -> 2 Stellen)
+        factor = get_entity_factor(props)
+        digits = max(0, -math.floor(math.log10(factor))) + 1 if factor else 2
+        aggregators[entity_key] = EntityAggregator(digits=digits, **config)
+    return aggregators
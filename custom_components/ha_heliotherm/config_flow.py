@@ -25,7 +25,11 @@ from .const import (
     DEFAULT_PORT,
     DEFAULT_HOSTID,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_BOOST_WINDOW,
+    DEFAULT_PIPELINING,
     CONF_HOSTID,
+    CONF_BOOST_WINDOW,
+    CONF_PIPELINING,
 )
 
 import sys
@@ -33,8 +37,7 @@ import logging
 
 thismodule = sys.modules[__name__]
 _LOGGER = logging.getLogger(__name__)
-_LOGGER.setLevel(logging.DEBUG)
-_LOGGER.info(f"{thismodule} loaded.")
+_LOGGER.debug("%s loaded.", thismodule)
 
 DATA_SCHEMA = vol.Schema(
     {
@@ -43,6 +46,8 @@ DATA_SCHEMA = vol.Schema(
         vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
         vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): int,
         vol.Optional(CONF_HOSTID, default=DEFAULT_HOSTID): int,
+        vol.Optional(CONF_BOOST_WINDOW, default=DEFAULT_BOOST_WINDOW): int,
+        vol.Optional(CONF_PIPELINING, default=DEFAULT_PIPELINING): bool,
     }
 )
 
@@ -59,13 +64,17 @@ def host_valid(host):
 
 @callback
 def ha_my_modbus_entries(hass: HomeAssistant):
-    """Return the hosts already configured."""
-    hosts = set()
+    """Return the (host, port, hostid) units already configured."""
+    units = set()
     for entry in hass.config_entries.async_entries(DOMAIN):
         host = entry.options.get(CONF_HOST, entry.data.get(CONF_HOST))
         if host:
-            hosts.add(host)
-    return hosts
+            port = entry.options.get(CONF_PORT, entry.data.get(CONF_PORT, DEFAULT_PORT))
+            hostid = entry.options.get(
+                CONF_HOSTID, entry.data.get(CONF_HOSTID, DEFAULT_HOSTID)
+            )
+            units.add((host, int(port), int(hostid)))
+    return units
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -75,9 +84,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_POLL
 
-    def _host_in_configuration_exists(self, host) -> bool:
-        """Return True if host exists in configuration."""
-        if host in ha_my_modbus_entries(self.hass):
+    def _host_in_configuration_exists(self, host, port, hostid) -> bool:
+        """
+        Return True if the unit exists in configuration.
+        Mehrere Wärmepumpen hinter einem Gateway (gleicher Host) unterscheiden sich über die Host ID.
+        """
+        if (host, int(port), int(hostid)) in ha_my_modbus_entries(self.hass):
             return True
         return False
 
@@ -87,13 +99,20 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             host = user_input[CONF_HOST]
+            port = user_input.get(CONF_PORT, DEFAULT_PORT)
+            hostid = user_input.get(CONF_HOSTID, DEFAULT_HOSTID)
 
-            if self._host_in_configuration_exists(host):
+            if self._host_in_configuration_exists(host, port, hostid):
                 errors[CONF_HOST] = "already_configured"
             elif not host_valid(user_input[CONF_HOST]):
                 errors[CONF_HOST] = "invalid host IP"
             else:
-                await self.async_set_unique_id(user_input[CONF_HOST])
+                # Bestehende Einträge verwenden den Host als unique_id, weitere Unit-IDs am
+                # selben Host (Gateway) erhalten host:port:hostid
+                unique_id = host
+                if any(unit[0] == host for unit in ha_my_modbus_entries(self.hass)):
+                    unique_id = f"{host}:{port}:{hostid}"
+                await self.async_set_unique_id(unique_id)
                 self._abort_if_unique_id_configured()
                 return self.async_create_entry(
                     title=user_input[CONF_NAME], data=user_input
@@ -158,6 +177,24 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                             self._config_entry.data.get(CONF_HOSTID, DEFAULT_HOSTID),
                         ),
                     ): vol.Coerce(int),
+                    vol.Optional(
+                        CONF_BOOST_WINDOW,
+                        default=self._config_entry.options.get(
+                            CONF_BOOST_WINDOW,
+                            self._config_entry.data.get(
+                                CONF_BOOST_WINDOW, DEFAULT_BOOST_WINDOW
+                            ),
+                        ),
+                    ): vol.Coerce(int),
+                    vol.Optional(
+                        CONF_PIPELINING,
+                        default=self._config_entry.options.get(
+                            CONF_PIPELINING,
+                            self._config_entry.data.get(
+                                CONF_PIPELINING, DEFAULT_PIPELINING
+                            ),
+                        ),
+                    ): bool,
                 }
             ),
         )
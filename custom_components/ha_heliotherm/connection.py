@@ -0,0 +1,212 @@
+"""Langlebige Modbus-TCP-Verbindung mit Keep-Alive und Backoff-Reconnect."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import socket
+import time
+from typing import Any, Dict, Tuple
+
+from pymodbus.client import AsyncModbusTcpClient
+
+from .metrics import Histogram
+from .pipeline import ModbusPipeline
+from .const import (
+    C_RECONNECT_DELAY_MIN,
+    C_RECONNECT_DELAY_MAX,
+    C_KEEPALIVE_IDLE,
+    C_KEEPALIVE_INTERVAL,
+    C_KEEPALIVE_COUNT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Gemeinsame Verbindungen je (host, port), z.B. mehrere Wärmepumpen hinter einem Modbus-TCP-Gateway
+_CONNECTIONS: Dict[Tuple[str, int], "ModbusConnection"] = {}
+
+
+def acquire_connection(
+    host: str, port: int, timeout: float = 3, retries: int = 3
+) -> ModbusConnection:
+    """
+    Verbindung zu host:port holen bzw. anlegen (Referenzzählung).
+    Alle Hubs mit gleichem host:port teilen sich Socket und Lock, unterschieden wird nur die Unit-ID.
+    """
+    key = (host, int(port))
+    conn = _CONNECTIONS.get(key)
+    if conn is None:
+        conn = ModbusConnection(host, int(port), timeout=timeout, retries=retries)
+        _CONNECTIONS[key] = conn
+    conn.users += 1
+    return conn
+
+
+def release_connection(conn: ModbusConnection) -> None:
+    """Referenz freigeben; die letzte Freigabe schließt die Verbindung."""
+    conn.users -= 1
+    if conn.users > 0:
+        return
+    if _CONNECTIONS.get((conn.host, conn.port)) is conn:
+        del _CONNECTIONS[(conn.host, conn.port)]
+    conn.close()
+
+
+class ModbusConnection:
+    """
+    Hält genau eine TCP-Verbindung zum Modbus-Gerät offen.
+
+    - Verbindungsaufbau nur bei Bedarf (erster Zugriff bzw. nach Verbindungsverlust)
+    - Tote Gegenstellen werden über TCP-Keep-Alive, Verbindungsabbruch der Gegenstelle
+      und Timeouts einzelner Requests erkannt (mark_dead)
+    - Reconnect mit exponentiellem Backoff und Jitter
+    - self.lock serialisiert Poll-Zyklen und Schreibzugriffe auf der gemeinsamen Verbindung,
+      auch zwischen mehreren Hubs (Unit-IDs); asyncio.Lock bedient Wartende in FIFO-Reihenfolge
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 3, retries: int = 3):
+        self.host = host
+        self.port = port
+        # Anzahl Hubs, die diese Verbindung nutzen (acquire_connection/release_connection)
+        self.users = 0
+        # reconnect_delay=0: kein automatischer Reconnect durch pymodbus, das Backoff
+        # wird hier gesteuert.
+        self._client = AsyncModbusTcpClient(
+            host=host,
+            port=port,
+            timeout=timeout,
+            retries=retries,
+            reconnect_delay=0,
+            trace_connect=self._on_trace_connect,
+        )
+        self.lock = asyncio.Lock()
+        # Gepipelinte Lesezugriffe über denselben Transport wie der Client
+        self._pipeline = ModbusPipeline(self._client, timeout=timeout)
+
+        self.connect_count = 0
+        self.reconnect_count = 0
+        self.connect_failures = 0
+        self.dead_peer_count = 0
+        # Dauer erfolgreicher Verbindungsaufbauten
+        self.connect_time = Histogram()
+
+        self._ever_connected = False
+        self._failures_in_row = 0
+        self._next_attempt = 0.0
+
+    @property
+    def client(self) -> AsyncModbusTcpClient:
+        return self._client
+
+    @property
+    def pipeline(self) -> ModbusPipeline:
+        """Gepipelinte Lesezugriffe auf dieser Verbindung (siehe pipeline.py)."""
+        return self._pipeline
+
+    @property
+    def connected(self) -> bool:
+        return self._client.connected
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Zähler zur Kontrolle der Verbindungsaufbauten."""
+        return {
+            "host": f"{self.host}:{self.port}",
+            "connected": self.connected,
+            "users": self.users,
+            "connect_count": self.connect_count,
+            "reconnect_count": self.reconnect_count,
+            "connect_failures": self.connect_failures,
+            "dead_peer_count": self.dead_peer_count,
+            "connect_time_ms": self.connect_time.as_dict(),
+        }
+
+    async def async_ensure_connected(self) -> bool:
+        """
+        Stellt sicher, dass die Verbindung steht.
+        Während einer Backoff-Pause wird kein Verbindungsversuch unternommen (-> False).
+        """
+        if self._client.connected:
+            return True
+
+        now = time.monotonic()
+        if now < self._next_attempt:
+            _LOGGER.debug(
+                "Reconnect zu %s:%s in %.1f s", self.host, self.port, self._next_attempt - now
+            )
+            return False
+
+        self.connect_count += 1
+        if self._ever_connected:
+            self.reconnect_count += 1
+
+        start = time.perf_counter()
+        if await self._client.connect():
+            self.connect_time.observe(time.perf_counter() - start)
+            self._ever_connected = True
+            self._failures_in_row = 0
+            self._next_attempt = 0.0
+            self._enable_keepalive()
+            _LOGGER.debug("Verbunden mit %s:%s", self.host, self.port)
+            return True
+
+        self.connect_failures += 1
+        self._schedule_backoff()
+        _LOGGER.warning(
+            "Modbus connect zu %s:%s fehlgeschlagen (%s. Versuch in Folge)",
+            self.host,
+            self.port,
+            self._failures_in_row,
+        )
+        return False
+
+    def mark_dead(self) -> None:
+        """Verbindung nach Timeout/IO-Fehler verwerfen; der nächste Zugriff verbindet neu."""
+        if self._client.connected:
+            self.dead_peer_count += 1
+            self._client.close()
+
+    def close(self) -> None:
+        """Verbindung schließen (z.B. beim Entladen)."""
+        self._client.close()
+        self._failures_in_row = 0
+        self._next_attempt = 0.0
+
+    # ---- Helper ----------------------------------------------------------
+
+    def _schedule_backoff(self) -> None:
+        """Exponentielles Backoff mit Jitter (50..100% der Wartezeit)."""
+        self._failures_in_row += 1
+        delay = min(
+            C_RECONNECT_DELAY_MAX,
+            C_RECONNECT_DELAY_MIN * (2 ** (self._failures_in_row - 1)),
+        )
+        delay *= random.uniform(0.5, 1.0)
+        self._next_attempt = time.monotonic() + delay
+
+    def _on_trace_connect(self, connected: bool) -> None:
+        """Von pymodbus aufgerufen, wenn die Verbindung auf- oder abgebaut wird."""
+        if not connected:
+            # Nur unerwartete Verbindungsabbrüche landen hier (nicht close()).
+            self.dead_peer_count += 1
+            _LOGGER.debug("Verbindung zu %s:%s getrennt", self.host, self.port)
+
+    def _enable_keepalive(self) -> None:
+        """TCP-Keep-Alive aktivieren, damit stille Verbindungsabbrüche erkannt werden."""
+        transport = getattr(self._client.ctx, "transport", None)
+        sock = transport.get_extra_info("socket") if transport else None
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            if hasattr(socket, "TCP_KEEPIDLE"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, C_KEEPALIVE_IDLE)
+            if hasattr(socket, "TCP_KEEPINTVL"):
+                sock.setsockopt(
+                    socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, C_KEEPALIVE_INTERVAL
+                )
+            if hasattr(socket, "TCP_KEEPCNT"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, C_KEEPALIVE_COUNT)
+        except OSError as exc:
+            _LOGGER.debug("Keep-Alive konnte nicht aktiviert werden: %s", exc)
@@ -6,13 +6,20 @@ from dataclasses import dataclass
 from typing import Optional, Dict, Any, Callable, Awaitable
 
 import sys
+import threading
 
 from homeassistant.components.climate import (
     ClimateEntityDescription,
     ClimateEntityFeature,
 )
 from homeassistant.components.select import SelectEntityDescription
-from homeassistant.components.sensor import *
+# Keine Sternchen-Importe: HA meldet beim Zugriff auf veraltete Konstanten jede einzeln
+# (mit Stack-Analyse), das kostete beim Import ein Vielfaches der eigentlichen Modulzeit
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
@@ -29,7 +36,10 @@ from homeassistant.const import (
     UnitOfEnergy,
     UnitOfPower,
     CONF_NAME,
+    EntityCategory,
     Platform,
+    UnitOfInformation,
+    UnitOfTime,
 )
 
 from pymodbus.client import ModbusTcpClient
@@ -38,8 +48,7 @@ import logging
 
 thismodule = sys.modules[__name__]
 _LOGGER = logging.getLogger(__name__)
-_LOGGER.setLevel(logging.DEBUG)
-_LOGGER.info(f"{thismodule} loaded")
+_LOGGER.debug("%s loaded", thismodule)
 
 
 
@@ -50,9 +59,26 @@ DEFAULT_SCAN_INTERVAL = 15
 DEFAULT_PORT = 502
 DEFAULT_HOSTID = 1
 CONF_HOSTID = "hostid"
+CONF_BOOST_WINDOW = "boost_window"
+DEFAULT_BOOST_WINDOW = 120
+CONF_PIPELINING = "pipelining"
+DEFAULT_PIPELINING = False
 CONF_HUB = "haheliotherm_hub"
+SERVICE_TRACE_CYCLE = "trace_cycle"
+SERVICE_PROBE_PROFILE = "probe_profile"
+SERVICE_DISCOVER_REGISTERS = "discover_registers"
+SERVICE_REFRESH_ON_DEMAND = "refresh_on_demand"
+# Geräteprofil (profile.py) in den Daten des Config-Entries
+CONF_PROFILE = "profile"
 ATTR_MANUFACTURER = "Heliotherm"
 
+# Verbindungsverwaltung (Reconnect-Backoff in Sekunden, TCP-Keep-Alive)
+C_RECONNECT_DELAY_MIN = 1.0
+C_RECONNECT_DELAY_MAX = 300.0
+C_KEEPALIVE_IDLE = 30
+C_KEEPALIVE_INTERVAL = 10
+C_KEEPALIVE_COUNT = 3
+
 # --- Konstanten ---
 
 # Datentyp für coils oder discrete_inputs
@@ -64,25 +90,103 @@ C_DT_UINT16 = ModbusTcpClient.DATATYPE.UINT16  # "UINT16"   # 1 Register
 C_DT_INT32 = ModbusTcpClient.DATATYPE.INT32  # "INT32"   # 2 Register
 C_DT_UINT32 = ModbusTcpClient.DATATYPE.UINT32  # "UINT32"   # 2 Register
 
-C_MIN_INPUT_REGISTER = sys.maxsize
-C_MAX_INPUT_REGISTER = -1
-C_MIN_HOLDING_REGISTER = sys.maxsize
-C_MAX_HOLDING_REGISTER = -1
-C_MIN_COILS = sys.maxsize
-C_MAX_COILS = -1
-C_MIN_DISCRETE_INPUTS = sys.maxsize
-C_MAX_DISCRETE_INPUTS = -1
-
 # Konstanten zur Definition der Registerart
 C_REG_TYPE_UNKNOWN = 0
 C_REG_TYPE_COILS = 1
 C_REG_TYPE_DISCRETE_INPUTS = 2
 C_REG_TYPE_HOLDING_REGISTERS = 3
 C_REG_TYPE_INPUT_REGISTERS = 4
+# Namen der Registerarten in registers.yaml (regmap.py) und in Ergebnissen der Register-Suche
+REGISTER_TYPES = {
+    "coils": C_REG_TYPE_COILS,
+    "discrete_inputs": C_REG_TYPE_DISCRETE_INPUTS,
+    "holding_registers": C_REG_TYPE_HOLDING_REGISTERS,
+    "input_registers": C_REG_TYPE_INPUT_REGISTERS,
+}
+
+# Protokollgrenzen je Lese-Request (FC 3/4: 125 Register, FC 1/2: 2000 Bits)
+C_MAX_READ_REGISTERS = 125
+C_MAX_READ_BITS = 2000
+# Kosten eines zusätzlichen Lese-Requests in Byte (Anfrage 12 + Antwort-Header 9)
+C_READ_REQUEST_OVERHEAD_BYTES = 21
+# Protokollgrenzen je Schreib-Request (FC 16: 123 Register, FC 15: 1968 Bits)
+C_MAX_WRITE_REGISTERS = 123
+C_MAX_WRITE_BITS = 1968
+# Sammelfenster für Schreibzugriffe in Sekunden
+C_WRITE_DEBOUNCE = 0.25
+# Zwischengespeicherte Lesepläne für das Rücklesen nach dem Schreiben (zuletzt benutzte)
+C_VERIFY_PLAN_CACHE_SIZE = 16
+# Verlauf der Rohwerte: Anzahl Lesezugriffe je Registerart im Ringpuffer (history.RegisterHistory)
+C_HISTORY_SIZE = 2048
+# Blockteilung: Exception-Codes, bei denen ein abgelehnter Block halbiert wird, statt den Zyklus
+# abzubrechen (2: Illegal Data Address, 3: Illegal Data Value)
+C_SPLIT_EXCEPTION_CODES = (2, 3)
+# Wartezeit in Sekunden, bis ein geteilter Block wieder als Ganzes versucht wird; verdoppelt sich
+# bei jeder erneuten Ablehnung bis zur Obergrenze
+C_QUARANTINE_RETRY = 600.0
+C_QUARANTINE_RETRY_MAX = 21600.0
+# Wartezeit in Sekunden nach einem vorübergehend fehlgeschlagenen Pipelining-Zyklus (Timeout,
+# Verbindungsabbruch), bis wieder gepipelint wird; verdoppelt sich bei jedem weiteren Fehlschlag
+C_PIPELINE_RETRY = 60.0
+C_PIPELINE_RETRY_MAX = 3600.0
+
+# Registerkarte (regmap.py): mitgelieferte Datei, eigene Karte im Konfigurationsverzeichnis
+# (ersetzt die mitgelieferte) und Kompilat unter .storage
+REGISTER_MAP_FILE = "registers.yaml"
+REGISTER_MAP_USER_FILE = "ha_heliotherm_registers.yaml"
+REGISTER_MAP_CACHE_FILE = "ha_heliotherm.registers"
+# Version des Dateiformats (Schlüssel version in registers.yaml)
+C_REGMAP_VERSION = 1
+# Format des Kompilats; erhöhen, wenn sich dessen Aufbau ändert
+C_REGMAP_CACHE_FORMAT = 1
+
+# Register-Suche (discovery.py): durchsucht werden alle nicht belegten Adressen unterhalb dieser
+# Obergrenzen; einmalig nach dem ersten Setup, Ergebnis unter .storage/ha_heliotherm.discovery.<entry_id>
+C_DISCOVERY_LIMITS = {C_REG_TYPE_INPUT_REGISTERS: 256, C_REG_TYPE_HOLDING_REGISTERS: 512}
+# Größte Blockgröße (Register je Request)
+C_DISCOVERY_BLOCK = 32
+# Mindestabstand zwischen zwei Requests in Sekunden (das Abfragen läuft währenddessen weiter)
+C_DISCOVERY_REQUEST_DELAY = 0.25
+# Höchstzahl Requests einer Suche
+C_DISCOVERY_MAX_REQUESTS = 2000
+# Lesungen je gefundenem Register und ihr Abstand in Sekunden (Schwankung der Werte)
+C_DISCOVERY_SAMPLES = 5
+C_DISCOVERY_SAMPLE_INTERVAL = 15.0
+# Wartezeit nach dem Setup bis zum Start der Suche in Sekunden
+C_DISCOVERY_START_DELAY = 60.0
+C_DISCOVERY_STORE_VERSION = 1
+
+# Abfrageklassen (POLL) und ihr Leseintervall in Vielfachen des Scan-Intervalls
+C_POLL_FAST = "fast"  # jeder Zyklus
+C_POLL_NORMAL = "normal"  # jeder 2. Zyklus
+C_POLL_SLOW = "slow"  # jeder 40. Zyklus (10 min bei 15 s)
+C_POLL_ON_DEMAND = "on_demand"  # nur beim ersten Zyklus und auf Anforderung
+C_POLL_DEFAULT = C_POLL_FAST
+POLL_CLASS_TICKS: Dict[str, int | None] = {
+    C_POLL_FAST: 1,
+    C_POLL_NORMAL: 2,
+    C_POLL_SLOW: 40,
+    C_POLL_ON_DEMAND: None,
+}
+
+# Adaptives Abfrageintervall: ein Zyklus soll höchstens diesen Anteil des Intervalls belegen
+C_POLL_TARGET_LOAD = 0.25
+# Größte Streckung des Abfrageintervalls (Vielfaches von scan_interval)
+C_POLL_MAX_STRETCH = 8
+# Faktor, mit dem ein gestrecktes Intervall je Zyklus wieder verkürzt wird
+C_POLL_RECOVER_FACTOR = 0.75
+# Boost: Abfrageintervall der schnellen Blöcke in Sekunden, solange nach einer Zustandsänderung
+# einer BOOST-Entität das Boost-Fenster (CONF_BOOST_WINDOW) läuft
+C_BOOST_INTERVAL = 3.0
+
+# Aufbereitung vor dem Recorder (AGG in ENTITIES_DICT): Kennzahl über das Fenster WINDOW
+C_AGG_MEAN = "mean"
+C_AGG_MIN = "min"
+C_AGG_MAX = "max"
 
 # ------------------------------------------------------------
 # 2) Entity-Konstanten (C_<NAME> = "<entity_key>")
-#    >> Diese Konstanten dienen als Keys im ENTITIES_DICT.
+#    >> Diese Konstanten dienen als Keys im ENTITIES_DICT (registers.yaml).
 # ------------------------------------------------------------
 C_TEMP_AUSSEN = "temp_aussen"
 C_TEMP_BRAUCHWASSER = "temp_brauchwasser"
@@ -193,148 +297,15 @@ C_TF22_HAND_AKTIV = "switch_tf22_hand_aktiv"
 
 
 # --------------------------------------------------------------------------------------------
-# 2) ENTITIES_DICT DICT, neue Register müssen nur hier zugefügt werden.
-#    Sofern zusätzliche Register keine neue Logik erfordern, ist der restliche Code schon darauf vorbereitet
-# --------------------------------------------------------------------------------------------
+# 2) ENTITIES_DICT: Registerkarte aus registers.yaml (Format und Schlüssel siehe dort),
+#    geprüft und übersetzt von regmap.py. Neue Register müssen nur in registers.yaml zugefügt werden.
 #    ENTITIES_DICT: Dict[str, Dict[str, Any]]
 #    *Key = passende C_<...>-Konstante = HASS sensor_id
-#    *NAME: Angezeigter Name
-#    *REG: Modbus-Register (Zero-Based)
-#    *RT: Register Typ (derzeit 1..4): Holding-Register, Coils (read-write) oder Input-Register, Discrete-Inputs (read-only)
-#    *DT: Datentyp (derzeit nur BITS, INT16, UINT16), Hinweis: BITS für Coils und Discrete-Inputs (Angabe optional). Schalter immer mit 0 oder 1
-#    RW: Read/Write für Coils und Holding-Register unterbinden mit "RW":0
-#    FAKTOR: Multiplikator für Anzeige im HA (derzeit: 1, 0.1)
-#    UNIT: Einheit der Entität (°C, W, kW, Wh, kWh, bar, ppm, m³/h...)
-#    STEP: Steuert die Darstellung in der Anzeige im HA, Schrittweite der Einstellung (z.B. 5.0, 1.0, 0.5, 0.1)
-#    MIN: Erlaubter Mindestwert der Entität
-#    MAX: Erlaubter Höchstwert der Entität
-#    VALUES: Gültige Auswahlwerte; dict[id,AngezeigterName] mit optionalem Bestandteil: "default":<defaultwert>
-#    INC: 1, wenn Entität stetig steigende Werte liefert.
-#    SWITCH: Werte für "aus" und optional für "ein". Wenn "ein" nicht angegeben ist, sind alle anderen ganzahligen Werte "ein" gültig
-#    WEB_ID: Zugeordnete Web-Regler ID, wird in HASS nicht genutzt
-#    HA: Zugeordnete Hand-Aktiv-Entität
-#    PF: Anzeige-Variante in HA übersteuern. "PF":Platform.NUMBER v=> Temperaturwert wird nicht als CLIMATE, sondern als NUMBER behandelt.
-#
-#    *: Obligatorischer Wert
+#    Werte wie in registers.yaml, jedoch RT als C_REG_TYPE_*, DT als C_DT_* und PF als Platform
 # --------------------------------------------------------------------------------------------
 
-# Modbus-Register gemäß 20230705_Fachmannebene_RCGX_1.0.5.4_DE_mail.pdf vom 24.04.2023
-# Getestet mit Heliotherm Complete RCG 2.1.0.5 und Visualisierung 2.1.0.5
-
-# --- ENTITIES_DICT ---
-ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
-    # INPUT_REGISTERS
-    # --- 0-9 werden aktuell nicht genutzt ---
-    C_TEMP_AUSSEN: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Temp. Aussen","REG":10,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 0"},
-    C_TEMP_BRAUCHWASSER: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Temp. Brauchwasser","REG":11,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 2"},
-    C_TEMP_VORLAUF: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Temp. Vorlauf","REG":12,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 3"},
-    C_TEMP_RUECKLAUF: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Temp. Rücklauf","REG":13,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 4"},
-    C_TEMP_PUFFERSPEICHER: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Temp. Pufferspeicher","REG":14,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 5"},
-    C_TEMP_EQ_EINTRITT: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Temp. EQ Eintritt","REG":15,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 6"},
-    C_TEMP_EQ_AUSTRITT: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Temp. EQ Austritt","REG":16,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 7"},
-    C_TEMP_SAUGGAS: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Temp. Sauggas","REG":17,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 9"},
-    C_TEMP_VERDAMPFUNG: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Temp. Verdampfung","REG":18,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 12"},
-    C_TEMP_KONDENSATION: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Temp. Kondensation","REG":19,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 13"},
-    C_TEMP_HEISSGAS: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Temp. Heißgas","REG":20,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 15"},
-    C_NIEDERDRUCK: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Niederdruck","REG":21,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"bar","WEB_ID":"MP 20"},
-    C_HOCHDRUCK: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Hochdruck","REG":22,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"bar","WEB_ID":"MP 21"},
-    C_HEIZKREISPUMPE: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Heizkreispumpe","REG":23,"DT":C_DT_INT16,"SWITCH":{"off":0},"WEB_ID":"MP 22"},
-    C_PUFFERLADEPUMPE: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Pufferladepumpe","REG":24,"DT":C_DT_INT16,"SWITCH":{"off":0},"WEB_ID":"MP 23"},
-    C_VERDICHTER: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Verdichter","REG":25,"DT":C_DT_INT16,"SWITCH":{"off":0},"WEB_ID":"MP 30"},
-    C_STOERUNG: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Störung","REG":26,"DT":C_DT_INT16,"SWITCH":{"off":0},"WEB_ID":"MP 31"},
-    C_VIERWEGENVENTIL_ABTAUBETRIEB: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Vierwegenventil Abtaubetrieb","REG":27,"DT":C_DT_INT16,"SWITCH":{"off":0},"WEB_ID":"MP 32"},
-    C_WMZ_DURCHFLUSS: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"WMZ Durchfluss","REG":28,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"l/min","WEB_ID":"MP 85"},
-    C_N_SOLL_VERDICHTER: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"n-Soll Verdichter","REG":29,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"%","WEB_ID":"MP 90"},
-    C_COP: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"COP","REG":30,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"","WEB_ID":"MP 92"},
-    C_TEMP_FRISCHWASSER: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Temp. Frischwasser","REG":31,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 11"},
-    C_EVU_SPERRE_AKTIV: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"EVU Sperre aktiv","REG":32,"DT":C_DT_INT16,"SWITCH":{"off":0},"WEB_ID":"MP 37"},
-    C_TEMP_AUSSEN_VERZOEGERT: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Temp. Aussen verzögert","REG":33,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 1"},
-    C_HKR_SOLLTEMP: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"HKR Solltemp.","REG":34,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 57"},
-    C_MKR1_SOLLTEMP: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"MKR1 Solltemp.","REG":35,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 66"},
-    C_MKR2_SOLLTEMP: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"MKR2 Solltemp.","REG":36,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 72"},
-    C_EQ_VENTILATOR_PUMPE: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"EQ Ventilator/Pumpe","REG":37,"DT":C_DT_INT16,"SWITCH":{"off":0},"WEB_ID":"MP 24"},
-    C_WW_VORRANG_WW: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"WW Vorrang WW","REG":38,"DT":C_DT_INT16,"SWITCH":{"off":0},"WEB_ID":"MP 25"},
-    C_KUEHLEN_UMV_PASSIV: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Kühlen UMV passiv","REG":39,"DT":C_DT_INT16,"SWITCH":{"off":0},"WEB_ID":"MP 27"},
-    C_EXPANSIONSVENTIL: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Expansionsventil","REG":40,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"%","WEB_ID":"MP 51"},
-    C_VERDICHTERANFORDERUNG: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Verdichteranforderung","REG":41,"DT":C_DT_INT16,"VALUES":{0: "keine_anforderung",10: "kuehlen",20: "heizen",30: "warmwasser"},"WEB_ID":"MP 56"},
-    C_BETRIEBSSTUNDEN_IM_WW_BETRIEB: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Betriebsstunden im WW-Betrieb","REG":42,"DT":C_DT_UINT32,"FAKTOR":1,"UNIT":"h","WEB_ID":"SP 171"},
-    C_BETRIEBSSTUNDEN_IM_HZG_BETRIEB: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Betriebsstunden im HZG-Betrieb","REG":44,"DT":C_DT_UINT32,"FAKTOR":1,"UNIT":"h","WEB_ID":"SP 172"},
-    C_MKR1_VORLAUFTEMPERATUR: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"MKR1 Vorlauftemperatur","REG":46,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 63"},
-    C_MKR1_RUECKLAUFTEMPERATUR: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"MKR1 Rücklauftemperatur","REG":47,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 64"},
-    C_MKR2_VORLAUFTEMPERATUR: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"MKR2 Vorlauftemperatur","REG":48,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 69"},
-    C_MKR2_RUECKLAUFTEMPERATUR: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"MKR2 Rücklauftemperatur","REG":49,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 70"},
-    C_RAUMFUEHLER_1: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Raumfühler 1","REG":50,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 16"},
-    C_SOLAR_KT1: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Solar KT1","REG":51,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","WEB_ID":"MP 43"},
-    C_FLOW_PRI: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Primary flow","REG":52,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"l/min","WEB_ID":"MP 104"},
-    C_EQ_VENTILATOR_PUMPE_PROZENT: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"EQ Ventilator/Pumpe [%]","REG":53,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"%","WEB_ID":"MP 48"},
-    # --- 54-59 werden aktuell nicht genutzt ---
-    C_WMZ_HEIZUNG: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"WMZ Heizung","REG":60,"DT":C_DT_UINT32,"FAKTOR":1,"UNIT":"kW/h","WEB_ID":"MP 52"},
-    C_STROMZAEHLER_HEIZUNG: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Stromzähler Heizung","REG":62,"DT":C_DT_UINT32,"FAKTOR":1,"UNIT":"kW/h","WEB_ID":"MP 53"},
-    C_WMZ_BRAUCHWASSER: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"WMZ Brauchwasser","REG":64,"DT":C_DT_UINT32,"FAKTOR":1,"UNIT":"kW/h","WEB_ID":"MP 54"},
-    C_STROMZAEHLER_BRAUCHWASSER: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Stromzähler Brauchwasser","REG":66,"DT":C_DT_UINT32,"FAKTOR":1,"UNIT":"kW/h","WEB_ID":"MP 55"},
-    C_STROMZAEHLER_GESAMT: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Stromzähler Gesamt","REG":68,"DT":C_DT_UINT32,"FAKTOR":1,"UNIT":"kW/h","WEB_ID":"MP 75"},
-    C_STROMZAEHLER_LEISTUNG: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"Stromzähler Leistung","REG":70,"DT":C_DT_UINT32,"FAKTOR":1,"UNIT":"W","WEB_ID":"MP 83"},
-    C_WMZ_GESAMT: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"WMZ Gesamt","REG":72,"DT":C_DT_UINT32,"FAKTOR":1,"UNIT":"kW/h","WEB_ID":"MP 84"},
-    C_WMZ_LEISTUNG: {"RT": C_REG_TYPE_INPUT_REGISTERS,"NAME":"WMZ Leistung","REG":74,"DT":C_DT_UINT32,"FAKTOR":0.1,"UNIT":"kW","WEB_ID":"MP 89"},
-    # --- 76-99 werden aktuell nicht genutzt ---
-    # HOLDING_REGISTERS
-    C_BETRIEBSART: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"Betriebsart","REG":100,"DT":C_DT_UINT16,"VALUES":{0: "aus",1: "automatik",2: "kuehlen",3: "sommer",4: "dauerbetrieb",5: "absenkbetrieb",6: "urlaub",7: "party","default":1},"WEB_ID":"SP 13"},
-    C_RAUMSOLLTEMPERATUR: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"Raumsolltemperatur","REG":101,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","STEP":0.5,"MIN":10.0,"MAX":25.0,"WEB_ID":"SP 69","PF":Platform.NUMBER},
-    C_RUECKLAUFSOLLTEMPERATUR: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"Rücklaufsolltemperatur","REG":102,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","STEP":0.5,"MIN":5.0,"MAX":65.0,"HA":C_RUECKLAUFSOLLTEMPERATUR_HAND_AKTIV,"WEB_ID":"MP 57","PF":Platform.NUMBER},
-    C_RUECKLAUFSOLLTEMPERATUR_HAND_AKTIV: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"Rücklaufsolltemperatur Hand-Aktiv","REG":103,"DT":C_DT_UINT16,"SWITCH":{"off":0,"on":1},"WEB_ID":"MP 57"},
-    C_MIN_RUECKLAUFTEMPERATUR_KUEHLEN: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"min Rücklauftemperatur Kühlen","REG":104,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","STEP":1.0,"MIN":15.0,"MAX":25.0,"WEB_ID":"SP 175","PF":Platform.NUMBER},
-    # Achtung: Abweichend zur Originalimplementierung: Dies ist 105/106 *KEIN* Regler mit ClimateEntityFeature.TARGET_TEMPERATURE_RANGE, sondern 106 ist die Frostschutzgrenze und 105 der Zielwert für die WW-Bereitung!!
-    # Die Normaltemperatur ist nur eine Vorgabe, die Regelelektronik kann das Wasser höher erwärmen, wenn die Zykluszeit sonst zu kurz wäre.
-    C_WW_NORMALTEMPERATUR: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"WW Normaltemperatur","REG":105,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","STEP":1.0,"MIN":5.0,"MAX":65.0,"WEB_ID":"SP 83","PF":Platform.NUMBER},
-    C_WW_MINIMALTEMPERATUR: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"WW Minimaltemperatur","REG":106,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","STEP":1.0,"MIN":5.0,"MAX":65.0,"WEB_ID":"SP 85","PF":Platform.NUMBER},
-    C_MKR1_BETRIEBSART: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR1 Betriebsart","REG":107,"DT":C_DT_UINT16,"VALUES":{0: "aus",1: "automatik",2: "kuehlen",3: "sommer",4: "dauerbetrieb",5: "absenkbetrieb",6: "urlaub",7: "party","default":1},"WEB_ID":"SP 221"},
-    C_MKR1_RAUMSOLLTEMPERATUR: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR1 Raumsolltemperatur","REG":108,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","STEP":0.5,"MIN":10.0,"MAX":25.0,"WEB_ID":"SP 200","PF":Platform.NUMBER},
-    C_MKR1_SOLLTEMPERATUR: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR1 Solltemperatur","REG":109,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","STEP":0.5,"MIN":5.0,"MAX":65.0,"HA":C_MKR1_SOLLTEMPERATUR_HAND_AKTIV,"WEB_ID":"MP 66","PF":Platform.NUMBER},
-    C_MKR1_SOLLTEMPERATUR_HAND_AKTIV: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR1 Solltemperatur Hand-Aktiv","REG":110,"DT":C_DT_UINT16,"SWITCH":{"off":0,"on":1},"WEB_ID":"MP 66"},
-    C_MKR1_MIN_RUECKLAUFTEMPERATUR_KUEHLEN: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR1 min Rücklauftemperatur Kühlen","REG":111,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","STEP":1.0,"MIN":15.0,"MAX":25.0,"WEB_ID":"SP 348","PF":Platform.NUMBER},
-    C_MKR2_BETRIEBSART: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR2 Betriebsart","REG":112,"DT":C_DT_UINT16,"VALUES":{0: "aus",1: "automatik",2: "kuehlen",3: "sommer",4: "dauerbetrieb",5: "absenkbetrieb",6: "urlaub",7: "party","default":1},"WEB_ID":"SP 244","PF":Platform.NUMBER},
-    C_MKR2_RAUMSOLLTEMPERATUR: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR2 Raumsolltemperatur","REG":113,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","STEP":0.5,"MIN":10.0,"MAX":25.0,"WEB_ID":"SP 223","PF":Platform.NUMBER},
-    C_MKR2_SOLLTEMPERATUR: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR2 Solltemperatur","REG":114,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","STEP":0.5,"MIN":5.0,"MAX":65.0,"HA":C_MKR2_SOLLTEMPERATUR_HAND_AKTIV,"WEB_ID":"MP 72","PF":Platform.NUMBER},
-    C_MKR2_SOLLTEMPERATUR_HAND_AKTIV: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR2 Solltemperatur Hand-Aktiv","REG":115,"DT":C_DT_UINT16,"SWITCH":{"off":0,"on":1},"WEB_ID":"MP 72"},
-    C_MKR2_MIN_RUECKLAUFTEMPERATUR_KUEHLEN: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR2 min Rücklauftemperatur Kühlen","REG":116,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","STEP":1.0,"MIN":15.0,"MAX":25.0,"WEB_ID":"SP 352","PF":Platform.NUMBER},
-    C_PV_ANFORDERUNG: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"PV Anforderung","REG":117,"DT":C_DT_UINT16,"SWITCH":{"off":0,"on":1},"WEB_ID":"SP 436"},
-    C_PV_HEIZEN_OFFSET: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"PV Heizen Offset","REG":118,"DT":C_DT_UINT16,"FAKTOR":0.1,"UNIT":"K","STEP":0.1,"MIN":0.0,"MAX":10.0,"WEB_ID":"SP 437","PF":Platform.NUMBER},
-    C_PV_KUEHLEN_OFFSET: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"PV Kuehlen Offset","REG":119,"DT":C_DT_UINT16,"FAKTOR":0.1,"UNIT":"K","STEP":0.1,"MIN":0.0,"MAX":10.0,"WEB_ID":"SP 438","PF":Platform.NUMBER},
-    C_PV_HEIZEN_OFFSET_MKR1: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"PV Heizen Offset MKR1","REG":120,"DT":C_DT_UINT16,"FAKTOR":0.1,"UNIT":"K","STEP":0.1,"MIN":0.0,"MAX":10.0,"WEB_ID":"SP 453","PF":Platform.NUMBER},
-    C_PV_KUEHLEN_OFFSET_MKR1: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"PV Kühlen Offset MKR1","REG":121,"DT":C_DT_UINT16,"FAKTOR":0.1,"UNIT":"K","STEP":0.1,"MIN":0.0,"MAX":10.0,"WEB_ID":"SP 454","PF":Platform.NUMBER},
-    C_PV_HEIZEN_OFFSET_MKR2: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"PV Heizen Offset MKR2","REG":122,"DT":C_DT_UINT16,"FAKTOR":0.1,"UNIT":"K","STEP":0.1,"MIN":0.0,"MAX":10.0,"WEB_ID":"SP 455","PF":Platform.NUMBER},
-    C_PV_KUEHLEN_OFFSET_MKR2: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"PV Kühlen Offset MKR2","REG":123,"DT":C_DT_UINT16,"FAKTOR":0.1,"UNIT":"K","STEP":0.1,"MIN":0.0,"MAX":10.0,"WEB_ID":"SP 456","PF":Platform.NUMBER},
-    C_WW_NORMAL_MAX: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"WW Normal Max","REG":124,"DT":C_DT_UINT16,"FAKTOR":0.1,"UNIT":"°C","STEP":1.0,"MIN":5.0,"MAX":65.0,"WEB_ID":"SP 347","PF":Platform.NUMBER},
-    C_VORGABE_LEISTUNGSAUFNAHME: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"Vorgabe Leistungsaufnahme","REG":125,"DT":C_DT_UINT16,"FAKTOR":1,"UNIT":"W","STEP":1,"MIN":0,"MAX":7000,"PF":Platform.NUMBER},   #MAX-Wert hängt von der LEistung der WP ab -> konfigurierbar machen?
-    C_VORGABE_VERDICHTERDREHZAHL: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"Vorgabe Verdichterdrehzahl","REG":126,"RW":1,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"%","STEP":1,"MIN":0,"MAX":1000,"PF":Platform.NUMBER},  #!! DARF NICHT BESCHRIEBEN WERDEN
-    C_EXT_ANFORDERUNG: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"Ext. Anforderung","REG":127,"DT":C_DT_UINT16,"SWITCH":{"off":0,"on":1},"WEB_ID":"MP 27"},
-    C_ENTSTOEREN: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"Entstören","REG":128,"DT":C_DT_UINT16,"SWITCH":{"off":0,"on":1},"WEB_ID":"SP 14"},
-    C_AUSSENTEMPERATUR_HANDWERT: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"Aussentemperatur Handwert","REG":129,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","STEP":0.1,"MIN":-49.9,"MAX":60.0,"HA":C_AUSSENTEMPERATUR_HAND_AKTIV,"WEB_ID":"MP 0","PF":Platform.NUMBER},
-    C_AUSSENTEMPERATUR_HAND_AKTIV: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"Aussentemperatur Hand-Aktiv","REG":130,"DT":C_DT_UINT16,"SWITCH":{"off":0,"on":1},"WEB_ID":"MP 0"},
-    C_PUFFERTEMPERATUR_HANDWERT: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"Puffertemperatur Handwert","REG":131,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","STEP":0.1,"MIN":5.0,"MAX":60.0,"HA":C_PUFFERTEMPERATUR_HAND_AKTIV,"WEB_ID":"MP 5","PF":Platform.NUMBER},
-    C_PUFFERTEMPERATUR_HAND_AKTIV: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"Puffertemperatur Hand-Aktiv","REG":132,"DT":C_DT_UINT16,"SWITCH":{"off":0,"on":1},"WEB_ID":"MP 5"},
-    C_BRAUCHWASSERTEMPERATUR_HANDWERT: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"Brauchwassertemperatur Handwert","REG":133,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","STEP":0.1,"MIN":5.0,"MAX":60.0,"HA":C_BRAUCHWASSERTEMPERATUR_HAND_AKTIV,"WEB_ID":"MP 2","PF":Platform.NUMBER},
-    C_BRAUCHWASSERTEMPERATUR_HAND_AKTIV: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"Brauchwassertemperatur Hand-Aktiv","REG":134,"DT":C_DT_UINT16,"SWITCH":{"off":0,"on":1},"WEB_ID":"MP 2"},
-    C_HKR_HEIZGRENZE: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"HKR Heizgrenze","REG":135,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","Step": 1.0, "MIN":5.0,"MAX":30.0,"WEB_ID":"SP 76","PF":Platform.NUMBER},
-    C_HKR_RUECKLAUFSOLL_BEI_HEIZGRENZE: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"HKR Rücklaufsoll bei Heizgrenze","REG":136,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","MIN":15.0,"MAX":35.0,"WEB_ID":"SP 80","PF":Platform.NUMBER},
-    C_HKR_RUECKLAUFSOLL_BEI_0_C: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"HKR Rücklaufsoll bei 0°C","REG":137,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","MIN":15.0,"MAX":35.0,"WEB_ID":"SP 81","PF":Platform.NUMBER},
-    C_HKR_RUECKLAUFSOLL_BEI_15_C: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"HKR Rücklaufsoll bei -15°C","REG":138,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","MIN":15.0,"MAX":35.0,"WEB_ID":"SP 82","PF":Platform.NUMBER},
-    C_MKR1_HEIZGRENZE: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR1 Heizgrenze","REG":139,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","Step": 1, "MIN":5.0,"MAX":30.0,"WEB_ID":"SP 205","PF":Platform.NUMBER},
-    C_MKR1_RUECKLAUFSOLL_BEI_HEIZGRENZE: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR1 Rücklaufsoll bei Heizgrenze","REG":140,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","MIN":15.0,"MAX":35.0,"WEB_ID":"SP 209","PF":Platform.NUMBER},
-    C_MKR1_RUECKLAUFSOLL_BEI_0_C: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR1 Rücklaufsoll bei 0°C","REG":141,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","MIN":15.0,"MAX":35.0,"WEB_ID":"SP 210","PF":Platform.NUMBER},
-    C_MKR1_RUECKLAUFSOLL_BEI_15_C: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR1 Rücklaufsoll bei -15°C","REG":142,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","MIN":15.0,"MAX":35.0,"WEB_ID":"SP 211","PF":Platform.NUMBER},
-    C_MKR2_HEIZGRENZE: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR2 Heizgrenze","REG":143,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","Step": 1, "MIN":5.0,"MAX":30.0,"WEB_ID":"SP 228","PF":Platform.NUMBER},
-    C_MKR2_RUECKLAUFSOLL_BEI_HEIZGRENZE: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR2 Rücklaufsoll bei Heizgrenze","REG":144,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","MIN":15.0,"MAX":35.0,"WEB_ID":"SP 232","PF":Platform.NUMBER},
-    C_MKR2_RUECKLAUFSOLL_BEI_0_C: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR2 Rücklaufsoll bei 0°C","REG":145,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","MIN":15.0,"MAX":35.0,"WEB_ID":"SP 233","PF":Platform.NUMBER},
-    C_MKR2_RUECKLAUFSOLL_BEI_15_C: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"MKR2 Rücklaufsoll bei -15°C","REG":146,"DT":C_DT_INT16,"FAKTOR":0.1,"UNIT":"°C","MIN":15.0,"MAX":35.0,"WEB_ID":"SP 234","PF":Platform.NUMBER},
-    C_2_STUFE_HANDWERT: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"2. Stufe Handwert","REG":147,"DT":C_DT_INT16,"SWITCH":{"off":0,"on":1},"HA":C_2_STUFE_HAND_AKTIV,"WEB_ID":"MP 49"},
-    C_2_STUFE_HAND_AKTIV: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"2. Stufe Hand-Aktiv","REG":148,"DT":C_DT_UINT16,"SWITCH":{"off":0,"on":1},"WEB_ID":"MP 49"},
-    C_EVU_SPERRE_HANDWERT: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"EVU Sperre Handwert","REG":149,"DT":C_DT_INT16,"SWITCH":{"off":0,"on":1},"HA":C_EVU_SPERRE_HAND_AKTIV,"WEB_ID":"MP 37"},
-    C_EVU_SPERRE_HAND_AKTIV: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"EVU Sperre Hand-Aktiv","REG":150,"DT":C_DT_UINT16,"SWITCH":{"off":0,"on":1},"WEB_ID":"MP 37"},
-    # Raumbediengerät TF22
-    C_TF22_HANDWERT: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"TF22 Handwert","REG":151,"DT":C_DT_INT16,"FAKTOR":1,"STEP":1.0,"MIN":-80.0,"MAX":80.0,"WEB_ID":"MP 10","HA":C_TF22_HAND_AKTIV,"PF":Platform.NUMBER},
-    C_TF22_HAND_AKTIV: {"RT": C_REG_TYPE_HOLDING_REGISTERS,"NAME":"TF22 Hand-Aktiv","REG":152,"DT":C_DT_UINT16,"SWITCH":{"off":0,"on":1},"WEB_ID":"MP 10"},
-}
+# Wird von init() an Ort und Stelle befüllt
+ENTITIES_DICT: Dict[str, Dict[str, Any]] = {}
 
 
 # ------------------------------------------------------------
@@ -352,6 +323,13 @@ class MySensorEntityDescription(SensorEntityDescription):
     """A class that describes Modbus sensor entities."""
 
 
+@dataclass
+class MyMetricSensorEntityDescription(SensorEntityDescription):
+    """Diagnose-Sensor, dessen Wert aus den Laufzeit-Metriken des Hubs (hub.metrics) gelesen wird."""
+
+    value_fn: Callable[[Any], Any] | None = None
+
+
 @dataclass
 class MyBinaryEntityDescription(BinarySensorEntityDescription):
     """A class that describes Modbus binary entities."""
@@ -388,6 +366,7 @@ class MyNumberEntityDescription(NumberEntityDescription):
     editable: bool = True
 
 
+# Entitätsbeschreibungen je Plattform, werden von init() aus ENTITIES_DICT befüllt
 BINARYSENSOR_TYPES: dict[str, MyBinarySensorEntityDescription] = {}
 SENSOR_TYPES: dict[str, MySensorEntityDescription] = {}
 SELECT_TYPES: dict[str, MySelectEntityDescription] = {}
@@ -395,6 +374,114 @@ CLIMATE_TYPES: dict[str, MyClimateEntityDescription] = {}
 NUMBER_TYPES: dict[str, MyNumberEntityDescription] = {}
 BINARY_TYPES: dict[str, MyBinaryEntityDescription] = {}
 
+def _quantile_ms(histogram, q: float) -> float | None:
+    value = histogram.quantile(q)
+    return None if value is None else round(value * 1e3, 1)
+
+
+# Diagnose-Sensoren aus hub.metrics / hub.metrics_stats (unabhängig von ENTITIES_DICT)
+METRIC_SENSOR_TYPES: dict[str, MyMetricSensorEntityDescription] = {
+    description.key: description
+    for description in (
+        MyMetricSensorEntityDescription(
+            key="diag_cycle_time_p95",
+            name="Zykluszeit p95",
+            translation_key="diag_cycle_time_p95",
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            value_fn=lambda hub: _quantile_ms(hub.metrics.cycle_time, 0.95),
+        ),
+        MyMetricSensorEntityDescription(
+            key="diag_block_rtt_p95",
+            name="Block-RTT p95",
+            translation_key="diag_block_rtt_p95",
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            value_fn=lambda hub: _quantile_ms(hub.metrics.block_rtt, 0.95),
+        ),
+        MyMetricSensorEntityDescription(
+            key="diag_connect_time",
+            name="Verbindungsaufbau",
+            translation_key="diag_connect_time",
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda hub: round(hub.connect_time.last * 1e3, 1)
+            if hub.connect_time.count
+            else None,
+        ),
+        MyMetricSensorEntityDescription(
+            key="diag_decode_time_p95",
+            name="Dekodierzeit p95",
+            translation_key="diag_decode_time_p95",
+            native_unit_of_measurement=UnitOfTime.MICROSECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda hub: None
+            if not hub.metrics.decode_time.count
+            else round(hub.metrics.decode_time.quantile(0.95) * 1e6, 1),
+        ),
+        MyMetricSensorEntityDescription(
+            key="diag_timeouts",
+            name="Timeouts",
+            translation_key="diag_timeouts",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            value_fn=lambda hub: hub.metrics.counters["timeouts"],
+        ),
+        MyMetricSensorEntityDescription(
+            key="diag_errors",
+            name="Fehler",
+            translation_key="diag_errors",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            value_fn=lambda hub: sum(hub.metrics.errors.values()),
+        ),
+        MyMetricSensorEntityDescription(
+            key="diag_retries",
+            name="Wiederholungen",
+            translation_key="diag_retries",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda hub: hub.metrics.counters["retries"],
+        ),
+        MyMetricSensorEntityDescription(
+            key="diag_bytes_received",
+            name="Empfangene Daten",
+            translation_key="diag_bytes_received",
+            native_unit_of_measurement=UnitOfInformation.BYTES,
+            device_class=SensorDeviceClass.DATA_SIZE,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda hub: hub.metrics.counters["bytes_received"],
+        ),
+        MyMetricSensorEntityDescription(
+            key="diag_callbacks",
+            name="Entitäts-Updates",
+            translation_key="diag_callbacks",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda hub: hub.metrics.counters["callbacks"],
+        ),
+    )
+}
+
+# Blockzugriffe je Lesezyklus, wird von init() aus der Registerkarte übernommen (planner.ReadBlock)
+READ_PLAN: list = []
+# Dekodiertabelle je Block aus READ_PLAN (decoder.BlockDecoder), wird von init() übernommen
+BLOCK_DECODERS: list = []
+
 
 # --------------------------------------------------------------------
 # Hilfsfunktionen zur Klassifizierung der Eintitäten aus ENTITIES_DICT
@@ -520,45 +607,40 @@ def get_entity_webregler_id(props: Dict[str, Any]) -> str | None:
     return props.get("WEB_ID")
 
 
+def get_entity_poll(props: Dict[str, Any]) -> str:
+    return props.get("POLL", C_POLL_DEFAULT)
+
+
+def is_entity_boost(props: Dict[str, Any]) -> bool:
+    return bool(props.get("BOOST"))
+
+
+def get_entity_option(props: Dict[str, Any]) -> str | None:
+    return props.get("OPTION")
+
+
+def get_entity_aggregation(props: Dict[str, Any]) -> Dict[str, Any] | None:
+    """Parameter für aggregator.EntityAggregator, None ohne DEADBAND/MIN_INTERVAL/WINDOW."""
+    if not any(key in props for key in ("DEADBAND", "MIN_INTERVAL", "WINDOW")):
+        return None
+    return {
+        "deadband": props.get("DEADBAND", 0.0),
+        "min_interval": props.get("MIN_INTERVAL", 0.0),
+        "window": props.get("WINDOW", 0.0),
+        "agg": props.get("AGG", C_AGG_MEAN),
+    }
+
+
 # --------------------------------------------------------------------------------
 # Hilfsfunktionen zur Erstellen der aus ENTITIES_DICT abgeleiteten Datenstrukturen
 # --------------------------------------------------------------------------------
 
 
-def _classify_register(props: Dict[str, Any]) -> int | None:
-    global \
-        C_MIN_INPUT_REGISTER, \
-        C_MAX_INPUT_REGISTER, \
-        C_MIN_HOLDING_REGISTER, \
-        C_MAX_HOLDING_REGISTER, \
-        C_MIN_COILS, \
-        C_MAX_COILS, \
-        C_MIN_DISCRETE_INPUTS, \
-        C_MAX_DISCRETE_INPUTS
-
-    reg_type = get_entity_type(props)
+def _classify_register(props: Dict[str, Any]) -> type | None:
+    """Klasse der Entitätsbeschreibung; None für Entitäten ohne Register oder Datentyp."""
     reg_from, dt = get_entity_reg(props)
     if reg_from is None or dt is None:
         return None
-    if dt == ModbusTcpClient.DATATYPE.BITS:
-        sizeofdt = 1
-    else:
-        sizeofdt = dt.value[1]
-    reg_to = reg_from + sizeofdt - 1
-
-    match reg_type:
-        case thismodule.C_REG_TYPE_DISCRETE_INPUTS:
-            C_MIN_DISCRETE_INPUTS = min(reg_from, C_MIN_DISCRETE_INPUTS)
-            C_MAX_DISCRETE_INPUTS = max(reg_to, C_MAX_DISCRETE_INPUTS)
-        case thismodule.C_REG_TYPE_COILS:
-            C_MIN_COILS = min(reg_from, C_MIN_COILS)
-            C_MAX_COILS = max(reg_to, C_MAX_COILS)
-        case thismodule.C_REG_TYPE_INPUT_REGISTERS:
-            C_MIN_INPUT_REGISTER = min(reg_from, C_MIN_INPUT_REGISTER)
-            C_MAX_INPUT_REGISTER = max(reg_to, C_MAX_INPUT_REGISTER)
-        case thismodule.C_REG_TYPE_HOLDING_REGISTERS:
-            C_MIN_HOLDING_REGISTER = min(reg_from, C_MIN_HOLDING_REGISTER)
-            C_MAX_HOLDING_REGISTER = max(reg_to, C_MAX_HOLDING_REGISTER)
 
     if is_entity_readonly(props):
         if is_entity_switch(props):
@@ -668,29 +750,50 @@ def _unit_mapping(
 
 
 _initialized = False
+_init_lock = threading.Lock()
+# Herkunft der geladenen Registerkarte (regmap.RegisterMap.info), für Diagnose-Daten
+REGISTER_MAP_INFO: Dict[str, Any] = {}
 
 
-def init():
-    global \
-        _initialized, \
-        BINARYSENSOR_TYPES, \
-        SENSOR_TYPES, \
-        SELECT_TYPES, \
-        CLIMATE_TYPES, \
-        NUMBER_TYPES, \
-        BINARY_TYPES
-    if _initialized:
-        return
-    _LOGGER.info(
+def init(config_dir: str | None = None):
+    """
+    Registerkarte laden (ENTITIES_DICT) und daraus Entitätsbeschreibungen (*_TYPES), Leseplan
+    (READ_PLAN) und Dekodiertabelle (BLOCK_DECODERS) erzeugen.
+
+    Wird nicht beim Import ausgeführt, sondern beim ersten async_setup_entry (im Executor, liest
+    Dateien) und gilt dann für den ganzen Prozess. Mit config_dir wird eine eigene Karte im
+    Konfigurationsverzeichnis berücksichtigt und das Kompilat unter .storage genutzt.
+    Die Container werden an Ort und Stelle befüllt, damit per `from .const import READ_PLAN`
+    importierte Namen gültig bleiben.
+    """
+    with _init_lock:
+        if not _initialized:
+            _init(config_dir)
+
+
+def _init(config_dir: str | None) -> None:
+    global _initialized
+    from .regmap import load_register_map
+
+    register_map = load_register_map(config_dir)
+    ENTITIES_DICT.clear()
+    ENTITIES_DICT.update(register_map.entities)
+    REGISTER_MAP_INFO.clear()
+    REGISTER_MAP_INFO.update(register_map.info)
+    _LOGGER.debug("Registerkarte: %s", REGISTER_MAP_INFO)
+    _LOGGER.debug(
         "****************************************  initalizing ***************************************"
     )
 
-    thismodule.BINARYSENSOR_TYPES = {}
-    thismodule.SENSOR_TYPES = {}
-    thismodule.SELECT_TYPES = {}
-    thismodule.CLIMATE_TYPES = {}
-    thismodule.NUMBER_TYPES = {}
-    thismodule.BINARY_TYPES = {}
+    for types in (
+        BINARYSENSOR_TYPES,
+        SENSOR_TYPES,
+        SELECT_TYPES,
+        CLIMATE_TYPES,
+        NUMBER_TYPES,
+        BINARY_TYPES,
+    ):
+        types.clear()
     ha_entities = []
 
     for c_key, props in ENTITIES_DICT.items():
@@ -708,7 +811,7 @@ def init():
             match registerclass:
                 case thismodule.MySensorEntityDescription:
                     unit, device_class, state_class = _unit_mapping(get_entity_unit(props))
-                    _LOGGER.debug(f"Sensor {entity_key}: {name}, Einheit {unit}")
+                    _LOGGER.debug("Sensor %s: %s, Einheit %s", entity_key, name, unit)
                     SENSOR_TYPES[entity_key] = registerclass(
                         name=name,
                         key=entity_key,
@@ -719,7 +822,7 @@ def init():
                     )
 
                 case thismodule.MyBinarySensorEntityDescription:
-                    _LOGGER.debug(f"Binär-Sensor {entity_key}: {name}")
+                    _LOGGER.debug("Binär-Sensor %s: %s", entity_key, name)
                     BINARYSENSOR_TYPES[entity_key] = registerclass(
                         name=name,
                         key=entity_key,
@@ -734,7 +837,8 @@ def init():
                     hvac_modes=get_entity_hvac_modes(props)
                     temperature_unit=get_entity_unit(props)
                     _LOGGER.debug(
-                        f"Temperatur-Stellwert {entity_key}: {name}, {min_value}-{max_value}{temperature_unit} in {step}-er Schritten"
+                        "Temperatur-Stellwert %s: %s, %s-%s%s in %s-er Schritten",
+                        entity_key, name, min_value, max_value, temperature_unit, step,
                     )
                     CLIMATE_TYPES[entity_key] = registerclass(
                         name=name,
@@ -757,7 +861,8 @@ def init():
                     step=get_entity_step(props)
                     unit_of_measurement=get_entity_unit(props)
                     _LOGGER.debug(
-                        f"Numerischer Stellwert {entity_key}: {name}, {min_value}-{max_value}{unit_of_measurement} in {step}-er Schritten"
+                        "Numerischer Stellwert %s: %s, %s-%s%s in %s-er Schritten",
+                        entity_key, name, min_value, max_value, unit_of_measurement, step,
                     )
                     NUMBER_TYPES[entity_key] = registerclass(
                         name=name,
@@ -773,7 +878,7 @@ def init():
 
                 case thismodule.MyBinaryEntityDescription:
                     #key = f"{C_PREFIX_SWITCH}_{entity_key}"
-                    _LOGGER.debug(f"Schalter {entity_key}: {name}")
+                    _LOGGER.debug("Schalter %s: %s", entity_key, name)
                     BINARY_TYPES[entity_key] = registerclass(
                         name=name,
                         key=entity_key,
@@ -784,7 +889,8 @@ def init():
                     #key = f"{C_PREFIX_SELECT}_{entity_key}"
                     values, default = get_entity_select_values_and_default(props)
                     _LOGGER.debug(
-                        f"Auswahl-Entität {entity_key}: {name}, Werte-Bereich: {values}, Default: {default}"
+                        "Auswahl-Entität %s: %s, Werte-Bereich: %s, Default: %s",
+                        entity_key, name, values, default,
                     )
                     SELECT_TYPES[entity_key] = registerclass(
                         name=name,
@@ -795,31 +901,48 @@ def init():
                     )
 
                 case _:
-                    _LOGGER.warning(f"Unbekannter Entitätstyp {entity_key}: {props}")
-                    print(f"Sensor konnte nicht zugeordnet werden: {entity_key}/{name}")
+                    _LOGGER.warning("Unbekannter Entitätstyp %s (%s): %s", entity_key, name, props)
         else:
-            _LOGGER.debug(f"Hand-Aktiv-Schalter {entity_key} wird nur intern genutzt und nicht in HA bereitgestellt.")
+            _LOGGER.debug("Hand-Aktiv-Schalter %s wird nur intern genutzt und nicht in HA bereitgestellt.", entity_key)
+
+    READ_PLAN[:] = register_map.plan
+    BLOCK_DECODERS[:] = register_map.decoders
 
     _initialized = True
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        # Adressbereich je Registerart aus dem Leseplan: (erste, letzte Adresse)
+        ranges: Dict[int, tuple[int, int]] = {}
+        for block in READ_PLAN:
+            first, last = ranges.get(block.reg_type, (block.address, block.end))
+            ranges[block.reg_type] = (min(first, block.address), max(last, block.end))
+        no_range = (None, None)
+        _LOGGER.debug(
+            "Status-Register (r/o) von %s bis %s",
+            *ranges.get(C_REG_TYPE_INPUT_REGISTERS, no_range),
+        )
+        _LOGGER.debug(
+            "Discrete Inputs-Register (r/o) von %s bis %s",
+            *ranges.get(C_REG_TYPE_DISCRETE_INPUTS, no_range),
+        )
+        _LOGGER.debug("- %s Sensoren", len(SENSOR_TYPES))
+        _LOGGER.debug("- %s Binär-Sensoren", len(BINARYSENSOR_TYPES))
+        _LOGGER.debug(
+            "Holding-Register (r/w) von %s bis %s",
+            *ranges.get(C_REG_TYPE_HOLDING_REGISTERS, no_range),
+        )
+        _LOGGER.debug("Coils (r/w) von %s bis %s", *ranges.get(C_REG_TYPE_COILS, no_range))
+        _LOGGER.debug("- %s Auswahl-Entitäten", len(SELECT_TYPES))
+        _LOGGER.debug("- %s Schalter", len(BINARY_TYPES))
+        _LOGGER.debug("- %s Temperatur-Stellwerte", len(CLIMATE_TYPES))
+        _LOGGER.debug("- %s Numerische Stellwerte", len(NUMBER_TYPES))
+        for block in READ_PLAN:
+            _LOGGER.debug(
+                "Leseblock Typ %s: %s bis %s (%s Entitäten)",
+                block.reg_type,
+                block.address,
+                block.end,
+                len(block.keys),
+            )
     _LOGGER.debug(
-        f"Status-Register (r/o) von {C_MIN_INPUT_REGISTER} bis {C_MAX_INPUT_REGISTER}"
-    )
-    _LOGGER.debug(
-        f"Discrete Inputs-Register (r/o) von {C_MIN_DISCRETE_INPUTS} bis {C_MAX_DISCRETE_INPUTS}"
-    )
-    _LOGGER.debug(f"- {len(SENSOR_TYPES)} Sensoren")
-    _LOGGER.debug(f"- {len(BINARYSENSOR_TYPES)} Binär-Sensoren")
-    _LOGGER.debug(
-        f"Holding-Register (r/w) von {C_MIN_HOLDING_REGISTER} bis {C_MAX_HOLDING_REGISTER}"
-    )
-    _LOGGER.debug(f"Coils (r/w) von {C_MIN_COILS} bis {C_MAX_COILS}")
-    _LOGGER.debug(f"- {len(SELECT_TYPES)} Auswahl-Entitäten")
-    _LOGGER.debug(f"- {len(BINARY_TYPES)} Schalter")
-    _LOGGER.debug(f"- {len(CLIMATE_TYPES)} Temperatur-Stellwerte")
-    _LOGGER.debug(f"- {len(NUMBER_TYPES)} Numerische Stellwerte")
-    _LOGGER.info(
         "****************************************  initalized ****************************************"
     )
-
-
-init()
@@ -0,0 +1,142 @@
+"""Zeitsteuerung der Modbus-Abfragen über einen DataUpdateCoordinator mit adaptivem Intervall."""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Dict
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    DOMAIN,
+    C_POLL_TARGET_LOAD,
+    C_POLL_MAX_STRETCH,
+    C_POLL_RECOVER_FACTOR,
+    C_BOOST_INTERVAL,
+)
+
+if TYPE_CHECKING:
+    from . import MyModbusHub
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HeliothermCoordinator(DataUpdateCoordinator[bool]):
+    """
+    Löst die Abfragezyklen des Hubs aus.
+
+    - Der nächste Zyklus wird erst nach Ende des vorherigen geplant; ein Zyklus, der startet,
+      während noch einer läuft, wird übersprungen
+    - Die Dauer jedes Zyklus wird gemessen; antwortet die Wärmepumpe langsam, wird das Intervall
+      gestreckt (bis C_POLL_MAX_STRETCH * scan_interval), danach schrittweise wieder verkürzt
+    - Boost (hub.boost_active): zwischen den regulären Zyklen werden nur die schnellen Blöcke im
+      Abstand C_BOOST_INTERVAL gelesen (mit derselben Streckung wie das reguläre Intervall);
+      ein angeforderter Trace- oder On-Demand-Zyklus läuft auch im Boost sofort vollständig
+    - data: True, wenn im Zyklus Register gelesen wurden
+    """
+
+    def __init__(self, hass: HomeAssistant, hub: MyModbusHub, scan_interval: timedelta):
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} {hub.name}",
+            update_interval=scan_interval,
+        )
+        self._hub = hub
+        self._base_interval = scan_interval.total_seconds()
+        self._interval = self._base_interval
+        self._running = False
+        # Startzeit (monotonic) des nächsten regulären Zyklus
+        self._next_regular = 0.0
+
+        self.cycle_count = 0
+        self.skipped_cycles = 0
+        self.last_cycle_duration = 0.0
+        self.max_cycle_duration = 0.0
+
+    @property
+    def interval(self) -> float:
+        """Aktuelles, ggf. gestrecktes Abfrageintervall in Sekunden."""
+        return self._interval
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Zykluszeiten und aktuelles Abfrageintervall."""
+        return {
+            "scan_interval": self._base_interval,
+            "current_interval": round(self._interval, 3),
+            "cycle_count": self.cycle_count,
+            "skipped_cycles": self.skipped_cycles,
+            "boost_active": self._hub.boost_active,
+            "boost_count": self._hub.boost_count,
+            "last_cycle_duration": round(self.last_cycle_duration, 3),
+            "max_cycle_duration": round(self.max_cycle_duration, 3),
+        }
+
+    async def _async_update_data(self) -> bool:
+        """Einen Abfragezyklus des Hubs ausführen."""
+        if self._running:
+            self.skipped_cycles += 1
+            _LOGGER.debug("Abfragezyklus übersprungen, vorheriger Zyklus läuft noch.")
+            return False
+
+        self._running = True
+        start = time.monotonic()
+        # Boost-Zwischenzyklus, solange der nächste reguläre Zyklus noch nicht fällig ist und
+        # kein vollständiger Zyklus angefordert wurde (trace_cycle, refresh_on_demand)
+        boost_only = (
+            self._hub.boost_active
+            and start < self._next_regular
+            and not self._hub.full_cycle_requested
+        )
+        try:
+            result = await self._hub.async_poll_cycle(boost_only)
+        finally:
+            self._running = False
+            if not boost_only:
+                self._adapt_interval(time.monotonic() - start)
+                self._next_regular = start + self._interval
+            self._schedule_next()
+
+        if result is None:
+            raise UpdateFailed("Modbus-Abfrage fehlgeschlagen")
+        return result
+
+    def _adapt_interval(self, duration: float) -> None:
+        """Intervall an die gemessene Zyklusdauer anpassen."""
+        self.cycle_count += 1
+        self.last_cycle_duration = duration
+        self.max_cycle_duration = max(self.max_cycle_duration, duration)
+
+        target = min(
+            self._base_interval * C_POLL_MAX_STRETCH,
+            max(self._base_interval, duration / C_POLL_TARGET_LOAD),
+        )
+        if target > self._interval:
+            # langsame Antwort: sofort strecken
+            interval = target
+        else:
+            # Erholung: schrittweise zurück zum Basisintervall
+            interval = max(target, self._interval * C_POLL_RECOVER_FACTOR)
+
+        if interval != self._interval:
+            _LOGGER.debug(
+                "Zyklus dauerte %.2f s, Abfrageintervall %.1f s -> %.1f s",
+                duration,
+                self._interval,
+                interval,
+            )
+            self._interval = interval
+
+    def _schedule_next(self) -> None:
+        """Abstand bis zum nächsten Zyklus: Boost-Intervall oder Rest bis zum regulären Zyklus."""
+        remaining = max(0.0, self._next_regular - time.monotonic())
+        if self._hub.boost_active:
+            boost = C_BOOST_INTERVAL * self._interval / self._base_interval
+            interval = min(boost, remaining) if remaining else boost
+        else:
+            interval = remaining or self._interval
+        self.update_interval = timedelta(seconds=interval)
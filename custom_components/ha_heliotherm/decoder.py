@@ -0,0 +1,191 @@
+"""Vorkompilierte Dekodiertabelle: Rohwerte der Leseblöcke -> Werte für self.data des Hubs."""
+
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .const import (
+    C_DT_BITS,
+    C_DT_INT16,
+    C_DT_UINT16,
+    C_DT_INT32,
+    C_DT_UINT32,
+    get_entity_reg,
+    get_entity_factor,
+    get_entity_min,
+    get_entity_max,
+    get_entity_select,
+    get_entity_switch,
+    is_entity_readonly,
+    is_entity_switch,
+    is_entity_select,
+    is_entity_climate,
+)
+from .planner import BIT_TYPES
+
+# Dekodierart je Entität
+DECODE_NUMERIC = 0
+DECODE_SWITCH = 1
+DECODE_SELECT = 2
+DECODE_CLIMATE = 3
+
+# Sentinel der Wärmepumpe für 'ungültig'
+INVALID_RAW = -500
+
+# struct-Formatzeichen und Länge in Registern je Modbus-Datentyp
+# (BITS: direkter Zugriff auf die Bit-Liste)
+STRUCT_FORMATS = {
+    C_DT_INT16: ("h", 1),
+    C_DT_UINT16: ("H", 1),
+    C_DT_INT32: ("i", 2),
+    C_DT_UINT32: ("I", 2),
+}
+
+_SWAP_BYTES = sys.byteorder == "little"
+
+
+class DecoderEntry:
+    """Eine Entität mit allen zum Dekodieren nötigen, vorab berechneten Angaben."""
+
+    __slots__ = (
+        "key",
+        "block",
+        "offset",
+        "fmt",
+        "size",
+        "factor",
+        "kind",
+        "off_value",
+        "values",
+        "min_value",
+        "max_value",
+    )
+
+    def __init__(self, key: str, block: int, offset: int, props: Dict[str, Any]):
+        _, dt = get_entity_reg(props)
+        self.key = key
+        self.block = block
+        self.offset = offset
+        self.fmt, self.size = STRUCT_FORMATS.get(dt, (None, 1))
+        self.factor = get_entity_factor(props) or 1.0
+        self.min_value = get_entity_min(props)
+        self.max_value = get_entity_max(props)
+        self.off_value = (get_entity_switch(props) or {}).get("off", 0)
+        self.values = get_entity_select(props) or {}
+
+        if is_entity_switch(props):
+            self.kind = DECODE_SWITCH
+        elif is_entity_select(props):
+            self.kind = DECODE_SELECT
+        elif is_entity_climate(props) and not is_entity_readonly(props):
+            self.kind = DECODE_CLIMATE
+        else:
+            self.kind = DECODE_NUMERIC
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        """Alle Felder in der Reihenfolge von __slots__ (für das Kompilat der Registerkarte)."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    @classmethod
+    def from_tuple(cls, fields: Sequence[Any]) -> DecoderEntry:
+        """Gegenstück zu as_tuple(), ohne die Entität erneut zu klassifizieren."""
+        entry = cls.__new__(cls)
+        for name, value in zip(cls.__slots__, fields):
+            setattr(entry, name, value)
+        return entry
+
+    def decode(self, raw: Any) -> Any:
+        """Rohwert -> Wert wie vom Hub in self.data abgelegt."""
+        kind = self.kind
+        if kind == DECODE_NUMERIC:
+            return None if raw == INVALID_RAW else float(raw * self.factor)
+        if kind == DECODE_SWITCH:
+            return "off" if raw == self.off_value else "on"
+        if kind == DECODE_SELECT:
+            return self.values.get(raw, f"Ungültiger Wert: {raw}")
+        return {
+            "temperature": None if raw == INVALID_RAW else float(raw * self.factor),
+            "target_temp_low": self.min_value,
+            "target_temp_high": self.max_value,
+        }
+
+
+class BlockDecoder:
+    """
+    Dekodiert einen ganzen Leseblock in einem Schritt.
+
+    Register-Blöcke werden über ein einziges, vorkompiliertes struct.Struct (Big-Endian, nicht
+    belegte Register als Füllbytes) entpackt; jeder Entitätswert ist danach ein Indexzugriff.
+    Bit-Blöcke (Coils, Discrete Inputs) werden direkt über den Offset indiziert.
+    """
+
+    __slots__ = ("entries", "is_bits", "struct", "count")
+
+    def __init__(self, entries: Sequence[DecoderEntry], count: int, is_bits: bool):
+        self.entries = tuple(sorted(entries, key=lambda e: e.offset))
+        self.is_bits = is_bits
+        self.count = count
+        self.struct = None if is_bits else self._compile_struct()
+
+    def _compile_struct(self) -> struct.Struct | None:
+        """Format für den ganzen Block; None, falls sich Entitäten überlappen."""
+        fmt = [">"]
+        pos = 0
+        for entry in self.entries:
+            if entry.fmt is None or entry.offset < pos:
+                return None
+            if entry.offset > pos:
+                fmt.append(f"{(entry.offset - pos) * 2}x")
+            fmt.append(entry.fmt)
+            pos = entry.offset + entry.size
+        if self.count > pos:
+            fmt.append(f"{(self.count - pos) * 2}x")
+        return struct.Struct("".join(fmt))
+
+    def raw_values(self, values: Sequence[int | bool]) -> Sequence[Any]:
+        """Rohwerte aller Entitäten (in der Reihenfolge von self.entries)."""
+        if self.is_bits:
+            return [values[e.offset] for e in self.entries]
+        buf = registers_to_bytes(values)
+        if self.struct is not None:
+            return self.struct.unpack(buf)
+        return [
+            struct.unpack_from(f">{e.fmt}", buf, e.offset * 2)[0] for e in self.entries
+        ]
+
+    def decode(self, values: Sequence[int | bool]) -> List[Tuple[str, Any]]:
+        """Alle Entitäten des Blocks dekodieren -> [(key, value), ...]."""
+        out = []
+        append = out.append
+        for entry, raw in zip(self.entries, self.raw_values(values)):
+            if entry.kind == DECODE_NUMERIC:
+                append((entry.key, None if raw == INVALID_RAW else float(raw * entry.factor)))
+            else:
+                append((entry.key, entry.decode(raw)))
+        return out
+
+
+def compile_decoders(
+    entities: Dict[str, Dict[str, Any]], plan: Sequence[Any]
+) -> List[BlockDecoder]:
+    """Block-Dekodierer je Block aus dem Leseplan (gleicher Index wie plan)."""
+    table: List[BlockDecoder] = []
+    for block_idx, block in enumerate(plan):
+        entries = []
+        for entity_key in block.keys:
+            props = entities[entity_key]
+            reg, _ = get_entity_reg(props)
+            entries.append(DecoderEntry(entity_key, block_idx, reg - block.address, props))
+        table.append(BlockDecoder(entries, block.count, block.reg_type in BIT_TYPES))
+    return table
+
+
+def registers_to_bytes(registers: Sequence[int]) -> bytes:
+    """16-Bit-Register eines Blocks als Big-Endian-Bytepuffer (ein C-Aufruf über array('H'))."""
+    words = array("H", registers)
+    if _SWAP_BYTES:
+        words.byteswap()
+    return words.tobytes()
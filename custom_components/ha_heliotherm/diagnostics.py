@@ -0,0 +1,35 @@
+"""Diagnose-Daten für ha_heliotherm (Verbindungs-, Zyklus-, Schreibzähler und Laufzeit-Metriken des Hubs)."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, REGISTER_MAP_INFO
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Diagnose-Daten eines Config-Entries."""
+    hub = hass.data[DOMAIN][entry.data[CONF_NAME]]["hub"]
+    return {
+        "register_map": dict(REGISTER_MAP_INFO),
+        # Geräteprofil (vorhandene Optionen, nicht gelieferte Entitäten), None wenn nicht ermittelt
+        "profile": hub.profile,
+        # Ergebnis der Register-Suche, None solange keine abgeschlossen ist
+        "discovery": hub.discovery,
+        "connection": hub.connection_stats,
+        "polling": hub.cycle_stats,
+        "writes": hub.write_stats,
+        "metrics": hub.metrics_stats,
+        "history": hub.history_stats,
+        "aggregation": hub.aggregation_stats,
+        # geteilte Blöcke und Entitäten in Quarantäne (abgelehnte Adressen)
+        "quarantine": hub.quarantine_stats,
+        # letzter Trace-Zyklus (Dienst ha_heliotherm.trace_cycle), None wenn keiner angefordert wurde
+        "trace": hub.last_trace,
+    }
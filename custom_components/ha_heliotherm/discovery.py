@@ -0,0 +1,193 @@
+"""Register-Suche: welche Adressen außerhalb der Registerkarte antworten und wie stark ihre Werte schwanken."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Sequence, Tuple
+
+from .const import (
+    C_DISCOVERY_BLOCK,
+    C_DISCOVERY_LIMITS,
+    C_DISCOVERY_MAX_REQUESTS,
+    C_DISCOVERY_REQUEST_DELAY,
+    REGISTER_TYPES,
+    get_entity_type,
+)
+from .planner import entity_span
+
+# Lesefunktion (Registerart, Adresse, Anzahl) -> Werte; None bei Fehlerantwort des Geräts,
+# ModbusException bei IO-/Verbindungsfehlern
+ReadFunc = Callable[[int, int, int], Awaitable[Sequence[int] | None]]
+
+# Registerart -> Name wie in registers.yaml (Schlüssel im Ergebnis, JSON-tauglich)
+_REGISTER_TYPE_NAMES = {reg_type: name for name, reg_type in REGISTER_TYPES.items()}
+
+
+def candidate_ranges(
+    entities: Dict[str, Dict[str, Any]], limits: Mapping[int, int] = C_DISCOVERY_LIMITS
+) -> Dict[int, List[Tuple[int, int]]]:
+    """
+    Zu durchsuchende Bereiche je Registerart: alle Adressen unterhalb der Obergrenze, die keine
+    Entität der Registerkarte belegt, als [(erste Adresse, letzte Adresse + 1), ...].
+    """
+    covered: Dict[int, set[int]] = {reg_type: set() for reg_type in limits}
+    for props in entities.values():
+        span = entity_span(props)
+        reg_type = get_entity_type(props)
+        if span is not None and reg_type in covered:
+            covered[reg_type].update(range(span[0], span[1] + 1))
+
+    ranges: Dict[int, List[Tuple[int, int]]] = {}
+    for reg_type, limit in limits.items():
+        runs = []
+        start = None
+        for address in range(limit + 1):
+            free = address < limit and address not in covered[reg_type]
+            if free and start is None:
+                start = address
+            elif not free and start is not None:
+                runs.append((start, address))
+                start = None
+        ranges[reg_type] = runs
+    return ranges
+
+
+class RegisterScanner:
+    """
+    Durchsucht Adressbereiche mit adaptiver Blockgröße.
+
+    Lehnt das Gerät einen Block mit einer Fehlerantwort ab (z.B. Illegal Data Address, sobald eine
+    einzige Adresse des Blocks nicht belegt ist), wird er halbiert, bis die Grenze zwischen
+    belegten und nicht belegten Adressen auf die Adresse genau feststeht; nach jedem Erfolg
+    verdoppelt sich die Blockgröße wieder bis max_block. Zwischen zwei Requests liegen mindestens
+    request_delay Sekunden, nach max_requests Requests endet die Suche (truncated).
+    """
+
+    def __init__(
+        self,
+        read: ReadFunc,
+        request_delay: float = C_DISCOVERY_REQUEST_DELAY,
+        max_block: int = C_DISCOVERY_BLOCK,
+        max_requests: int = C_DISCOVERY_MAX_REQUESTS,
+    ):
+        self._read = read
+        self._request_delay = request_delay
+        self._max_block = max_block
+        self._max_requests = max_requests
+        self._last_request: float | None = None
+        self.requests = 0
+        self.truncated = False
+
+    async def _request(self, reg_type: int, address: int, count: int) -> Sequence[int] | None:
+        if self._last_request is not None:
+            wait = self._last_request + self._request_delay - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        self.requests += 1
+        try:
+            return await self._read(reg_type, address, count)
+        finally:
+            self._last_request = time.monotonic()
+
+    def _budget_left(self) -> bool:
+        if self.requests < self._max_requests:
+            return True
+        self.truncated = True
+        return False
+
+    async def sweep(self, reg_type: int, start: int, end: int) -> Dict[int, int]:
+        """Antwortende Adressen in [start, end) -> gelesener Wert."""
+        found: Dict[int, int] = {}
+        size = self._max_block
+        address = start
+        while address < end and self._budget_left():
+            count = min(size, end - address)
+            values = await self._request(reg_type, address, count)
+            if values is not None:
+                found.update(zip(range(address, address + count), values))
+                address += count
+                size = min(size * 2, self._max_block)
+            elif count > 1:
+                size = count // 2
+            else:
+                # einzelne Adresse abgelehnt -> nicht belegt
+                address += 1
+        return found
+
+    async def sample(self, reg_type: int, addresses: Sequence[int]) -> Dict[int, int]:
+        """Bekannt antwortende Adressen erneut lesen (zusammenhängende Adressen je Request)."""
+        values: Dict[int, int] = {}
+        for first, count in _runs(sorted(addresses), self._max_block):
+            if not self._budget_left():
+                break
+            words = await self._request(reg_type, first, count)
+            if words is not None:
+                values.update(zip(range(first, first + count), words))
+        return values
+
+
+def _runs(addresses: Sequence[int], max_count: int) -> List[Tuple[int, int]]:
+    """Sortierte Adressen -> zusammenhängende Läufe [(erste Adresse, Anzahl), ...]."""
+    runs: List[Tuple[int, int]] = []
+    for address in addresses:
+        if runs and runs[-1][0] + runs[-1][1] == address and runs[-1][1] < max_count:
+            runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+        else:
+            runs.append((address, 1))
+    return runs
+
+
+async def discover(
+    read: ReadFunc,
+    ranges: Mapping[int, Sequence[Tuple[int, int]]],
+    samples: int,
+    sample_interval: float,
+    **scanner_kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Bereiche durchsuchen und jede antwortende Adresse insgesamt `samples`-mal lesen (Abstand
+    sample_interval Sekunden). Ergebnis (JSON-tauglich, Rohwerte als 16-Bit-Wörter):
+        {"requests", "duration_s", "truncated", "ranges": {Registerart: [[von, bis), ...]},
+         "registers": {Registerart: [{"address", "min", "max", "distinct", "last"}, ...]}}
+    """
+    scanner = RegisterScanner(read, **scanner_kwargs)
+    start = time.monotonic()
+
+    series: Dict[int, Dict[int, List[int]]] = {}
+    for reg_type, runs in ranges.items():
+        found: Dict[int, int] = {}
+        for first, end in runs:
+            found.update(await scanner.sweep(reg_type, first, end))
+        series[reg_type] = {address: [value] for address, value in found.items()}
+
+    for _ in range(samples - 1):
+        if not any(series.values()) or scanner.truncated:
+            break
+        await asyncio.sleep(sample_interval)
+        for reg_type, values in series.items():
+            for address, value in (await scanner.sample(reg_type, list(values))).items():
+                values[address].append(value)
+
+    return {
+        "requests": scanner.requests,
+        "duration_s": round(time.monotonic() - start, 1),
+        "truncated": scanner.truncated,
+        "ranges": {
+            _REGISTER_TYPE_NAMES[reg_type]: [list(run) for run in runs]
+            for reg_type, runs in ranges.items()
+        },
+        "registers": {
+            _REGISTER_TYPE_NAMES[reg_type]: [
+                {
+                    "address": address,
+                    "min": min(words),
+                    "max": max(words),
+                    "distinct": len(set(words)),
+                    "last": words[-1],
+                }
+                for address, words in sorted(values.items())
+            ]
+            for reg_type, values in series.items()
+        },
+    }
@@ -18,8 +18,7 @@ from homeassistant.components.sensor import SensorDeviceClass
 
 thismodule = sys.modules[__name__]
 _LOGGER = logging.getLogger(__name__)
-_LOGGER.setLevel(logging.DEBUG)
-_LOGGER.info(f"{thismodule} loaded.")
+_LOGGER.debug("%s loaded.", thismodule)
 
 
 T = TypeVar("T", bound=Entity)
@@ -52,14 +51,20 @@ class HubBackedEntity(Entity):
         self._attr_suggested_object_id = base
 
     async def async_added_to_hass(self) -> None:
-        self._hub.async_add_my_modbus_sensor(self._on_hub_update)
+        key = self.entity_description.key
+        self._hub.async_add_my_modbus_sensor(self._on_hub_update, key)
+        # Der Hub meldet nur Änderungen -> bereits gelesenen Wert sofort übernehmen
+        if key in self._hub.data:
+            self._on_hub_update()
 
     async def async_will_remove_from_hass(self) -> None:
-        self._hub.async_remove_my_modbus_sensor(self._on_hub_update)
+        self._hub.async_remove_my_modbus_sensor(
+            self._on_hub_update, self.entity_description.key
+        )
 
     @callback
     def _on_hub_update(self) -> None:
-        payload = self._hub.data.get(self.entity_description.key)
+        payload = self._hub.entity_value(self.entity_description.key)
 
         try:
             self._apply_hub_payload(payload)
@@ -103,8 +108,11 @@ async def setup_platform_from_types(
         "manufacturer": ATTR_MANUFACTURER,
     }
 
+    # Nur Entitäten, die das Gerät laut Geräteprofil liefert
     entities: List[T] = [
-        entity_cls(hub_name, hub, device_info, desc) for desc in types_dict.values()
+        entity_cls(hub_name, hub, device_info, desc)
+        for desc in types_dict.values()
+        if hub.has_entity(desc.key)
     ]
     if not entities:
         _LOGGER.debug("No entities for %s on hub %s", entity_cls.__name__, hub_name)
@@ -0,0 +1,150 @@
+"""Verlauf der gelesenen Rohwerte: Ringpuffer je Registerart mit XOR-Deltas zwischen den Lesezugriffen."""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .const import get_entity_type
+from .planner import entity_span
+
+# Gemeinsames leeres Delta für Lesezugriffe ohne Änderung (keine Allokation je Zyklus)
+_EMPTY = array("H")
+
+
+class RegisterHistory:
+    """
+    Rohwerte einer Registerart (Adressen first..last) und die letzten `capacity` Lesezugriffe.
+
+    Jeder Eintrag speichert nur die geänderten Offsets und deren XOR zum vorherigen Wert
+    (array('H')); ein Lesezugriff ohne Änderung kostet nur den Zeitstempel. Fällt der älteste
+    Eintrag aus dem Ring, wird er in den Basiszustand übernommen, sodass jeder Wert im
+    Fenster aus Basis + Deltas rekonstruiert werden kann. Bits (Coils, Discrete Inputs) werden
+    als 0/1 gespeichert.
+    """
+
+    def __init__(self, first: int, last: int, capacity: int):
+        size = last - first + 1
+        self.first = first
+        self.last = last
+        self.capacity = capacity
+        # aktueller Zustand und Zustand vor dem ältesten Eintrag
+        self._current = array("H", bytes(2 * size))
+        self._known = bytearray(size)
+        self._base = array("H", bytes(2 * size))
+        self._base_known = bytearray(size)
+        # Zeitstempel des letzten Lesezugriffs je Adresse (0.0: noch nicht gelesen)
+        self._read_at = array("d", bytes(8 * size))
+        # (Zeitstempel, geänderte Offsets, XOR-Werte)
+        self._entries: deque[Tuple[float, array, array]] = deque()
+
+    def record(self, address: int, values: Sequence[int | bool], timestamp: float) -> bool:
+        """Gelesene Werte übernehmen; True, wenn sich mindestens ein Wert geändert hat."""
+        start = address - self.first
+        end = start + len(values)
+        if start < 0 or address + len(values) - 1 > self.last:
+            return True
+
+        self._read_at[start:end] = array("d", [timestamp]) * (end - start)
+        current = self._current
+        known = self._known
+        new = array("H", [int(value) & 0xFFFF for value in values])
+        if current[start:end] == new and known.find(0, start, end) < 0:
+            offsets = xors = _EMPTY
+        else:
+            offsets = array("H")
+            xors = array("H")
+            for idx, word in enumerate(new, start):
+                old = current[idx]
+                if old != word or not known[idx]:
+                    offsets.append(idx)
+                    xors.append(old ^ word)
+                    current[idx] = word
+                    known[idx] = 1
+
+        entries = self._entries
+        if len(entries) >= self.capacity:
+            self._evict(entries.popleft())
+        entries.append((timestamp, offsets, xors))
+        return offsets is not _EMPTY
+
+    def _evict(self, entry: Tuple[float, array, array]) -> None:
+        """Ältesten Eintrag in den Basiszustand übernehmen."""
+        _, offsets, xors = entry
+        base = self._base
+        for idx, xor in zip(offsets, xors):
+            base[idx] ^= xor
+            self._base_known[idx] = 1
+
+    def get(self, address: int) -> int | None:
+        """Zuletzt gelesener Rohwert, None wenn die Adresse noch nicht gelesen wurde."""
+        idx = address - self.first
+        if not 0 <= idx < len(self._known) or not self._known[idx]:
+            return None
+        return self._current[idx]
+
+    def read_at(self, address: int) -> float | None:
+        """Zeitstempel des letzten Lesezugriffs auf die Adresse, None wenn noch nicht gelesen."""
+        idx = address - self.first
+        if not 0 <= idx < len(self._known) or not self._known[idx]:
+            return None
+        return self._read_at[idx]
+
+    def series(self, address: int, since: float) -> List[Tuple[float, int]]:
+        """
+        Verlauf einer Adresse ab `since`: [(Zeitstempel, Rohwert), ...].
+        Der erste Eintrag ist der zu Fensterbeginn gültige Wert (Zeitstempel since), danach
+        folgt jede Änderung mit dem Zeitstempel des Lesezugriffs, der sie erkannt hat.
+        """
+        idx = address - self.first
+        if not 0 <= idx < len(self._known):
+            return []
+        value = self._base[idx] if self._base_known[idx] else None
+        start_value = value
+        series: List[Tuple[float, int]] = []
+        for timestamp, offsets, xors in self._entries:
+            if idx not in offsets:
+                continue
+            value = (value or 0) ^ xors[offsets.index(idx)]
+            if timestamp <= since:
+                start_value = value
+            else:
+                series.append((timestamp, value))
+        if start_value is not None:
+            series.insert(0, (since, start_value))
+        return series
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Anzahl Einträge, Zeitraum und ungefährer Speicherbedarf der Deltas."""
+        entries = self._entries
+        changes = sum(len(offsets) for _, offsets, _ in entries)
+        return {
+            "addresses": f"{self.first}-{self.last}",
+            "entries": len(entries),
+            "capacity": self.capacity,
+            "changes": changes,
+            "span_s": round(entries[-1][0] - entries[0][0], 1) if entries else 0.0,
+            "delta_bytes": changes * 4,
+        }
+
+
+def build_histories(
+    entities: Dict[str, Dict[str, Any]], capacity: int
+) -> Dict[int, RegisterHistory]:
+    """Eine RegisterHistory je Registerart über den Adressbereich aller Entitäten."""
+    bounds: Dict[int, List[int]] = {}
+    for props in entities.values():
+        span = entity_span(props)
+        if span is None:
+            continue
+        reg_type = get_entity_type(props)
+        low_high = bounds.setdefault(reg_type, [span[0], span[1]])
+        low_high[0] = min(low_high[0], span[0])
+        low_high[1] = max(low_high[1], span[1])
+    return {
+        reg_type: RegisterHistory(first, last, capacity)
+        for reg_type, (first, last) in bounds.items()
+    }
+
@@ -0,0 +1,161 @@
+"""Laufzeit-Metriken des Hubs: Zähler und Histogramme für Zykluszeit, Block-RTT, Dekodierung und Fehler."""
+
+from __future__ import annotations
+
+import bisect
+from typing import Any, Dict, Tuple
+
+# Bucket-Obergrenzen in Sekunden (1-1,5-2-3-5-7-Raster von 1 µs bis 10 s)
+HISTOGRAM_BOUNDS: Tuple[float, ...] = tuple(
+    bound
+    for bound in (
+        mantissa * 10.0**exponent
+        for exponent in range(-6, 2)
+        for mantissa in (1, 1.5, 2, 3, 5, 7)
+    )
+    if bound <= 10.0
+)
+
+# MBAP-Header (7 Byte) + Funktionscode
+_MBAP_FC_BYTES = 8
+
+# Zähler des Hubs (Reihenfolge = Reihenfolge in den Diagnose-Daten)
+COUNTERS = (
+    "cycles",
+    "requests",
+    "blocks_read",
+    "bytes_sent",
+    "bytes_received",
+    "callbacks",
+    "retries",
+    "timeouts",
+    "read_errors",
+    "write_errors",
+    "block_splits",
+)
+
+
+class Histogram:
+    """
+    Histogramm mit festen, logarithmischen Buckets (Werte in Sekunden).
+    observe() ist O(log n) und legt keine Objekte an; Quantile werden innerhalb des
+    Buckets linear interpoliert (genau genug, um eine schleichende Verschlechterung zu erkennen).
+    """
+
+    __slots__ = ("bounds", "buckets", "count", "total", "min", "max", "last")
+
+    def __init__(self, bounds: Tuple[float, ...] = HISTOGRAM_BOUNDS):
+        self.bounds = bounds
+        # letzter Bucket: Werte oberhalb der größten Grenze
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+        self.last = value
+
+    def quantile(self, q: float) -> float | None:
+        """Näherungswert des Quantils q (0..1), None ohne Messwerte."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for idx, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                lower = self.bounds[idx - 1] if idx else 0.0
+                upper = self.bounds[idx] if idx < len(self.bounds) else self.max
+                value = lower + (upper - lower) * (rank - seen) / n
+                return min(max(value, self.min), self.max)
+            seen += n
+        return self.max
+
+    def as_dict(self, scale: float = 1e3) -> Dict[str, Any]:
+        """Zusammenfassung, Zeiten mit scale umgerechnet (Standard: Millisekunden)."""
+        if not self.count:
+            return {"count": 0}
+
+        def fmt(value: float) -> float:
+            return round(value * scale, 3)
+
+        return {
+            "count": self.count,
+            "last": fmt(self.last),
+            "mean": fmt(self.total / self.count),
+            "min": fmt(self.min),
+            "max": fmt(self.max),
+            "p50": fmt(self.quantile(0.5)),
+            "p95": fmt(self.quantile(0.95)),
+            "p99": fmt(self.quantile(0.99)),
+        }
+
+
+class HubMetrics:
+    """Zähler und Histogramme eines Hubs (eine Unit-ID)."""
+
+    def __init__(self):
+        self.cycle_time = Histogram()
+        self.block_rtt = Histogram()
+        self.decode_time = Histogram()
+        self.write_rtt = Histogram()
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        # Exception-Klasse bzw. "modbus_exception_<code>" -> Anzahl
+        self.errors: Dict[str, int] = {}
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def record_error(self, label: str) -> None:
+        self.errors[label] = self.errors.get(label, 0) + 1
+
+    def record_read(self, is_bits: bool, count: int, rtt: float | None) -> None:
+        """Ein Lese-Request; rtt None: keine gültige Antwort."""
+        sent, received = read_frame_sizes(is_bits, count)
+        self.counters["requests"] += 1
+        self.counters["bytes_sent"] += sent
+        if rtt is not None:
+            self.counters["blocks_read"] += 1
+            self.counters["bytes_received"] += received
+            self.block_rtt.observe(rtt)
+
+    def record_write(self, is_bits: bool, count: int, rtt: float | None) -> None:
+        """Ein Schreib-Request; rtt None: Fehler."""
+        sent, received = write_frame_sizes(is_bits, count)
+        self.counters["requests"] += 1
+        self.counters["bytes_sent"] += sent
+        if rtt is not None:
+            self.counters["bytes_received"] += received
+            self.write_rtt.observe(rtt)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "errors": dict(self.errors),
+            "cycle_time_ms": self.cycle_time.as_dict(),
+            "block_rtt_ms": self.block_rtt.as_dict(),
+            "write_rtt_ms": self.write_rtt.as_dict(),
+            "decode_time_us": self.decode_time.as_dict(scale=1e6),
+        }
+
+
+def read_frame_sizes(is_bits: bool, count: int) -> Tuple[int, int]:
+    """Bytes (Request, Antwort) eines Lesezugriffs über Modbus TCP (FC 1-4)."""
+    data = (count + 7) // 8 if is_bits else 2 * count
+    return _MBAP_FC_BYTES + 4, _MBAP_FC_BYTES + 1 + data
+
+
+def write_frame_sizes(is_bits: bool, count: int) -> Tuple[int, int]:
+    """Bytes (Request, Antwort) eines Schreibzugriffs (FC 5/6 bzw. FC 15/16)."""
+    if count == 1:
+        return _MBAP_FC_BYTES + 4, _MBAP_FC_BYTES + 4
+    data = (count + 7) // 8 if is_bits else 2 * count
+    return _MBAP_FC_BYTES + 5 + data, _MBAP_FC_BYTES + 4
@@ -0,0 +1,186 @@
+"""Modbus-TCP-Lesezugriffe mit mehreren gleichzeitig offenen Transaktionen (Pipelining)."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+from typing import Dict, List, Sequence, Tuple
+
+from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.exceptions import ModbusException
+
+from .const import (
+    C_SPLIT_EXCEPTION_CODES,
+    C_REG_TYPE_INPUT_REGISTERS,
+    C_REG_TYPE_HOLDING_REGISTERS,
+    C_REG_TYPE_COILS,
+    C_REG_TYPE_DISCRETE_INPUTS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Funktionscode je Registerart
+READ_FUNCTION_CODES = {
+    C_REG_TYPE_COILS: 1,
+    C_REG_TYPE_DISCRETE_INPUTS: 2,
+    C_REG_TYPE_HOLDING_REGISTERS: 3,
+    C_REG_TYPE_INPUT_REGISTERS: 4,
+}
+
+# MBAP-Header: Transaktions-ID, Protokoll-ID (0), Länge (Unit-ID + PDU), Unit-ID
+_MBAP = struct.Struct(">HHHB")
+_READ_PDU = struct.Struct(">BHH")
+
+
+class PipelineError(ModbusException):
+    """Pipelining-Zyklus fehlgeschlagen (Timeout, Verbindungsabbruch, Exception-Antwort)."""
+
+
+class PipelineRejectedError(PipelineError):
+    """Das Gerät hat die parallelen Transaktionen protokollwidrig beantwortet."""
+
+
+class _PipelineProtocol(asyncio.Protocol):
+    """
+    Ersetzt während eines Pipelining-Zyklus das Protokoll des pymodbus-Clients am Transport:
+    empfangene Daten gehen an den eigenen StreamReader, ein Verbindungsabbruch zusätzlich an
+    pymodbus, damit der Client die Verbindung als getrennt erkennt.
+    """
+
+    def __init__(self, previous: asyncio.BaseProtocol):
+        self.previous = previous
+        self.reader = asyncio.StreamReader()
+
+    def data_received(self, data: bytes) -> None:
+        self.reader.feed_data(data)
+
+    def eof_received(self) -> None:
+        # Transport wird geschlossen, connection_lost folgt
+        self.reader.feed_eof()
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.reader.feed_eof()
+        self.previous.connection_lost(exc)
+
+
+class ModbusPipeline:
+    """
+    Lesezugriffe mit Pipelining über die bestehende Verbindung des pymodbus-Clients.
+
+    Alle Requests eines Zyklus werden ohne Warten auf die Antworten gesendet und die Antworten
+    über die Transaktions-ID zugeordnet; die Zykluszeit nähert sich damit einer Round-Trip-Zeit.
+    pymodbus serialisiert jede Transaktion, daher wird hier selbst gerahmt (MBAP): für die Dauer
+    des Zyklus übernimmt _PipelineProtocol den Transport des Clients, es bleibt bei einer
+    TCP-Verbindung je Gerät bzw. Gateway. Aufruf nur mit gehaltenem Verbindungs-Lock und
+    verbundenem Client (keine offene pymodbus-Transaktion).
+    Timeout, Verbindungsabbruch und Exception-Antworten (z. B. 6 "busy", 0x0A/0x0B vom Gateway)
+    werden als PipelineError gemeldet, Antworten, die auf fehlende Unterstützung paralleler
+    Transaktionen schließen lassen (unbekannte Transaktions-ID, falsche Unit, ungültiger Rahmen),
+    als PipelineRejectedError. Beides schließt die Verbindung, damit keine verspätete Antwort
+    beim pymodbus-Client ankommt; der Aufrufer liest dann seriell.
+    Lehnt das Gerät nur die Adressen eines Requests ab (C_SPLIT_EXCEPTION_CODES),
+    ist die Transaktion korrekt beantwortet; ihr Ergebnis ist dann None.
+    """
+
+    def __init__(self, client: AsyncModbusTcpClient, timeout: float = 3):
+        self._client = client
+        self._timeout = timeout
+        self._tid = 0
+
+    async def async_read(
+        self, requests: Sequence[Tuple[int, int, int]], unit: int
+    ) -> List[list[int | bool] | None]:
+        """
+        requests: [(Registerart, Adresse, Anzahl), ...]
+        Liefert die Werte je Request in derselben Reihenfolge (Bits bereits auf Anzahl gekürzt),
+        None für Requests, deren Adressen das Gerät ablehnt.
+        """
+        transport = getattr(self._client.ctx, "transport", None)
+        if transport is None or transport.is_closing():
+            raise PipelineError("Pipelining fehlgeschlagen: nicht verbunden")
+        protocol = _PipelineProtocol(transport.get_protocol())
+        transport.set_protocol(protocol)
+        completed = False
+        try:
+            results = await asyncio.wait_for(
+                self._async_transact(transport, protocol.reader, requests, unit),
+                timeout=self._timeout,
+            )
+            completed = True
+            return results
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as exc:
+            raise PipelineError(f"Pipelining fehlgeschlagen: {exc!r}") from exc
+        finally:
+            transport.set_protocol(protocol.previous)
+            if not completed:
+                # noch ausstehende Antworten dürfen nicht beim pymodbus-Client ankommen
+                self._client.close()
+
+    async def _async_transact(
+        self,
+        transport: asyncio.WriteTransport,
+        reader: asyncio.StreamReader,
+        requests: Sequence[Tuple[int, int, int]],
+        unit: int,
+    ) -> List[list[int | bool] | None]:
+        pending: Dict[int, Tuple[int, int, int]] = {}
+        order = []
+        frames = []
+        for reg_type, address, count in requests:
+            tid = self._next_tid()
+            function_code = READ_FUNCTION_CODES[reg_type]
+            pdu = _READ_PDU.pack(function_code, address, count)
+            frames.append(_MBAP.pack(tid, 0, len(pdu) + 1, unit) + pdu)
+            pending[tid] = (reg_type, function_code, count)
+            order.append(tid)
+
+        transport.write(b"".join(frames))
+
+        results: Dict[int, list[int | bool] | None] = {}
+        while pending:
+            header = await reader.readexactly(_MBAP.size)
+            tid, protocol, length, response_unit = _MBAP.unpack(header)
+            # Länge umfasst Unit-ID und PDU, diese mindestens den Funktionscode
+            if length < 2:
+                raise PipelineRejectedError(
+                    f"Ungültige Rahmenlänge {length} (Transaktions-ID {tid})"
+                )
+            body = await reader.readexactly(length - 1)
+            request = pending.pop(tid, None)
+            if protocol != 0 or request is None:
+                raise PipelineRejectedError(f"Unerwartete Antwort (Transaktions-ID {tid})")
+            if response_unit != unit:
+                raise PipelineRejectedError(
+                    f"Antwort von Unit {response_unit} statt {unit} (Transaktions-ID {tid})"
+                )
+            reg_type, function_code, count = request
+            if body[0] != function_code:
+                code = body[1] if len(body) > 1 else None
+                if body[0] == function_code | 0x80 and code in C_SPLIT_EXCEPTION_CODES:
+                    results[tid] = None
+                    continue
+                # Gerät bzw. Gateway (noch) nicht bereit: kein Protokollfehler
+                raise PipelineError(f"Exception-Antwort {code} auf Funktionscode {function_code}")
+            results[tid] = _decode_read_response(reg_type, body, count)
+
+        return [results[tid] for tid in order]
+
+    def _next_tid(self) -> int:
+        self._tid = self._tid % 0xFFFF + 1
+        return self._tid
+
+
+def _decode_read_response(reg_type: int, body: bytes, count: int) -> list[int | bool]:
+    """PDU einer Leseantwort (Funktionscode, Byteanzahl, Daten) -> Werte."""
+    if len(body) < 2 or len(body) - 2 < body[1]:
+        raise PipelineRejectedError("Unvollständige Leseantwort")
+    byte_count = body[1]
+    data = body[2 : 2 + byte_count]
+    if reg_type in (C_REG_TYPE_COILS, C_REG_TYPE_DISCRETE_INPUTS):
+        if byte_count * 8 < count:
+            raise PipelineRejectedError("Unvollständige Bit-Antwort")
+        return [bool(data[i >> 3] >> (i & 7) & 1) for i in range(count)]
+    if byte_count < count * 2:
+        raise PipelineRejectedError("Unvollständige Register-Antwort")
+    return list(struct.unpack(f">{count}H", data[: count * 2]))
@@ -0,0 +1,180 @@
+"""Leseplanung: zerlegt ENTITIES_DICT in möglichst wenige, gültige Modbus-Blockzugriffe."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .const import (
+    C_DT_BITS,
+    C_REG_TYPE_INPUT_REGISTERS,
+    C_REG_TYPE_HOLDING_REGISTERS,
+    C_REG_TYPE_COILS,
+    C_REG_TYPE_DISCRETE_INPUTS,
+    C_MAX_READ_REGISTERS,
+    C_MAX_READ_BITS,
+    C_READ_REQUEST_OVERHEAD_BYTES,
+    C_MAX_WRITE_REGISTERS,
+    C_MAX_WRITE_BITS,
+    POLL_CLASS_TICKS,
+    get_entity_type,
+    get_entity_reg,
+    get_entity_poll,
+)
+
+# Reihenfolge der Registerarten im Lesezyklus
+READ_ORDER = (
+    C_REG_TYPE_INPUT_REGISTERS,
+    C_REG_TYPE_HOLDING_REGISTERS,
+    C_REG_TYPE_COILS,
+    C_REG_TYPE_DISCRETE_INPUTS,
+)
+
+BIT_TYPES = {C_REG_TYPE_COILS, C_REG_TYPE_DISCRETE_INPUTS}
+
+
+@dataclass(frozen=True)
+class ReadBlock:
+    """Ein einzelner Modbus-Lesezugriff (address..address+count-1) und die darin enthaltenen Entitäten."""
+
+    reg_type: int
+    address: int
+    count: int
+    keys: Tuple[str, ...]
+    poll: str
+
+    @property
+    def end(self) -> int:
+        """Letzte gelesene Adresse (inklusive)."""
+        return self.address + self.count - 1
+
+
+@dataclass
+class BlockSplit:
+    """Ersatz für einen Block, dessen Lesezugriff das Gerät mit einer Fehlerantwort ablehnt."""
+
+    # Lesbare Teilblöcke samt Dekodierer, werden statt des Blocks gelesen
+    parts: Tuple[Tuple[ReadBlock, Any], ...]
+    # Entitäten, deren Register das Gerät auch einzeln ablehnt (Wert None)
+    quarantined: Tuple[str, ...]
+    # time.monotonic(), ab dem der ganze Block erneut versucht wird
+    retry_at: float
+    # Anzahl erneuter Ablehnungen (verlängert die Wartezeit)
+    strikes: int = 0
+
+
+def sub_block(block: ReadBlock, keys: Sequence[str], entities: Dict[str, Dict[str, Any]]) -> ReadBlock:
+    """Teilblock von block, der nur die Register der übergebenen Entitäten (und Lücken dazwischen) liest."""
+    spans = [entity_span(entities[entity_key]) for entity_key in keys]
+    first = min(span[0] for span in spans)
+    last = max(span[1] for span in spans)
+    return ReadBlock(block.reg_type, first, last - first + 1, tuple(keys), block.poll)
+
+
+def entity_span(props: Dict[str, Any]) -> Tuple[int, int] | None:
+    """Erste und letzte Adresse (inklusive) einer Entität, None ohne Registerdefinition."""
+    reg, dt = get_entity_reg(props)
+    if reg is None or dt is None:
+        return None
+    size = 1 if dt == C_DT_BITS else dt.value[1]
+    return reg, reg + size - 1
+
+
+def max_block_size(reg_type: int) -> int:
+    """Protokollgrenze je Request: 125 Register bzw. 2000 Bits."""
+    return C_MAX_READ_BITS if reg_type in BIT_TYPES else C_MAX_READ_REGISTERS
+
+
+def max_gap_size(reg_type: int) -> int:
+    """
+    Größte Lücke (in Adressen), die mitgelesen wird statt einen neuen Request zu starten.
+    Ein zusätzlicher Request kostet mindestens C_READ_REQUEST_OVERHEAD_BYTES (Anfrage + Antwort-Header);
+    eine Lücke kostet 2 Byte je Register bzw. 1/8 Byte je Bit.
+    """
+    if reg_type in BIT_TYPES:
+        return C_READ_REQUEST_OVERHEAD_BYTES * 8
+    return C_READ_REQUEST_OVERHEAD_BYTES // 2
+
+
+def plan_reads(
+    entities: Dict[str, Dict[str, Any]],
+    max_gap: Dict[int, int] | None = None,
+    max_size: Dict[int, int] | None = None,
+) -> List[ReadBlock]:
+    """
+    Erstellt die Liste der Blockzugriffe für alle Entitäten.
+
+    - Benachbarte Entitäten werden zusammengefasst, solange die Lücke dazwischen billiger ist
+      als ein neuer Request (max_gap)
+    - Ein Block überschreitet nie die Protokollgrenze (max_size)
+    - Blöcke werden je Abfrageklasse (POLL) gebildet, von schnell nach langsam. Entitäten einer
+      langsameren Klasse, die vollständig in einem schnelleren Block liegen, werden dort mitgelesen.
+    - max_gap/max_size je Registerart überschreibbar (z.B. für Tests mit synthetischen Registerkarten)
+    """
+    spans: Dict[Tuple[int, str], List[Tuple[int, int, str]]] = {}
+    for entity_key, props in entities.items():
+        span = entity_span(props)
+        if span is None:
+            continue
+        group = (get_entity_type(props), get_entity_poll(props))
+        spans.setdefault(group, []).append((span[0], span[1], entity_key))
+
+    plan: List[ReadBlock] = []
+    for reg_type in READ_ORDER:
+        gap = (max_gap or {}).get(reg_type, max_gap_size(reg_type))
+        size = (max_size or {}).get(reg_type, max_block_size(reg_type))
+        # [start, end, poll, keys]
+        blocks: List[list] = []
+
+        for poll in POLL_CLASS_TICKS:
+            items = []
+            for first, last, entity_key in sorted(spans.get((reg_type, poll), [])):
+                covering = next(
+                    (b for b in blocks if b[0] <= first and last <= b[1]), None
+                )
+                if covering is not None:
+                    covering[3].append(entity_key)
+                else:
+                    items.append((first, last, entity_key))
+            if not items:
+                continue
+
+            start, end, keys = items[0][0], items[0][1], [items[0][2]]
+            for first, last, entity_key in items[1:]:
+                new_end = max(end, last)
+                if first - end - 1 <= gap and new_end - start + 1 <= size:
+                    end = new_end
+                    keys.append(entity_key)
+                else:
+                    blocks.append([start, end, poll, keys])
+                    start, end, keys = first, last, [entity_key]
+            blocks.append([start, end, poll, keys])
+
+        for start, end, poll, keys in sorted(blocks, key=lambda b: b[0]):
+            plan.append(ReadBlock(reg_type, start, end - start + 1, tuple(keys), poll))
+
+    return plan
+
+
+def plan_writes(
+    writes: Iterable[Tuple[int, Tuple[int | bool, ...], bool]],
+) -> List[Tuple[int, Tuple[int | bool, ...], bool]]:
+    """
+    Fasst Schreibzugriffe (address, words, is_bits) zu zusammenhängenden Läufen zusammen.
+    Direkt aufeinanderfolgende Holding-Register werden zu einem Write-Multiple (FC 16),
+    Coils zu FC 15 zusammengelegt; die Protokollgrenzen je Request werden eingehalten.
+    """
+    runs: List[list] = []
+    for address, words, is_bits in sorted(writes, key=lambda w: (w[2], w[0])):
+        limit = C_MAX_WRITE_BITS if is_bits else C_MAX_WRITE_REGISTERS
+        last = runs[-1] if runs else None
+        if (
+            last is not None
+            and last[2] == is_bits
+            and last[0] + len(last[1]) == address
+            and len(last[1]) + len(words) <= limit
+        ):
+            last[1].extend(words)
+        else:
+            runs.append([address, list(words), is_bits])
+    return [(address, tuple(words), is_bits) for address, words, is_bits in runs]
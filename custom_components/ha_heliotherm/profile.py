@@ -0,0 +1,66 @@
+"""Geräteprofil: welche Entitäten der Registerkarte eine Anlage tatsächlich liefert (Firmware, Optionen)."""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, Iterable, Mapping
+
+from .const import (
+    get_entity_option,
+    is_entity_readonly,
+    is_entity_select,
+    is_entity_switch,
+)
+from .decoder import INVALID_RAW
+
+
+def map_digest(entity_keys: Iterable[str]) -> str:
+    """Kurzer Hash der Entitäts-Keys; ändert sich die Registerkarte, wird das Profil neu ermittelt."""
+    return hashlib.sha256("\n".join(sorted(entity_keys)).encode()).hexdigest()[:16]
+
+
+def build_profile(
+    entities: Dict[str, Dict[str, Any]],
+    raw_values: Mapping[str, Any],
+    unreadable: Iterable[str],
+) -> Dict[str, Any]:
+    """
+    Profil aus einem vollständigen Lesezyklus ableiten.
+
+    raw_values: Rohwert je gelesener Entität; unreadable: Entitäten, deren Register das Gerät
+    mit einer Fehlerantwort (z.B. Illegal Data Address) ablehnt.
+    Eine Entität fehlt, wenn ihr Register abgelehnt wird oder ein numerischer Wert den
+    Sentinel INVALID_RAW liefert. Eine Option (OPTION) fehlt, wenn keine ihrer read-only-Entitäten
+    einen gültigen Wert liefert; dann entfallen alle Entitäten der Option.
+    Ergebnis: {"map": map_digest, "absent": [Keys], "options": {Option: vorhanden}}
+    """
+    absent = set(unreadable)
+    for entity_key, raw in raw_values.items():
+        props = entities[entity_key]
+        if raw == INVALID_RAW and not (is_entity_switch(props) or is_entity_select(props)):
+            absent.add(entity_key)
+
+    members: Dict[str, list[str]] = {}
+    for entity_key, props in entities.items():
+        option = get_entity_option(props)
+        if option:
+            members.setdefault(option, []).append(entity_key)
+
+    options: Dict[str, bool] = {}
+    for option, keys in sorted(members.items()):
+        # Messwerte zeigen die Baugruppe an; Einstellwerte liefert die Steuerung auch ohne sie
+        indicators = [key for key in keys if is_entity_readonly(entities[key])] or keys
+        options[option] = any(key not in absent for key in indicators)
+        if not options[option]:
+            absent.update(keys)
+
+    return {"map": map_digest(entities), "absent": sorted(absent), "options": options}
+
+
+def profile_matches(profile: Any, entities: Dict[str, Dict[str, Any]]) -> bool:
+    """True, wenn ein gespeichertes Profil zur geladenen Registerkarte passt."""
+    return (
+        isinstance(profile, dict)
+        and profile.get("map") == map_digest(entities)
+        and isinstance(profile.get("absent"), list)
+    )
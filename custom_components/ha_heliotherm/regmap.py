@@ -0,0 +1,283 @@
+"""Registerkarte aus registers.yaml: Schemaprüfung, Übersetzung und zwischengespeichertes Kompilat."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import marshal
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+import voluptuous as vol
+import yaml
+
+from homeassistant.const import Platform
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import (
+    C_DT_BITS,
+    C_DT_INT16,
+    C_DT_UINT16,
+    C_DT_INT32,
+    C_DT_UINT32,
+    C_AGG_MEAN,
+    C_AGG_MIN,
+    C_AGG_MAX,
+    C_REGMAP_VERSION,
+    C_REGMAP_CACHE_FORMAT,
+    POLL_CLASS_TICKS,
+    REGISTER_MAP_FILE,
+    REGISTER_MAP_USER_FILE,
+    REGISTER_MAP_CACHE_FILE,
+    REGISTER_TYPES,
+)
+from .decoder import BlockDecoder, DecoderEntry, compile_decoders
+from .planner import BIT_TYPES, ReadBlock, plan_reads
+
+_LOGGER = logging.getLogger(__name__)
+
+_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Namen in registers.yaml -> Konstanten aus const.py (Registerarten: const.REGISTER_TYPES)
+DATA_TYPES = {dt.name: dt for dt in (C_DT_BITS, C_DT_INT16, C_DT_UINT16, C_DT_INT32, C_DT_UINT32)}
+
+# Module, deren Code das Kompilat bestimmt; Größe und Änderungszeit gehen in den Cache-Schlüssel ein
+_COMPILER_MODULES = ("const.py", "planner.py", "decoder.py", "regmap.py")
+
+_NUMBER = vol.Any(int, float)
+_SECONDS = vol.All(_NUMBER, vol.Range(min=0))
+# Abweichung in der Einheit der Entität (nach FAKTOR)
+_DEADBAND = vol.All(_NUMBER, vol.Range(min=0))
+
+ENTITY_SCHEMA = vol.Schema(
+    {
+        vol.Required("NAME"): str,
+        vol.Required("REG"): vol.All(int, vol.Range(min=0, max=0xFFFF)),
+        vol.Required("RT"): vol.All(vol.In(REGISTER_TYPES), REGISTER_TYPES.get),
+        vol.Optional("DT"): vol.All(vol.In(DATA_TYPES), DATA_TYPES.get),
+        vol.Optional("RW"): vol.In([0, 1]),
+        vol.Optional("FAKTOR"): _NUMBER,
+        vol.Optional("UNIT"): str,
+        vol.Optional("STEP"): _NUMBER,
+        vol.Optional("MIN"): _NUMBER,
+        vol.Optional("MAX"): _NUMBER,
+        vol.Optional("VALUES"): {vol.Any(int, "default"): vol.Any(str, int)},
+        vol.Optional("INC"): vol.In([0, 1]),
+        vol.Optional("SWITCH"): {vol.Required("off"): int, vol.Optional("on"): int},
+        vol.Optional("WEB_ID"): str,
+        vol.Optional("HA"): str,
+        vol.Optional("PF"): vol.All(vol.In([p.value for p in Platform]), vol.Coerce(Platform)),
+        vol.Optional("HVAC_MODES"): [str],
+        vol.Optional("FEATURES"): int,
+        vol.Optional("POLL"): vol.In(POLL_CLASS_TICKS),
+        vol.Optional("BOOST"): bool,
+        vol.Optional("DEADBAND"): _DEADBAND,
+        vol.Optional("MIN_INTERVAL"): _SECONDS,
+        vol.Optional("WINDOW"): _SECONDS,
+        vol.Optional("AGG"): vol.In([C_AGG_MEAN, C_AGG_MIN, C_AGG_MAX]),
+        vol.Optional("OPTION"): vol.Match(r"^[a-z0-9_]+$"),
+    }
+)
+
+
+def _check_data_type(props: Dict[str, Any]) -> Dict[str, Any]:
+    """DT ist für Register Pflicht; Coils und Discrete-Inputs sind immer BITS."""
+    if props["RT"] in BIT_TYPES:
+        if props.get("DT", C_DT_BITS) != C_DT_BITS:
+            raise vol.Invalid("Coils und Discrete-Inputs haben immer DT: BITS", path=["DT"])
+    elif props.get("DT") in (None, C_DT_BITS):
+        raise vol.Invalid("Register benötigen DT: INT16, UINT16, INT32 oder UINT32", path=["DT"])
+    return props
+
+
+def _check_references(registers: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """HA muss auf eine Entität derselben Datei verweisen."""
+    for entity_key, props in registers.items():
+        if "HA" in props and props["HA"] not in registers:
+            raise vol.Invalid(
+                f"Hand-Aktiv-Entität {props['HA']} nicht gefunden", path=[entity_key, "HA"]
+            )
+    return registers
+
+
+REGISTER_MAP_SCHEMA = vol.Schema(
+    {
+        vol.Required("version"): vol.In([C_REGMAP_VERSION]),
+        vol.Required("registers"): vol.All(
+            {vol.Match(r"^[a-z0-9_]+$"): vol.All(ENTITY_SCHEMA, _check_data_type)},
+            _check_references,
+        ),
+    }
+)
+
+
+class RegisterMapError(HomeAssistantError):
+    """Registerkarte nicht lesbar oder nicht schemakonform."""
+
+
+@dataclass(frozen=True)
+class RegisterMap:
+    """Geprüfte Registerkarte samt Leseplan und Dekodiertabelle."""
+
+    path: str
+    digest: str
+    entities: Dict[str, Dict[str, Any]]
+    plan: List[ReadBlock]
+    decoders: List[BlockDecoder]
+    # True: aus dem Kompilat unter .storage geladen
+    cached: bool
+
+    @property
+    def info(self) -> Dict[str, Any]:
+        """Herkunft der Karte für Log und Diagnose-Daten."""
+        return {
+            "path": self.path,
+            "digest": self.digest[:16],
+            "cached": self.cached,
+            "entities": len(self.entities),
+            "blocks": len(self.plan),
+        }
+
+
+def register_map_path(config_dir: str | None) -> str:
+    """Eigene Karte im Konfigurationsverzeichnis, sonst die mitgelieferte registers.yaml."""
+    if config_dir:
+        user_file = os.path.join(config_dir, REGISTER_MAP_USER_FILE)
+        if os.path.isfile(user_file):
+            return user_file
+    return os.path.join(os.path.dirname(__file__), REGISTER_MAP_FILE)
+
+
+def parse_register_map(data: bytes, source: str = REGISTER_MAP_FILE) -> Dict[str, Dict[str, Any]]:
+    """YAML lesen und gegen REGISTER_MAP_SCHEMA prüfen -> Entitäten im Format von ENTITIES_DICT."""
+    try:
+        return REGISTER_MAP_SCHEMA(yaml.load(data, Loader=_LOADER))["registers"]
+    except yaml.YAMLError as err:
+        raise RegisterMapError(f"Registerkarte {source} ist kein gültiges YAML: {err}") from err
+    except vol.Invalid as err:
+        raise RegisterMapError(f"Registerkarte {source} ungültig: {err}") from err
+
+
+def load_register_map(config_dir: str | None = None) -> RegisterMap:
+    """
+    Registerkarte laden (blockierend, im Executor aufrufen).
+
+    Mit config_dir wird das Kompilat unter <config>/.storage gesucht: stimmt der Schlüssel
+    (Format, SHA-256 der Karte, Stand der übersetzenden Module), entfallen YAML-Parser,
+    Schemaprüfung, Leseplanung und Aufbau der Dekodiertabelle. Sonst wird die Karte übersetzt
+    und das Kompilat neu geschrieben.
+    """
+    path = register_map_path(config_dir)
+    try:
+        with open(path, "rb") as fh:
+            data = fh.read()
+    except OSError as err:
+        raise RegisterMapError(f"Registerkarte {path} nicht lesbar: {err}") from err
+    digest = _cache_key(data)
+
+    cache_file = (
+        os.path.join(config_dir, STORAGE_DIR, REGISTER_MAP_CACHE_FILE) if config_dir else None
+    )
+    if cache_file:
+        register_map = _read_artefact(cache_file, path, digest)
+        if register_map is not None:
+            return register_map
+
+    entities = parse_register_map(data, path)
+    plan = plan_reads(entities)
+    decoders = compile_decoders(entities, plan)
+    if cache_file:
+        _write_artefact(cache_file, digest, entities, plan, decoders)
+    return RegisterMap(path, digest, entities, plan, decoders, False)
+
+
+def _cache_key(data: bytes) -> str:
+    digest = hashlib.sha256(f"{C_REGMAP_CACHE_FORMAT}\n".encode())
+    here = os.path.dirname(__file__)
+    for module in _COMPILER_MODULES:
+        try:
+            stat = os.stat(os.path.join(here, module))
+            digest.update(f"{module}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        except OSError:
+            pass
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def _read_artefact(cache_file: str, path: str, digest: str) -> RegisterMap | None:
+    """Kompilat laden; None, wenn es fehlt, beschädigt ist oder nicht zum Schlüssel passt."""
+    try:
+        with open(cache_file, "rb") as fh:
+            # als Ganzes lesen: marshal.load() auf dem Dateiobjekt liest in kleinen Stücken
+            artefact = marshal.loads(fh.read())
+        if artefact["format"] != C_REGMAP_CACHE_FORMAT or artefact["digest"] != digest:
+            return None
+        entities = {key: _restore(props) for key, props in artefact["entities"].items()}
+        plan = [ReadBlock(*block) for block in artefact["plan"]]
+        decoders = [
+            BlockDecoder([DecoderEntry.from_tuple(e) for e in entries], count, is_bits)
+            for count, is_bits, entries in artefact["decoders"]
+        ]
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError, KeyError) as err:
+        _LOGGER.warning("Kompilat der Registerkarte %s unbrauchbar (%s), wird neu erstellt", cache_file, err)
+        return None
+    return RegisterMap(path, digest, entities, plan, decoders, True)
+
+
+def _write_artefact(
+    cache_file: str,
+    digest: str,
+    entities: Dict[str, Dict[str, Any]],
+    plan: Sequence[ReadBlock],
+    decoders: Sequence[BlockDecoder],
+) -> None:
+    """Kompilat atomar schreiben (temporäre Datei + os.replace); Fehler nur protokollieren."""
+    artefact = {
+        "format": C_REGMAP_CACHE_FORMAT,
+        "digest": digest,
+        "entities": {key: _portable(props) for key, props in entities.items()},
+        "plan": [
+            (block.reg_type, block.address, block.count, block.keys, block.poll) for block in plan
+        ],
+        "decoders": [
+            (decoder.count, decoder.is_bits, [entry.as_tuple() for entry in decoder.entries])
+            for decoder in decoders
+        ],
+    }
+    directory = os.path.dirname(cache_file)
+    tmp_name = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as fh:
+            tmp_name = fh.name
+            fh.write(marshal.dumps(artefact))
+        os.replace(tmp_name, cache_file)
+    except (OSError, ValueError) as err:
+        _LOGGER.warning("Kompilat der Registerkarte %s nicht geschrieben: %s", cache_file, err)
+        if tmp_name is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+
+
+def _portable(props: Dict[str, Any]) -> Dict[str, Any]:
+    """Enums durch ihre Namen ersetzen (marshal kennt nur Grundtypen)."""
+    props = dict(props)
+    if "DT" in props:
+        props["DT"] = props["DT"].name
+    if "PF" in props:
+        props["PF"] = str(props["PF"].value)
+    return props
+
+
+def _restore(props: Dict[str, Any]) -> Dict[str, Any]:
+    if "DT" in props:
+        props["DT"] = DATA_TYPES[props["DT"]]
+    if "PF" in props:
+        props["PF"] = Platform(props["PF"])
+    return props
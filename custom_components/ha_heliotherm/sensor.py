@@ -6,12 +6,24 @@ from typing import Any
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
 
 from .entity_common import HubBackedEntity, setup_platform_from_types
-from .const import SENSOR_TYPES, MySensorEntityDescription
+from .const import (
+    SENSOR_TYPES,
+    METRIC_SENSOR_TYPES,
+    MySensorEntityDescription,
+    MyMetricSensorEntityDescription,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
+    await setup_platform_from_types(
+        hass=hass,
+        entry=entry,
+        async_add_entities=async_add_entities,
+        types_dict=METRIC_SENSOR_TYPES,
+        entity_cls=MyMetricSensor,
+    )
     return await setup_platform_from_types(
         hass=hass,
         entry=entry,
@@ -58,3 +70,20 @@ class MySensor(HubBackedEntity, SensorEntity):
 
         # Standard: direkt übernehmen
         self._attr_native_value = payload
+
+
+class MyMetricSensor(HubBackedEntity, SensorEntity):
+    """Diagnose-Sensor: wird nach jedem Abfragezyklus aus hub.metrics aktualisiert."""
+
+    entity_description: MyMetricSensorEntityDescription
+
+    async def async_added_to_hass(self) -> None:
+        # Ohne Entity-Key: Callback bei jedem erfolgreichen Zyklus
+        self._hub.async_add_my_modbus_sensor(self._on_hub_update)
+        self._on_hub_update()
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._hub.async_remove_my_modbus_sensor(self._on_hub_update)
+
+    def _apply_hub_payload(self, payload: Any) -> None:
+        self._attr_native_value = self.entity_description.value_fn(self._hub)
@@ -0,0 +1,50 @@
+"""Gemeinsame Fixtures: Registerkarte laden, Simulator und Hub im Event-Loop des Tests.
+
+Die Tests laufen ohne pytest-asyncio: jeder Test startet seinen Loop mit asyncio.run().
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "custom_components"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from ha_heliotherm import MyModbusHub, const  # noqa: E402
+from simulator import HeliothermSimulator  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def register_map():
+    """Mitgelieferte Registerkarte (registers.yaml) einmal je Testlauf laden."""
+    const.init()
+
+
+@pytest.fixture
+def hub_env(tmp_path):
+    """
+    Simulator starten und einen Hub (Unit 1) damit verbinden, innerhalb des Test-Loops:
+        async with hub_env(latency=0.05) as (simulator, hub): ...
+    Schlüsselwörter gehen an HeliothermSimulator, hub_kwargs an MyModbusHub.
+    """
+
+    @contextlib.asynccontextmanager
+    async def env(hub_kwargs=None, **simulator_kwargs):
+        async with HeliothermSimulator(**simulator_kwargs) as simulator:
+            hass = HomeAssistant(str(tmp_path))
+            hub = MyModbusHub(
+                hass, "test", "127.0.0.1", simulator.port, 15, 1, **(hub_kwargs or {})
+            )
+            try:
+                yield simulator, hub
+            finally:
+                hub.close()
+
+    return env
@@ -0,0 +1,90 @@
+"""Aufbereitung (aggregator.EntityAggregator): Totband, Mindestabstand, gleitendes Fenster."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from ha_heliotherm import const
+from ha_heliotherm.aggregator import EntityAggregator, build_aggregators
+from ha_heliotherm.const import C_AGG_MAX, C_AGG_MEAN, C_AGG_MIN
+
+
+def test_deadband_suppresses_small_changes():
+    aggregator = EntityAggregator(deadband=0.5)
+    assert aggregator.update(20.0, 0) is True
+    assert aggregator.update(20.4, 1) is False
+    assert aggregator.value == 20.0
+    # Abweichung zum zuletzt veröffentlichten Wert, nicht zum vorigen Messwert
+    assert aggregator.update(20.5, 2) is True
+    assert aggregator.value == 20.5
+    assert (aggregator.published, aggregator.suppressed) == (2, 1)
+
+
+def test_min_interval_catches_up_held_back_change():
+    aggregator = EntityAggregator(min_interval=30)
+    assert aggregator.update(20.0, 0) is True
+    assert aggregator.update(21.0, 10) is False
+    assert aggregator.value == 20.0
+    # erste Lesung nach Ablauf holt den zurückgehaltenen Wert nach
+    assert aggregator.update(21.0, 30) is True
+    assert aggregator.value == 21.0
+
+
+def test_non_numeric_values_pass_immediately():
+    aggregator = EntityAggregator(deadband=5, min_interval=60, window=60)
+    assert aggregator.update(20.0, 0) is True
+    assert aggregator.update(None, 1) is True
+    assert aggregator.value is None
+    assert aggregator.update(None, 2) is False
+    assert aggregator.update("aus", 3) is True
+
+
+@pytest.mark.parametrize(
+    ("agg", "expected"), [(C_AGG_MEAN, 21.0), (C_AGG_MIN, 20.0), (C_AGG_MAX, 22.0)]
+)
+def test_window_aggregation(agg, expected):
+    aggregator = EntityAggregator(window=60, agg=agg)
+    for now, value in ((0, 20.0), (10, 21.0), (20, 22.0)):
+        aggregator.update(value, now)
+    assert aggregator.value == expected
+
+
+def test_window_evicts_old_samples():
+    aggregator = EntityAggregator(window=60, agg=C_AGG_MAX)
+    aggregator.update(30.0, 0)
+    aggregator.update(20.0, 30)
+    assert aggregator.value == 30.0
+    # Messwert von t=0 liegt außerhalb des Fensters [1, 61]
+    assert aggregator.update(20.0, 61) is True
+    assert aggregator.value == 20.0
+
+
+def test_mean_is_rounded_one_digit_below_register_resolution():
+    aggregators = build_aggregators({"t": {"FAKTOR": 0.1, "WINDOW": 60}, "plain": {"FAKTOR": 0.1}})
+    assert list(aggregators) == ["t"]
+    aggregator = aggregators["t"]
+    for now, value in ((0, 20.0), (1, 20.1), (2, 20.1)):
+        aggregator.update(value, now)
+    assert aggregator.value == 20.07
+
+
+def test_only_read_blocks_feed_the_window(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            key = const.C_TEMP_VORLAUF
+            # Benachrichtigung nach dem Zyklus kommt sonst vom Coordinator
+            assert await hub.async_poll_cycle() is True
+            hub._notify_listeners()
+            samples = len(hub._aggregators[key]._samples)
+            assert samples == 1
+            # Rücklesen eines anderen Registers: kein neuer Messwert für key
+            await hub._async_verify_writes([const.C_WW_NORMALTEMPERATUR])
+            assert len(hub._aggregators[key]._samples) == samples
+            # erneute Lesung des Blocks mit unveränderten Rohwerten: ein Messwert
+            assert await hub.async_poll_cycle() is True
+            hub._notify_listeners()
+            assert len(hub._aggregators[key]._samples) == samples + 1
+
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+"""Blockteilung: abgelehnte Adressen in Quarantäne, Wiederaufnahme nach erneutem Versuch."""
+
+from __future__ import annotations
+
+import asyncio
+
+from ha_heliotherm import const
+from ha_heliotherm.const import ENTITIES_DICT, get_entity_reg, get_entity_type
+
+KEY = const.C_TEMP_AUSSEN
+
+
+def test_quarantined_entity_recovers(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            simulator.set_value(KEY, 25.0)
+            assert await hub.async_poll_cycle() is True
+            assert hub.data[KEY] == 25.0
+
+            # Gerät lehnt das Register ab: Block geteilt, Entität in Quarantäne
+            props = ENTITIES_DICT[KEY]
+            rejected = simulator.illegal.setdefault(get_entity_type(props), set())
+            rejected.add(get_entity_reg(props)[0])
+            assert await hub.async_poll_cycle() is True
+            assert hub.data[KEY] is None
+            assert [split["quarantined"] for split in hub.quarantine_stats] == [[KEY]]
+            # die übrigen Entitäten des Blocks werden weiter gelesen
+            assert await hub.async_poll_cycle() is True
+            assert hub.data[KEY] is None
+
+            # Register wieder lesbar, unveränderter Rohwert; erneuter Versuch fällig
+            rejected.clear()
+            for split in hub._splits.values():
+                split.retry_at = 0.0
+            assert await hub.async_poll_cycle() is True
+            assert hub.data[KEY] == 25.0
+            assert hub.quarantine_stats == []
+
+    asyncio.run(main())
+
+
+def test_resplit_does_not_accumulate_primed_decoders(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            assert await hub.async_poll_cycle() is True
+            props = ENTITIES_DICT[KEY]
+            simulator.illegal.setdefault(get_entity_type(props), set()).add(
+                get_entity_reg(props)[0]
+            )
+            assert await hub.async_poll_cycle() is True
+            assert await hub.async_poll_cycle() is True
+            primed = len(hub._primed_decoders)
+            # jeder erneute, wieder abgelehnte Versuch ersetzt die Teilblöcke
+            for _ in range(5):
+                for split in hub._splits.values():
+                    split.retry_at = 0.0
+                assert await hub.async_poll_cycle() is True
+                assert await hub.async_poll_cycle() is True
+            assert len(hub._primed_decoders) == primed
+            assert hub.quarantine_stats[0]["strikes"] == 5
+
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""Gemeinsame Verbindung mehrerer Hubs (Unit-IDs) hinter einem Gateway."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT
+from homeassistant.core import HomeAssistant
+
+from ha_heliotherm import MyModbusHub, connection, const
+from ha_heliotherm.config_flow import ConfigFlow
+from ha_heliotherm.const import CONF_HOSTID, DOMAIN
+
+
+def test_hubs_on_one_gateway_share_the_connection(hub_env, tmp_path):
+    async def main():
+        async with hub_env(units=2) as (simulator, hub):
+            hass = HomeAssistant(str(tmp_path))
+            other = MyModbusHub(hass, "test 2", "127.0.0.1", simulator.port, 15, 2)
+            try:
+                assert other._conn is hub._conn
+                assert other._lock is hub._lock
+                assert hub._conn.users == 2
+                simulator.set_value(const.C_TEMP_AUSSEN, 4.5, unit=2)
+                assert await hub.async_poll_cycle() is True
+                assert await other.async_poll_cycle() is True
+                assert other.data[const.C_TEMP_AUSSEN] == 4.5
+                assert hub.data[const.C_TEMP_AUSSEN] != 4.5
+                assert simulator.stats["connections"] == 1
+
+                # erste Freigabe: Verbindung bleibt für den zweiten Hub offen
+                other.close()
+                assert hub._conn.users == 1
+                assert hub._conn.connected
+                assert await hub.async_poll_cycle() is True
+            finally:
+                other.close()
+            # letzte Freigabe schließt den Socket
+            conn = hub._conn
+            hub.close()
+            assert conn.users == 0
+            assert not conn.connected
+            assert (conn.host, conn.port) not in connection._CONNECTIONS
+            # doppeltes close() gibt nicht erneut frei
+            hub.close()
+            assert conn.users == 0
+
+    asyncio.run(main())
+
+
+class _ConfigEntries:
+    """Nur die Teile von hass.config_entries, die der Config-Flow benutzt."""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.flow = SimpleNamespace(async_progress_by_handler=lambda *args, **kwargs: [])
+
+    def async_entries(self, domain=None, **kwargs):
+        return list(self.entries)
+
+    def async_entry_for_domain_unique_id(self, domain, unique_id):
+        return next((entry for entry in self.entries if entry.unique_id == unique_id), None)
+
+
+def _entry(host, port, hostid, unique_id):
+    return ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title=f"{host} {hostid}",
+        data={CONF_NAME: "wp", CONF_HOST: host, CONF_PORT: port, CONF_HOSTID: hostid},
+        source="user",
+        unique_id=unique_id,
+    )
+
+
+def _run_flow(entries, host, port, hostid):
+    async def main():
+        flow = ConfigFlow()
+        flow.hass = SimpleNamespace(config_entries=_ConfigEntries(entries))
+        flow.handler = DOMAIN
+        flow.flow_id = "test"
+        flow.context = {"source": "user"}
+        user_input = {CONF_NAME: "wp", CONF_HOST: host, CONF_PORT: port, CONF_HOSTID: hostid}
+        return flow, await flow.async_step_user(user_input)
+
+    return asyncio.run(main())
+
+
+def test_config_flow_unique_id_per_unit():
+    # erster Eintrag: Host als unique_id (wie bestehende Einträge)
+    flow, result = _run_flow([], "10.0.0.5", 502, 1)
+    assert result["type"] == "create_entry"
+    assert flow.context["unique_id"] == "10.0.0.5"
+
+    # weitere Unit-ID am selben Gateway: host:port:hostid
+    entries = [_entry("10.0.0.5", 502, 1, "10.0.0.5")]
+    flow, result = _run_flow(entries, "10.0.0.5", 502, 2)
+    assert result["type"] == "create_entry"
+    assert flow.context["unique_id"] == "10.0.0.5:502:2"
+
+    # dieselbe Unit-ID noch einmal: Fehler im Formular
+    flow, result = _run_flow(entries, "10.0.0.5", 502, 1)
+    assert result["type"] == "form"
+    assert result["errors"] == {CONF_HOST: "already_configured"}
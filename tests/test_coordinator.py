@@ -0,0 +1,145 @@
+"""Adaptives Abfrageintervall (coordinator.HeliothermCoordinator) mit simulierter Zyklusdauer."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from ha_heliotherm import coordinator as coordinator_module
+from ha_heliotherm.const import (
+    C_BOOST_INTERVAL,
+    C_POLL_MAX_STRETCH,
+    C_POLL_RECOVER_FACTOR,
+    C_POLL_TARGET_LOAD,
+)
+from ha_heliotherm.coordinator import HeliothermCoordinator
+
+SCAN_INTERVAL = 15.0
+
+
+class FakeHub:
+    """Hub, dessen Abfragezyklus die (simulierte) Uhr um `duration` Sekunden vorstellt."""
+
+    name = "test"
+    boost_active = False
+    boost_count = 0
+    full_cycle_requested = False
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.duration = 0.0
+        self.cycles = 0
+        self.boost_only: list[bool] = []
+        self.release: asyncio.Event | None = None
+
+    async def async_poll_cycle(self, boost_only=False):
+        self.cycles += 1
+        self.boost_only.append(boost_only)
+        if self.release is not None:
+            await self.release.wait()
+        self.clock[0] += self.duration
+        return True
+
+
+@pytest.fixture
+def coordinator_env(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(coordinator_module.time, "monotonic", lambda: clock[0])
+
+    def env():
+        hub = FakeHub(clock)
+        hass = HomeAssistant(str(tmp_path))
+        return hub, HeliothermCoordinator(hass, hub, timedelta(seconds=SCAN_INTERVAL))
+
+    return env
+
+
+async def _cycle(hub, coordinator, duration):
+    hub.duration = duration
+    return await coordinator._async_update_data()
+
+
+def test_interval_stretches_under_load(coordinator_env):
+    async def main():
+        hub, coordinator = coordinator_env()
+        # Zyklus unter der Ziellast: Basisintervall
+        await _cycle(hub, coordinator, SCAN_INTERVAL * C_POLL_TARGET_LOAD)
+        assert coordinator.interval == SCAN_INTERVAL
+        # Zyklus dauert 10 s: Intervall sofort auf 10 s / Ziellast
+        await _cycle(hub, coordinator, 10.0)
+        assert coordinator.interval == pytest.approx(10.0 / C_POLL_TARGET_LOAD)
+        # Abstand von Start zu Start: nächster Zyklus nach dem Rest des Intervalls
+        assert coordinator.update_interval == timedelta(seconds=coordinator.interval - 10.0)
+        assert coordinator.stats["last_cycle_duration"] == 10.0
+
+    asyncio.run(main())
+
+
+def test_interval_is_capped(coordinator_env):
+    async def main():
+        hub, coordinator = coordinator_env()
+        await _cycle(hub, coordinator, 10 * SCAN_INTERVAL)
+        assert coordinator.interval == SCAN_INTERVAL * C_POLL_MAX_STRETCH
+        assert coordinator.stats["max_cycle_duration"] == 10 * SCAN_INTERVAL
+
+    asyncio.run(main())
+
+
+def test_interval_recovers_stepwise(coordinator_env):
+    async def main():
+        hub, coordinator = coordinator_env()
+        await _cycle(hub, coordinator, 10 * SCAN_INTERVAL)
+        stretched = coordinator.interval
+        intervals = []
+        for _ in range(10):
+            await _cycle(hub, coordinator, 0.1)
+            intervals.append(coordinator.interval)
+        assert intervals[0] == pytest.approx(stretched * C_POLL_RECOVER_FACTOR)
+        assert intervals[1] == pytest.approx(stretched * C_POLL_RECOVER_FACTOR**2)
+        # nie unter das Basisintervall
+        assert intervals[-1] == SCAN_INTERVAL
+        assert min(intervals) == SCAN_INTERVAL
+        assert coordinator.cycle_count == 11
+
+    asyncio.run(main())
+
+
+def test_cycle_started_while_running_is_skipped(coordinator_env):
+    async def main():
+        hub, coordinator = coordinator_env()
+        hub.release = asyncio.Event()
+        first = asyncio.ensure_future(coordinator._async_update_data())
+        await asyncio.sleep(0)
+        assert hub.cycles == 1
+        assert await coordinator._async_update_data() is False
+        assert hub.cycles == 1
+        assert coordinator.skipped_cycles == 1
+        hub.release.set()
+        assert await first is True
+        assert coordinator.stats["cycle_count"] == 1
+        # danach läuft der nächste Zyklus wieder
+        assert await coordinator._async_update_data() is True
+        assert hub.cycles == 2
+
+    asyncio.run(main())
+
+
+def test_requested_full_cycle_runs_during_boost(coordinator_env):
+    async def main():
+        hub, coordinator = coordinator_env()
+        await _cycle(hub, coordinator, 0.1)
+        hub.boost_active = True
+        # Boost: bis zum nächsten regulären Zyklus nur Zwischenzyklen
+        await _cycle(hub, coordinator, 0.1)
+        assert hub.boost_only[-1] is True
+        assert coordinator.update_interval.total_seconds() <= C_BOOST_INTERVAL
+        # angeforderter Trace-/On-Demand-Zyklus wartet nicht auf den regulären Zyklus
+        hub.full_cycle_requested = True
+        await _cycle(hub, coordinator, 0.1)
+        assert hub.boost_only[-1] is False
+        assert coordinator.cycle_count == 2
+
+    asyncio.run(main())
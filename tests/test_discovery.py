@@ -0,0 +1,120 @@
+"""Register-Suche: unbekannte Register finden, Fehlerantworten beachten, nur einmal je Config-Entry."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME
+
+import ha_heliotherm
+from ha_heliotherm import const
+from ha_heliotherm.const import DOMAIN, ENTITIES_DICT, get_entity_type
+from ha_heliotherm.discovery import candidate_ranges
+from ha_heliotherm.planner import entity_span
+
+HR = const.C_REG_TYPE_HOLDING_REGISTERS
+
+# Register außerhalb der Registerkarte im Simulator: 600..609 und 640
+EXTRA = [*range(600, 610), 640]
+SEARCH = {HR: [(590, 660)]}
+
+
+def _found(report, name="holding_registers"):
+    return [register["address"] for register in report["registers"][name]]
+
+
+def _fast_discovery(hub):
+    """Suche nur über SEARCH, ohne Wartezeiten zwischen Requests und Lesungen."""
+    return functools.partial(
+        hub.async_discover_registers, SEARCH, request_delay=0, samples=2, sample_interval=0
+    )
+
+
+def test_candidate_ranges_skip_mapped_registers():
+    ranges = candidate_ranges(ENTITIES_DICT)
+    assert set(ranges) == set(const.C_DISCOVERY_LIMITS)
+    for props in ENTITIES_DICT.values():
+        span = entity_span(props)
+        if span is None or get_entity_type(props) not in ranges:
+            continue
+        for first, end in ranges[get_entity_type(props)]:
+            assert end <= span[0] or first > span[1]
+    assert all(
+        end <= const.C_DISCOVERY_LIMITS[reg_type]
+        for reg_type, runs in ranges.items()
+        for _, end in runs
+    )
+
+
+def test_finds_unmapped_registers(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            for address in EXTRA:
+                simulator.add_register(HR, address, address)
+            report = await _fast_discovery(hub)()
+            assert _found(report) == EXTRA
+            assert report["ranges"] == {"holding_registers": [[590, 660]]}
+            assert not report["truncated"]
+
+    asyncio.run(main())
+
+
+def test_respects_device_exceptions(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            for address in EXTRA:
+                simulator.add_register(HR, address, address)
+            # Lücken im Bereich lehnt das Gerät mit Exception 2 ab, wie jede einzelne Adresse
+            simulator.illegal[HR].update({603, 604})
+            report = await _fast_discovery(hub)()
+            assert _found(report) == [600, 601, 602, *range(605, 610), 640]
+            # Fehlerantworten sind kein Verbindungsfehler: Verbindung bleibt bestehen
+            assert hub._conn.connected
+            assert hub._conn.dead_peer_count == 0
+
+    asyncio.run(main())
+
+
+def test_discovery_runs_once_per_entry(hub_env, monkeypatch):
+    monkeypatch.setattr(ha_heliotherm, "C_DISCOVERY_START_DELAY", 0)
+
+    async def setup(hass, entry, hub):
+        monkeypatch.setattr(hub, "async_discover_registers", _fast_discovery(hub))
+        hass.data.setdefault(DOMAIN, {})["test"] = {"hub": hub}
+        await ha_heliotherm._async_setup_discovery(hass, entry, hub)
+        return hass.data[DOMAIN]["test"].get("discovery_task")
+
+    async def main():
+        async with hub_env() as (simulator, hub):
+            for address in EXTRA:
+                simulator.add_register(HR, address, address)
+            hass = hub._hass
+            entry = ConfigEntry(
+                version=1,
+                minor_version=1,
+                domain=DOMAIN,
+                title="test",
+                data={CONF_NAME: "test"},
+                source="user",
+            )
+
+            # erstes Setup: Suche im Hintergrund, Ergebnis gespeichert
+            task = await setup(hass, entry, hub)
+            assert task is not None
+            await task
+            assert _found(hub.discovery) == EXTRA
+            stored = await ha_heliotherm._discovery_store(hass, entry).async_load()
+            assert stored == hub.discovery
+
+            # späteres Setup (z. B. Neustart): gespeichertes Ergebnis, keine Requests
+            hub.discovery = None
+            del hass.data[DOMAIN]["test"]
+            requests = simulator.stats["requests"]
+            assert await setup(hass, entry, hub) is None
+            await asyncio.sleep(0.05)
+            assert _found(hub.discovery) == EXTRA
+            assert simulator.stats["requests"] == requests
+
+    asyncio.run(main())
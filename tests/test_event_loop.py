@@ -0,0 +1,102 @@
+"""Regressionstest: Poll-Zyklen und Schreibzugriffe blockieren nie den Event-Loop."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import time
+
+from ha_heliotherm import const
+from ha_heliotherm.connection import acquire_connection, release_connection
+
+# Taktung des Messers und größte zulässige Verspätung eines Takts in Sekunden. Die Antwortzeit
+# des Simulators liegt deutlich darüber: ein blockierender Lesezugriff fiele sofort auf.
+TICK = 0.005
+MAX_LAG = 0.05
+LATENCY = 0.1
+
+
+class LoopMonitor:
+    """Misst, wie stark sich ein asyncio.sleep(TICK) im laufenden Loop verspätet."""
+
+    def __init__(self):
+        self.max_lag = 0.0
+        self.ticks = 0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            self.max_lag = max(self.max_lag, time.perf_counter() - start - TICK)
+            self.ticks += 1
+
+    async def __aenter__(self) -> LoopMonitor:
+        # vorab aufräumen: eine volle Garbage Collection über alle geladenen HA-Module dauert
+        # selbst mehr als MAX_LAG und soll nicht in die Messung fallen
+        gc.collect()
+        self._task = asyncio.create_task(self._run())
+        # erster Takt, damit der Messer vor dem geprüften Aufruf läuft
+        await asyncio.sleep(TICK * 2)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._task.cancel()
+
+
+async def _timed(awaitable) -> tuple[object, float]:
+    start = time.perf_counter()
+    result = await awaitable
+    return result, time.perf_counter() - start
+
+
+def test_poll_cycle_does_not_block_loop(hub_env):
+    async def main():
+        async with hub_env(latency=LATENCY) as (simulator, hub):
+            async with LoopMonitor() as monitor:
+                result, duration = await _timed(hub.async_poll_cycle())
+            assert result is True
+            assert hub.data[const.C_TEMP_AUSSEN] is not None
+            # ein Request je Block, jeder wartet LATENCY auf die Antwort
+            assert duration >= LATENCY * len(hub._plan)
+            assert monitor.ticks > 10
+            assert monitor.max_lag < MAX_LAG
+
+    asyncio.run(main())
+
+
+def test_unresponsive_device_does_not_block_loop(hub_env):
+    async def main():
+        # Gerät beantwortet keinen Request; der Hub übernimmt eine Verbindung mit kurzem Timeout
+        # (gemeinsame Verbindung je host:port)
+        async with hub_env(loss=1.0) as (simulator, hub):
+            hub.close()
+            conn = acquire_connection("127.0.0.1", simulator.port, timeout=0.3, retries=0)
+            try:
+                hub._acquire_connection()
+                assert hub._conn is conn
+                async with LoopMonitor() as monitor:
+                    result, duration = await _timed(hub.async_poll_cycle())
+            finally:
+                release_connection(conn)
+            assert result is None
+            assert duration >= 0.3
+            assert monitor.max_lag < MAX_LAG
+
+    asyncio.run(main())
+
+
+def test_write_does_not_block_loop(hub_env):
+    async def main():
+        async with hub_env(latency=LATENCY) as (simulator, hub):
+            async with LoopMonitor() as monitor:
+                # endet nach dem gesammelten Schreiben und Rücklesen
+                _, duration = await _timed(
+                    hub.write_entity_value(const.C_WW_NORMALTEMPERATUR, 48.0)
+                )
+            # Schreiben und Rücklesen
+            assert duration >= LATENCY * 2
+            assert monitor.max_lag < MAX_LAG
+            assert hub.data[const.C_WW_NORMALTEMPERATUR] == 48.0
+
+    asyncio.run(main())
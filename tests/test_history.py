@@ -0,0 +1,107 @@
+"""Verlauf der Rohwerte (history.RegisterHistory): XOR-Deltas, Basiszustand, Fenster."""
+
+from __future__ import annotations
+
+import random
+
+from ha_heliotherm.history import RegisterHistory
+
+FIRST, LAST = 10, 19
+
+
+def _reference_series(snapshots, capacity, address, since):
+    """
+    Erwarteter Verlauf aus vollständigen Zuständen je Lesezugriff: der Ring hält die letzten
+    `capacity` Lesezugriffe, der Zustand davor ist die Basis.
+    """
+    kept = snapshots[-capacity:]
+    before = snapshots[-capacity - 1][1] if len(snapshots) > capacity else {}
+    start_value = before.get(address)
+    previous = start_value
+    series = []
+    for timestamp, state in kept:
+        value = state.get(address)
+        if value is None or value == previous and previous is not None:
+            continue
+        previous = value
+        if timestamp <= since:
+            start_value = value
+        else:
+            series.append((timestamp, value))
+    if start_value is not None:
+        series.insert(0, (since, start_value))
+    return series
+
+
+def test_series_matches_snapshots_across_base_rollover():
+    rng = random.Random(4711)
+    capacity = 5
+    history = RegisterHistory(FIRST, LAST, capacity)
+    snapshots = []
+    state = {}
+    for step in range(40):
+        # Blöcke wechselnder Lage und Länge, wenige Werte ändern sich
+        address = rng.randint(FIRST, LAST)
+        count = rng.randint(1, LAST - address + 1)
+        values = [
+            rng.choice((state.get(reg, 0), rng.randint(0, 3)))
+            for reg in range(address, address + count)
+        ]
+        history.record(address, values, float(step))
+        state = {**state, **dict(zip(range(address, address + count), values))}
+        snapshots.append((float(step), state))
+
+        for reg in range(FIRST, LAST + 1):
+            assert history.get(reg) == state.get(reg)
+            for since in (step - capacity - 1.0, step - 2.5, step - 2.0, float(step)):
+                assert history.series(reg, since) == _reference_series(
+                    snapshots, capacity, reg, since
+                ), (step, reg, since)
+    assert history.stats["entries"] == capacity
+
+
+def test_eviction_moves_oldest_entry_into_base():
+    history = RegisterHistory(FIRST, LAST, capacity=2)
+    history.record(FIRST, [1], 1.0)
+    history.record(FIRST, [2], 2.0)
+    history.record(FIRST, [3], 3.0)
+    # Eintrag von t=1 ist in der Basis: Wert zu Fensterbeginn ist 1
+    assert history.series(FIRST, 0.0) == [(0.0, 1), (2.0, 2), (3.0, 3)]
+    history.record(FIRST, [3], 4.0)
+    assert history.series(FIRST, 0.0) == [(0.0, 2), (3.0, 3)]
+
+
+def test_address_first_seen_after_base():
+    history = RegisterHistory(FIRST, LAST, capacity=2)
+    history.record(FIRST, [5], 1.0)
+    history.record(FIRST, [5], 2.0)
+    history.record(FIRST, [5], 3.0)
+    # Basis kennt nur FIRST; FIRST + 1 erstmals nach dem Basiszustand gelesen, auch als 0
+    history.record(FIRST + 1, [0], 4.0)
+    history.record(FIRST + 1, [7], 5.0)
+    assert history.series(FIRST + 1, 0.0) == [(4.0, 0), (5.0, 7)]
+    assert history.series(FIRST + 1, 4.0) == [(4.0, 0), (5.0, 7)]
+    assert history.series(FIRST, 0.0) == [(0.0, 5)]
+    assert history.series(FIRST + 2, 0.0) == []
+    assert history.get(FIRST + 2) is None and history.read_at(FIRST + 2) is None
+
+
+def test_since_boundary_belongs_to_start_value():
+    history = RegisterHistory(FIRST, LAST, capacity=8)
+    for timestamp, value in ((1.0, 1), (2.0, 2), (3.0, 3)):
+        history.record(FIRST, [value], timestamp)
+    # Änderung genau bei since gilt zu Fensterbeginn, spätere folgen mit eigenem Zeitstempel
+    assert history.series(FIRST, 2.0) == [(2.0, 2), (3.0, 3)]
+    assert history.series(FIRST, 1.5) == [(1.5, 1), (2.0, 2), (3.0, 3)]
+    assert history.series(FIRST, 3.0) == [(3.0, 3)]
+    assert history.series(FIRST, 0.5) == [(1.0, 1), (2.0, 2), (3.0, 3)]
+
+
+def test_record_outside_range_and_unchanged_reads():
+    history = RegisterHistory(FIRST, LAST, capacity=4)
+    assert history.record(LAST, [1, 2], 1.0) is True
+    assert history.get(LAST) is None
+    assert history.record(FIRST, [True, False], 2.0) is True
+    assert history.record(FIRST, [1, 0], 3.0) is False
+    assert history.read_at(FIRST) == 3.0
+    assert history.stats["changes"] == 2
@@ -0,0 +1,52 @@
+"""Benachrichtigung der Entitäten: nur geänderte Keys, Callbacks ohne Key je Zyklus."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+
+from ha_heliotherm import const
+
+CHANGED = const.C_TEMP_AUSSEN
+UNCHANGED = const.C_TEMP_BRAUCHWASSER
+
+
+def test_only_changed_entities_are_notified(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            fired = Counter()
+            callbacks = {
+                key: (lambda key=key: fired.update([key])) for key in (CHANGED, UNCHANGED, None)
+            }
+            for key, update_callback in callbacks.items():
+                hub.async_add_my_modbus_sensor(update_callback, key)
+            try:
+                # erster Zyklus: alle Werte neu
+                assert await hub.async_poll_cycle() is True
+                hub._notify_listeners()
+                assert fired == {CHANGED: 1, UNCHANGED: 1, None: 1}
+
+                fired.clear()
+                before = hub.metrics.counters["callbacks"]
+                simulator.set_value(CHANGED, hub.data[CHANGED] + 1.5)
+                assert await hub.async_poll_cycle() is True
+                hub._notify_listeners()
+                assert fired == {CHANGED: 1, None: 1}
+                assert hub.metrics.counters["callbacks"] - before == 2
+
+                # ohne Änderung nur die Callbacks ohne Key, mit notify_unkeyed=False gar keiner
+                fired.clear()
+                assert await hub.async_poll_cycle() is True
+                hub._notify_listeners()
+                assert fired == {None: 1}
+                fired.clear()
+                simulator.set_value(UNCHANGED, hub.data[UNCHANGED] + 1.5)
+                assert await hub.async_poll_cycle() is True
+                hub._notify_listeners(notify_unkeyed=False)
+                assert fired == {UNCHANGED: 1}
+            finally:
+                for key, update_callback in callbacks.items():
+                    hub.async_remove_my_modbus_sensor(update_callback, key)
+            assert hub._listeners == {}
+
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""Laufzeit-Metriken: Histogramm-Quantile und Bytes je Modbus-TCP-Rahmen."""
+
+from __future__ import annotations
+
+import pytest
+
+from ha_heliotherm.metrics import (
+    HISTOGRAM_BOUNDS,
+    Histogram,
+    HubMetrics,
+    read_frame_sizes,
+    write_frame_sizes,
+)
+
+
+def test_bounds_raster():
+    assert HISTOGRAM_BOUNDS[0] == pytest.approx(1e-6)
+    assert HISTOGRAM_BOUNDS[-1] == 10.0
+    assert list(HISTOGRAM_BOUNDS) == sorted(HISTOGRAM_BOUNDS)
+    assert len(HISTOGRAM_BOUNDS) == 6 * 7 + 1
+
+
+@pytest.mark.parametrize(
+    ("q", "expected"), [(0.0, 1.5), (0.25, 1.5), (0.5, 2.0), (0.75, 3.0), (1.0, 3.0)]
+)
+def test_quantile_interpolates_within_bucket(q, expected):
+    histogram = Histogram(bounds=(1.0, 2.0, 4.0))
+    for value in (1.5, 1.5, 3.0, 3.0):
+        histogram.observe(value)
+    assert histogram.buckets == [0, 2, 2, 0]
+    # linear zwischen den Bucket-Grenzen, begrenzt auf min..max
+    assert histogram.quantile(q) == pytest.approx(expected)
+
+
+def test_quantile_in_overflow_bucket_uses_max():
+    histogram = Histogram(bounds=(1.0, 2.0))
+    for value in (0.5, 5.0, 9.0):
+        histogram.observe(value)
+    assert histogram.buckets == [1, 0, 2]
+    # Bucket über der größten Grenze reicht bis zum Maximum: 2 + (9 - 2) * 0.5 / 2
+    assert histogram.quantile(0.5) == pytest.approx(3.75)
+    assert histogram.quantile(1.0) == 9.0
+
+
+def test_empty_histogram():
+    histogram = Histogram()
+    assert histogram.quantile(0.5) is None
+    assert histogram.as_dict() == {"count": 0}
+
+
+@pytest.mark.parametrize(
+    ("is_bits", "count", "expected"),
+    [
+        # MBAP (7) + FC + Adresse + Anzahl; Antwort: MBAP + FC + Byteanzahl + Daten
+        (False, 10, (12, 29)),
+        (False, 125, (12, 259)),
+        (True, 10, (12, 11)),
+        (True, 2000, (12, 259)),
+    ],
+)
+def test_read_frame_sizes(is_bits, count, expected):
+    assert read_frame_sizes(is_bits, count) == expected
+
+
+@pytest.mark.parametrize(
+    ("is_bits", "count", "expected"),
+    [
+        # FC 5/6: Echo von Adresse und Wert
+        (False, 1, (12, 12)),
+        (True, 1, (12, 12)),
+        # FC 15/16: Adresse, Anzahl, Byteanzahl, Daten; Antwort: Adresse und Anzahl
+        (False, 3, (19, 12)),
+        (True, 10, (15, 12)),
+    ],
+)
+def test_write_frame_sizes(is_bits, count, expected):
+    assert write_frame_sizes(is_bits, count) == expected
+
+
+def test_byte_counters():
+    metrics = HubMetrics()
+    metrics.record_read(False, 10, 0.01)
+    # ohne gültige Antwort: gesendet, aber nichts empfangen
+    metrics.record_read(False, 10, None)
+    metrics.record_write(False, 3, 0.02)
+    counters = metrics.counters
+    assert counters["requests"] == 3
+    assert counters["blocks_read"] == 1
+    assert counters["bytes_sent"] == 12 + 12 + 19
+    assert counters["bytes_received"] == 29 + 12
+    assert metrics.block_rtt.count == 1
+    assert metrics.write_rtt.count == 1
@@ -0,0 +1,173 @@
+"""Gepipelinte Lesezugriffe über die gemeinsame Verbindung des Hubs."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import struct
+
+import pytest
+from pymodbus.client import AsyncModbusTcpClient
+
+from ha_heliotherm import const
+from ha_heliotherm.connection import acquire_connection, release_connection
+from ha_heliotherm.pipeline import ModbusPipeline, PipelineError, PipelineRejectedError
+
+IR = const.C_REG_TYPE_INPUT_REGISTERS
+MBAP = struct.Struct(">HHHB")
+
+
+def test_pipelining_shares_the_client_connection(hub_env):
+    async def main():
+        # Gateway mit nur einer zulässigen Verbindung
+        async with hub_env({"pipelining": True}, max_connections=1) as (simulator, hub):
+            assert await hub.async_poll_cycle() is True
+            assert await hub.async_poll_cycle() is True
+            assert hub.pipelined_cycles == 2
+            assert simulator.stats["connections"] == 1
+            assert simulator.stats["rejected_connections"] == 0
+            # pymodbus-Client arbeitet danach unverändert auf derselben Verbindung
+            await hub.write_entity_value(const.C_WW_NORMALTEMPERATUR, 48.0)
+            assert simulator.get_words(const.C_WW_NORMALTEMPERATUR) == [480]
+            assert simulator.stats["connections"] == 1
+
+    asyncio.run(main())
+
+
+def test_busy_device_falls_back_to_serial_until_retry(hub_env):
+    async def main():
+        async with hub_env({"pipelining": True}, pipelining=False, latency=0.01) as (simulator, hub):
+            # Exception 6 "busy" auf parallele Transaktionen: seriell bis zum erneuten Versuch
+            assert await hub.async_poll_cycle() is True
+            assert simulator.stats["busy"] > 0
+            assert hub._pipelining is True
+            assert hub.pipelined_cycles == 0
+            assert hub.connection_stats["pipeline_failures"] == 1
+            assert hub.data[const.C_TEMP_AUSSEN] is not None
+            assert await hub.async_poll_cycle() is True
+            assert hub.pipelined_cycles == 0
+
+            # Gerät wieder bereit: nach Ablauf des Backoffs wird gepipelinet
+            simulator.pipelining = True
+            hub._pipeline_retry_at = 0.0
+            assert await hub.async_poll_cycle() is True
+            assert hub.pipelined_cycles == 1
+            assert hub.connection_stats["pipeline_failures"] == 0
+
+    asyncio.run(main())
+
+
+def test_transient_failure_retries_pipelining_later(hub_env):
+    async def main():
+        async with hub_env({"pipelining": True}) as (simulator, hub):
+            # Verbindung mit kurzem Timeout, damit der serielle Versuch schnell aufgibt
+            hub.close()
+            conn = acquire_connection("127.0.0.1", simulator.port, timeout=0.3, retries=0)
+            try:
+                hub._acquire_connection()
+                # Verbindungsabbruch statt Antwort: kein Hinweis auf fehlende Unterstützung
+                simulator.disconnect_rate = 1.0
+                assert await hub.async_poll_cycle() is not True
+                assert hub._pipelining is True
+                assert hub.connection_stats["pipeline_failures"] == 1
+
+                # bis zum erneuten Versuch seriell
+                simulator.disconnect_rate = 0.0
+                assert await hub.async_poll_cycle() is True
+                assert hub.pipelined_cycles == 0
+
+                hub._pipeline_retry_at = 0.0
+                assert await hub.async_poll_cycle() is True
+                assert hub.pipelined_cycles == 1
+                assert hub.connection_stats["pipeline_failures"] == 0
+            finally:
+                release_connection(conn)
+
+    asyncio.run(main())
+
+
+@contextlib.asynccontextmanager
+async def fake_device(respond):
+    """
+    Modbus-TCP-Gegenstelle, die auf jeden Request (tid, unit, pdu) die von respond gelieferten
+    Bytes sendet; dazu ein verbundener pymodbus-Client.
+    """
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                tid, _, length, unit = MBAP.unpack(await reader.readexactly(MBAP.size))
+                writer.write(respond(tid, unit, await reader.readexactly(length - 1)))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    client = AsyncModbusTcpClient("127.0.0.1", port=server.sockets[0].getsockname()[1])
+    await client.connect()
+    try:
+        yield client
+    finally:
+        client.close()
+        server.close()
+
+
+def _registers(tid, unit, pdu):
+    count = struct.unpack(">H", pdu[3:5])[0]
+    response = bytes([pdu[0], count * 2]) + bytes(count * 2)
+    return MBAP.pack(tid, 0, len(response) + 1, unit) + response
+
+
+@pytest.mark.parametrize(
+    "respond",
+    [
+        # Länge 0 bzw. 1: kein Funktionscode
+        lambda tid, unit, pdu: MBAP.pack(tid, 0, 0, unit),
+        lambda tid, unit, pdu: MBAP.pack(tid, 0, 1, unit),
+        # Funktionscode ohne Byteanzahl, Byteanzahl größer als die Daten
+        lambda tid, unit, pdu: MBAP.pack(tid, 0, 2, unit) + pdu[:1],
+        lambda tid, unit, pdu: MBAP.pack(tid, 0, 4, unit) + bytes([pdu[0], 4, 0]),
+        # Antwort einer anderen Unit bzw. auf eine unbekannte Transaktion
+        lambda tid, unit, pdu: _registers(tid, unit + 1, pdu),
+        lambda tid, unit, pdu: _registers(tid + 100, unit, pdu),
+    ],
+    ids=["length-0", "length-1", "no-byte-count", "short-data", "wrong-unit", "unknown-tid"],
+)
+def test_malformed_response_is_rejected(respond):
+    async def main():
+        async with fake_device(respond) as client:
+            pipeline = ModbusPipeline(client, timeout=1)
+            with pytest.raises(PipelineRejectedError):
+                await pipeline.async_read([(IR, 0, 2), (IR, 10, 1)], unit=1)
+            # keine verspätete Antwort darf beim pymodbus-Client ankommen
+            assert not client.connected
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("code", [4, 6, 0x0A, 0x0B])
+def test_exception_response_is_transient(code):
+    def respond(tid, unit, pdu):
+        return MBAP.pack(tid, 0, 3, unit) + bytes([pdu[0] | 0x80, code])
+
+    async def main():
+        async with fake_device(respond) as client:
+            pipeline = ModbusPipeline(client, timeout=1)
+            with pytest.raises(PipelineError) as info:
+                await pipeline.async_read([(IR, 0, 2), (IR, 10, 1)], unit=1)
+            assert not isinstance(info.value, PipelineRejectedError)
+            assert not client.connected
+
+    asyncio.run(main())
+
+
+def test_valid_responses_are_matched():
+    async def main():
+        async with fake_device(_registers) as client:
+            pipeline = ModbusPipeline(client, timeout=1)
+            assert await pipeline.async_read([(IR, 0, 2), (IR, 10, 1)], unit=1) == [
+                [0, 0],
+                [0],
+            ]
+            assert client.connected
+
+    asyncio.run(main())
@@ -0,0 +1,175 @@
+"""Leseplanung (planner.plan_reads) mit synthetischen Registerkarten."""
+
+from __future__ import annotations
+
+from ha_heliotherm.const import (
+    C_DT_INT32,
+    C_DT_UINT16,
+    C_MAX_READ_BITS,
+    C_MAX_READ_REGISTERS,
+    C_POLL_FAST,
+    C_POLL_NORMAL,
+    C_POLL_SLOW,
+    C_REG_TYPE_COILS,
+    C_REG_TYPE_DISCRETE_INPUTS,
+    C_REG_TYPE_HOLDING_REGISTERS,
+    C_REG_TYPE_INPUT_REGISTERS,
+)
+from ha_heliotherm.planner import max_gap_size, plan_reads
+
+IR = C_REG_TYPE_INPUT_REGISTERS
+HR = C_REG_TYPE_HOLDING_REGISTERS
+COILS = C_REG_TYPE_COILS
+
+
+def entity(reg_type, reg, dt=C_DT_UINT16, poll=None):
+    props = {"RT": reg_type, "REG": reg}
+    if reg_type not in (COILS, C_REG_TYPE_DISCRETE_INPUTS):
+        props["DT"] = dt
+    if poll is not None:
+        props["POLL"] = poll
+    return props
+
+
+def registers(reg_type, addresses, **kwargs):
+    """Synthetische Registerkarte: je Adresse eine Entität r<Adresse>."""
+    return {f"r{address}": entity(reg_type, address, **kwargs) for address in addresses}
+
+
+def spans(plan):
+    return [(block.reg_type, block.address, block.count) for block in plan]
+
+
+def test_gap_threshold_is_cost_of_a_request():
+    # 21 Byte Overhead je Request: 10 Register bzw. 168 Bits Lücke werden mitgelesen
+    assert max_gap_size(IR) == 10
+    assert max_gap_size(COILS) == 168
+
+
+def test_register_gap_at_threshold_is_merged():
+    assert spans(plan_reads(registers(IR, [0, 11]))) == [(IR, 0, 12)]
+
+
+def test_register_gap_above_threshold_is_split():
+    assert spans(plan_reads(registers(IR, [0, 12]))) == [(IR, 0, 1), (IR, 12, 1)]
+
+
+def test_bit_gap_threshold():
+    assert spans(plan_reads(registers(COILS, [0, 169]))) == [(COILS, 0, 170)]
+    assert spans(plan_reads(registers(COILS, [0, 170]))) == [(COILS, 0, 1), (COILS, 170, 1)]
+
+
+def test_register_limit_125():
+    plan = plan_reads(registers(HR, range(C_MAX_READ_REGISTERS)))
+    assert spans(plan) == [(HR, 0, 125)]
+    plan = plan_reads(registers(HR, range(C_MAX_READ_REGISTERS + 1)))
+    assert spans(plan) == [(HR, 0, 125), (HR, 125, 1)]
+
+
+def test_bit_limit_2000():
+    plan = plan_reads(registers(COILS, range(0, C_MAX_READ_BITS, 100)))
+    assert spans(plan) == [(COILS, 0, 1901)]
+    plan = plan_reads(registers(COILS, [*range(0, C_MAX_READ_BITS, 100), 1999]))
+    assert spans(plan) == [(COILS, 0, 2000)]
+    plan = plan_reads(registers(COILS, [*range(0, C_MAX_READ_BITS, 100), 1999, 2000]))
+    assert spans(plan) == [(COILS, 0, 2000), (COILS, 2000, 1)]
+
+
+def test_limit_is_never_exceeded():
+    plan = plan_reads(registers(IR, range(0, 1000, 7)))
+    assert all(block.count <= C_MAX_READ_REGISTERS for block in plan)
+    assert sorted(key for block in plan for key in block.keys) == sorted(
+        f"r{address}" for address in range(0, 1000, 7)
+    )
+
+
+def test_two_word_entity_does_not_straddle_limit():
+    entities = registers(IR, range(124))
+    entities["wide"] = entity(IR, 124, C_DT_INT32)
+    plan = plan_reads(entities)
+    assert spans(plan) == [(IR, 0, 124), (IR, 124, 2)]
+    assert plan[1].keys == ("wide",)
+
+
+def test_two_word_entity_fits_exactly():
+    entities = registers(IR, range(123))
+    entities["wide"] = entity(IR, 123, C_DT_INT32)
+    assert spans(plan_reads(entities)) == [(IR, 0, 125)]
+
+
+def test_single_register():
+    plan = plan_reads({"only": entity(HR, 300)})
+    assert spans(plan) == [(HR, 300, 1)]
+    assert plan[0].keys == ("only",)
+    assert plan[0].end == 300
+
+
+def test_empty_map_and_entities_without_register():
+    assert plan_reads({}) == []
+    assert plan_reads({"virtual": {"RT": IR}}) == []
+
+
+def test_adjacent_entities_and_overlap():
+    entities = {
+        "a": entity(IR, 10, C_DT_INT32),
+        "b": entity(IR, 12),
+        "c": entity(IR, 11),
+    }
+    plan = plan_reads(entities)
+    assert spans(plan) == [(IR, 10, 3)]
+    assert set(plan[0].keys) == {"a", "b", "c"}
+
+
+def test_blocks_per_poll_class():
+    entities = {
+        **registers(IR, [0, 1], poll=C_POLL_FAST),
+        **registers(IR, [5, 6], poll=C_POLL_SLOW),
+        **registers(IR, [40], poll=C_POLL_NORMAL),
+    }
+    plan = plan_reads(entities)
+    assert [(block.address, block.count, block.poll) for block in plan] == [
+        (0, 2, C_POLL_FAST),
+        (5, 2, C_POLL_SLOW),
+        (40, 1, C_POLL_NORMAL),
+    ]
+
+
+def test_slower_entity_inside_faster_block_is_read_with_it():
+    entities = {
+        **registers(IR, [0, 8], poll=C_POLL_FAST),
+        "slow": entity(IR, 4, poll=C_POLL_SLOW),
+        "slow_outside": entity(IR, 9, poll=C_POLL_SLOW),
+    }
+    plan = plan_reads(entities)
+    assert [(block.address, block.count, block.poll) for block in plan] == [
+        (0, 9, C_POLL_FAST),
+        (9, 1, C_POLL_SLOW),
+    ]
+    assert "slow" in plan[0].keys
+    assert plan[1].keys == ("slow_outside",)
+
+
+def test_register_types_in_read_order():
+    entities = {
+        "coil": entity(COILS, 0),
+        "holding": entity(HR, 0),
+        "input": entity(IR, 0),
+        "discrete": entity(C_REG_TYPE_DISCRETE_INPUTS, 0),
+    }
+    assert [block.keys[0] for block in plan_reads(entities)] == [
+        "input",
+        "holding",
+        "coil",
+        "discrete",
+    ]
+
+
+def test_overrides_for_gap_and_size():
+    entities = registers(IR, [0, 3, 6, 9])
+    assert spans(plan_reads(entities, max_gap={IR: 1})) == [
+        (IR, 0, 1),
+        (IR, 3, 1),
+        (IR, 6, 1),
+        (IR, 9, 1),
+    ]
+    assert spans(plan_reads(entities, max_size={IR: 4})) == [(IR, 0, 4), (IR, 6, 4)]
@@ -0,0 +1,130 @@
+"""Abfrageklassen (POLL): fällige Blöcke je Zyklus, Register auf Anforderung und Boost."""
+
+from __future__ import annotations
+
+import asyncio
+
+from ha_heliotherm import const
+from ha_heliotherm.const import C_POLL_ON_DEMAND, ENTITIES_DICT
+
+ON_DEMAND = const.C_WMZ_HEIZUNG
+
+
+def test_on_demand_block_read_after_start_and_on_request(hub_env, monkeypatch):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            # Entität auf Anforderung; ein abwesender Key erzwingt einen neuen Leseplan
+            monkeypatch.setitem(ENTITIES_DICT[ON_DEMAND], "POLL", C_POLL_ON_DEMAND)
+            hub.apply_profile({"absent": [const.C_SOLAR_KT1]})
+            (block,) = [block for block in hub._plan if block.poll == C_POLL_ON_DEMAND]
+            assert block.keys == (ON_DEMAND,)
+
+            assert await hub.async_poll_cycle() is True
+            initial = hub.data[ON_DEMAND]
+            simulator.set_value(ON_DEMAND, 4321)
+            for _ in range(3):
+                await hub.async_poll_cycle()
+            assert hub.data[ON_DEMAND] == initial
+
+            await hub.async_refresh_on_demand()
+            assert hub.data[ON_DEMAND] == 4321
+            # danach wieder nur auf Anforderung
+            simulator.set_value(ON_DEMAND, 5000)
+            await hub.async_poll_cycle()
+            assert hub.data[ON_DEMAND] == 4321
+
+    asyncio.run(main())
+
+
+def test_slow_blocks_are_not_read_every_cycle(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            assert await hub.async_poll_cycle() is True
+            simulator.set_value(const.C_WMZ_HEIZUNG, 777)
+            simulator.set_value(const.C_TEMP_AUSSEN, 3.5)
+            assert await hub.async_poll_cycle() is True
+            # schneller Block gelesen, langsamer Block erst nach POLL_CLASS_TICKS Zyklen
+            assert hub.data[const.C_TEMP_AUSSEN] == 3.5
+            assert hub.data[const.C_WMZ_HEIZUNG] != 777
+            for _ in range(const.POLL_CLASS_TICKS[const.C_POLL_SLOW] - 1):
+                await hub.async_poll_cycle()
+            assert hub.data[const.C_WMZ_HEIZUNG] == 777
+
+    asyncio.run(main())
+
+
+def test_boost_on_state_change(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            # erster Lesezyklus ist kein Zustandswechsel
+            assert await hub.async_poll_cycle() is True
+            assert await hub.async_poll_cycle() is True
+            assert not hub.boost_active
+            assert hub.boost_count == 0
+
+            simulator.set_value(const.C_VERDICHTER, 1)
+            assert await hub.async_poll_cycle() is True
+            assert hub.boost_active
+            assert hub.boost_count == 1
+
+            # Boost-Zwischenzyklus: nur schnelle Blöcke, ohne Zykluszählung
+            tick = hub._tick
+            simulator.set_value(const.C_TEMP_AUSSEN, 7.5)
+            simulator.set_value(const.C_WMZ_HEIZUNG, 888)
+            assert await hub.async_poll_cycle(boost_only=True) is True
+            assert hub.data[const.C_TEMP_AUSSEN] == 7.5
+            assert hub.data[const.C_WMZ_HEIZUNG] != 888
+            assert hub._tick == tick
+
+            # weiterer Zustandswechsel im Fenster verlängert den Boost, zählt aber nicht neu
+            until = hub._boost_until
+            simulator.set_value(const.C_VERDICHTER, 0)
+            assert await hub.async_poll_cycle(boost_only=True) is True
+            assert hub._boost_until > until
+            assert hub.boost_count == 1
+
+            # Fenster abgelaufen: ohne Zustandswechsel kein neuer Boost, mit Wechsel schon
+            hub._boost_until = 0.0
+            assert await hub.async_poll_cycle() is True
+            assert not hub.boost_active
+            simulator.set_value(const.C_VERDICHTER, 1)
+            assert await hub.async_poll_cycle() is True
+            assert hub.boost_active
+            assert hub.boost_count == 2
+
+    asyncio.run(main())
+
+
+def test_boost_disabled_with_zero_window(hub_env):
+    async def main():
+        async with hub_env({"boost_window": 0}) as (simulator, hub):
+            assert await hub.async_poll_cycle() is True
+            simulator.set_value(const.C_VERDICHTER, 1)
+            assert await hub.async_poll_cycle() is True
+            assert not hub.boost_active
+            assert hub.boost_count == 0
+
+    asyncio.run(main())
+
+
+def test_on_demand_request_is_a_full_cycle_request(hub_env, monkeypatch):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            assert not hub.full_cycle_requested
+            # Coordinator-Refresh nicht ausführen: nur die Anforderung prüfen
+            monkeypatch.setattr(hub._coordinator, "async_request_refresh", _noop)
+            await hub.async_refresh_on_demand()
+            assert hub.full_cycle_requested
+            assert await hub.async_poll_cycle() is True
+            assert not hub.full_cycle_requested
+            await hub.async_trace_cycle()
+            assert hub.full_cycle_requested
+            assert await hub.async_poll_cycle() is True
+            assert not hub.full_cycle_requested
+            assert hub.last_trace["success"] is True
+
+    asyncio.run(main())
+
+
+async def _noop():
+    pass
@@ -0,0 +1,65 @@
+"""Geräteprofil: nicht verbaute Optionen erkennen und aus dem Leseplan nehmen."""
+
+from __future__ import annotations
+
+import asyncio
+
+from ha_heliotherm import const
+from ha_heliotherm.const import ENTITIES_DICT, get_entity_option
+from ha_heliotherm.decoder import INVALID_RAW
+from ha_heliotherm.profile import build_profile, map_digest, profile_matches
+
+def _mkr2_keys():
+    """Entitäten der Option mkr2 (ENTITIES_DICT ist erst nach const.init() gefüllt)."""
+    return sorted(
+        key for key, props in ENTITIES_DICT.items() if get_entity_option(props) == "mkr2"
+    )
+
+
+def _planned_keys(hub):
+    return {entity_key for block in hub._plan for entity_key in block.keys}
+
+
+def test_build_profile_marks_option_absent():
+    mkr2 = _mkr2_keys()
+    raw = {key: INVALID_RAW for key in mkr2}
+    profile = build_profile(ENTITIES_DICT, raw, unreadable=[const.C_SOLAR_KT1])
+    # Einstellwerte der Option fallen mit ihren Messwerten weg, abgelehnte Register ebenso
+    assert profile["absent"] == sorted([*mkr2, const.C_SOLAR_KT1])
+    assert profile["options"]["mkr2"] is False
+    assert profile["map"] == map_digest(ENTITIES_DICT)
+    assert profile_matches(profile, ENTITIES_DICT)
+    assert not profile_matches({**profile, "map": "veraltet"}, ENTITIES_DICT)
+
+
+def test_probe_and_apply_profile_without_mkr2(hub_env):
+    async def main():
+        async with hub_env(without_options=["mkr2"]) as (simulator, hub):
+            mkr2 = _mkr2_keys()
+            assert mkr2
+            profile = await hub.async_probe_profile()
+            assert profile["options"]["mkr2"] is False
+            assert set(mkr2) <= set(profile["absent"])
+
+            hub.apply_profile(profile)
+            assert not _planned_keys(hub) & set(mkr2)
+            assert not any(hub.has_entity(key) for key in mkr2)
+            assert hub.has_entity(const.C_TEMP_AUSSEN)
+            assert await hub.async_poll_cycle() is True
+            assert hub.data[const.C_TEMP_AUSSEN] is not None
+
+    asyncio.run(main())
+
+
+def test_probe_with_all_options(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            mkr2 = _mkr2_keys()
+            profile = await hub.async_probe_profile()
+            assert profile["options"]["mkr2"] is True
+            assert not set(mkr2) & set(profile["absent"])
+            hub.apply_profile(profile)
+            assert set(mkr2) <= _planned_keys(hub)
+            assert all(hub.has_entity(key) for key in mkr2)
+
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+"""Registerkarte (regmap): Schemaprüfung und zwischengespeichertes Kompilat unter .storage."""
+
+from __future__ import annotations
+
+import logging
+import os
+from types import SimpleNamespace
+
+import pytest
+import yaml
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from ha_heliotherm import const, regmap
+from ha_heliotherm.const import REGISTER_MAP_CACHE_FILE, REGISTER_MAP_USER_FILE
+from ha_heliotherm.regmap import RegisterMapError, load_register_map, parse_register_map
+
+SHIPPED = os.path.join(os.path.dirname(regmap.__file__), const.REGISTER_MAP_FILE)
+
+
+def _map(**props):
+    entity = {"RT": "input_registers", "NAME": "Test", "REG": 1, "DT": "INT16", **props}
+    return yaml.safe_dump({"version": const.C_REGMAP_VERSION, "registers": {"test": entity}})
+
+
+def _write_user_map(config_dir, data):
+    with open(os.path.join(config_dir, REGISTER_MAP_USER_FILE), "w", encoding="utf-8") as fh:
+        fh.write(data)
+
+
+def _decoder_tuples(register_map):
+    return [
+        (decoder.count, decoder.is_bits, [entry.as_tuple() for entry in decoder.entries])
+        for decoder in register_map.decoders
+    ]
+
+
+def test_shipped_map_matches_loaded_entities():
+    with open(SHIPPED, "rb") as fh:
+        entities = parse_register_map(fh.read())
+    assert entities == const.ENTITIES_DICT
+    register_map = load_register_map()
+    assert register_map.plan == const.READ_PLAN
+    assert not register_map.cached
+
+
+def test_cached_artefact_matches_compiled_map(tmp_path):
+    compiled = load_register_map(str(tmp_path))
+    assert not compiled.cached
+    cached = load_register_map(str(tmp_path))
+    assert cached.cached
+    assert cached.entities == compiled.entities
+    assert cached.plan == compiled.plan
+    assert _decoder_tuples(cached) == _decoder_tuples(compiled)
+
+
+@pytest.mark.parametrize(
+    "props",
+    [{"UNKNOWN": 1}, {"POLL": "hourly"}, {"DEADBAND": -0.1}, {"WINDOW": -1}, {"RT": "registers"}],
+    ids=["unknown-key", "unknown-poll-class", "negative-deadband", "negative-window", "reg-type"],
+)
+def test_invalid_entities_are_rejected(props):
+    with pytest.raises(RegisterMapError):
+        parse_register_map(_map(**props).encode())
+
+
+def test_valid_entity_options():
+    entities = parse_register_map(_map(POLL="slow", DEADBAND=0.5, MIN_INTERVAL=30).encode())
+    assert entities["test"]["DEADBAND"] == 0.5
+    assert entities["test"]["POLL"] == "slow"
+
+
+def test_corrupt_cache_is_rebuilt(tmp_path, caplog):
+    load_register_map(str(tmp_path))
+    cache_file = os.path.join(tmp_path, STORAGE_DIR, REGISTER_MAP_CACHE_FILE)
+    with open(cache_file, "wb") as fh:
+        fh.write(b"\x00kaputt")
+    with caplog.at_level(logging.WARNING):
+        assert not load_register_map(str(tmp_path)).cached
+    assert "unbrauchbar" in caplog.text
+    assert load_register_map(str(tmp_path)).cached
+
+
+def test_changed_map_invalidates_cache(tmp_path):
+    _write_user_map(tmp_path, _map())
+    first = load_register_map(str(tmp_path))
+    assert first.path.endswith(REGISTER_MAP_USER_FILE)
+    assert load_register_map(str(tmp_path)).cached
+    _write_user_map(tmp_path, _map(NAME="Geändert"))
+    changed = load_register_map(str(tmp_path))
+    assert not changed.cached
+    assert changed.digest != first.digest
+    assert changed.entities["test"]["NAME"] == "Geändert"
+
+
+@pytest.mark.parametrize("field", ["st_size", "st_mtime_ns"])
+def test_changed_compiler_module_invalidates_cache(tmp_path, monkeypatch, field):
+    load_register_map(str(tmp_path))
+    assert load_register_map(str(tmp_path)).cached
+    stat = os.stat
+
+    def changed_stat(path, *args, **kwargs):
+        result = stat(path, *args, **kwargs)
+        if os.path.basename(path) != "planner.py":
+            return result
+        values = {"st_size": result.st_size, "st_mtime_ns": result.st_mtime_ns}
+        values[field] += 1
+        return SimpleNamespace(**values)
+
+    monkeypatch.setattr(regmap.os, "stat", changed_stat)
+    assert not load_register_map(str(tmp_path)).cached
+    assert load_register_map(str(tmp_path)).cached
@@ -0,0 +1,148 @@
+"""Schreibzugriffe: Sammeln, Fehlermeldung an den Aufrufer, Rücklesen."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from ha_heliotherm import const
+from ha_heliotherm.const import ENTITIES_DICT, get_entity_reg, get_entity_type
+
+SETPOINT = const.C_WW_NORMALTEMPERATUR
+SETPOINT_2 = const.C_WW_MINIMALTEMPERATUR
+
+
+def _lock_register(simulator, entity_key):
+    """Schreibzugriffe auf das Register der Entität lehnt der Simulator ab (Exception 3)."""
+    props = ENTITIES_DICT[entity_key]
+    simulator.read_only.setdefault(get_entity_type(props), set()).add(get_entity_reg(props)[0])
+
+
+def _age_sample(hub, entity_key, age):
+    """Zuletzt gelesenen Rohwert der Entität als vor `age` Sekunden gelesen behandeln."""
+    props = ENTITIES_DICT[entity_key]
+    reg = get_entity_reg(props)[0]
+    history = hub._history[get_entity_type(props)]
+    history.record(reg, [history.get(reg)], time.time() - age)
+
+
+def test_writes_in_window_are_batched(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            assert await hub.async_poll_cycle() is True
+            requests = simulator.stats["requests"]
+            await asyncio.gather(
+                hub.write_entity_value(SETPOINT, 50.0),
+                hub.write_entity_value(SETPOINT_2, 40.0),
+                hub.write_entity_value(SETPOINT, 51.0),
+            )
+            assert hub.data[SETPOINT] == 51.0
+            assert hub.data[SETPOINT_2] == 40.0
+            assert simulator.get_words(SETPOINT) == [510]
+            # ein FC-16-Request für beide benachbarten Register, ein Request zum Rücklesen
+            assert simulator.stats["requests"] - requests == 2
+
+    asyncio.run(main())
+
+
+def test_rejected_write_raises(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            assert await hub.async_poll_cycle() is True
+            _lock_register(simulator, SETPOINT)
+            before = hub.data[SETPOINT]
+            with pytest.raises(HomeAssistantError):
+                await hub.write_entity_value(SETPOINT, 50.0)
+            assert hub.metrics.counters["write_errors"] == 1
+            assert hub.data[SETPOINT] == before
+
+    asyncio.run(main())
+
+
+def test_failed_run_fails_only_its_entities(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            assert await hub.async_poll_cycle() is True
+            _lock_register(simulator, SETPOINT)
+            results = await asyncio.gather(
+                hub.write_entity_value(SETPOINT, 50.0),
+                hub.write_entity_value(const.C_PV_ANFORDERUNG, True),
+                return_exceptions=True,
+            )
+            assert isinstance(results[0], HomeAssistantError)
+            assert results[1] is None
+            assert hub.data[const.C_PV_ANFORDERUNG] == "on"
+
+    asyncio.run(main())
+
+
+def test_setter_reverts_entity_on_failure(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            assert await hub.async_poll_cycle() is True
+            _lock_register(simulator, SETPOINT)
+            reverted = []
+            entity = SimpleNamespace(
+                entity_description=SimpleNamespace(key=SETPOINT),
+                _on_hub_update=lambda: reverted.append(hub.entity_value(SETPOINT)),
+            )
+            with pytest.raises(HomeAssistantError):
+                await hub.setter_function_callback(entity, 50.0)
+            assert reverted == [hub.data[SETPOINT]]
+
+    asyncio.run(main())
+
+
+def test_verify_plans_stay_bounded(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            assert await hub.async_poll_cycle() is True
+            primed = set(hub._primed_decoders)
+            keys = [key for block in hub._plan for key in block.keys]
+            for count in range(1, const.C_VERIFY_PLAN_CACHE_SIZE * 2):
+                await hub._async_verify_writes(keys[:count])
+            assert len(hub._verify_plans) == const.C_VERIFY_PLAN_CACHE_SIZE
+            # Dekodierer des Rücklesens bleiben außerhalb von _primed_decoders
+            assert hub._primed_decoders == primed
+
+    asyncio.run(main())
+
+
+def test_unchanged_value_is_elided_only_while_fresh(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            assert await hub.async_poll_cycle() is True
+            value = hub.data[SETPOINT]
+            requests = simulator.stats["requests"]
+            await hub.write_entity_value(SETPOINT, value)
+            assert simulator.stats["requests"] == requests
+
+            # Rohwert älter als der Abstand der Lesezugriffe (Klasse slow: 40 Zyklen): schreiben
+            _age_sample(hub, SETPOINT, 41 * hub._coordinator.interval)
+            await hub.write_entity_value(SETPOINT, value)
+            # Schreiben und Rücklesen
+            assert simulator.stats["requests"] - requests == 2
+
+    asyncio.run(main())
+
+
+def test_normal_class_setpoint_is_elided_between_its_reads(hub_env):
+    async def main():
+        async with hub_env() as (simulator, hub):
+            key = const.C_PV_ANFORDERUNG
+            assert await hub.async_poll_cycle() is True
+            assert hub.data[key] == "off"
+            requests = simulator.stats["requests"]
+            await hub.write_entity_value(key, True)
+            assert simulator.stats["requests"] - requests == 2
+            # Klasse normal: gelesen jeden zweiten Zyklus, der Rohwert ist älter als ein Intervall
+            _age_sample(hub, key, 1.5 * hub._coordinator.interval)
+            await hub.write_entity_value(key, True)
+            assert simulator.stats["requests"] - requests == 2
+            assert hub.write_stats == {"writes": 1, "skipped_writes": 1}
+
+    asyncio.run(main())